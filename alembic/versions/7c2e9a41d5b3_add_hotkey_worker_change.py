@@ -0,0 +1,56 @@
+"""add hotkey_worker_change feed
+
+Revision ID: 7c2e9a41d5b3
+Revises: 01bca204c995
+Create Date: 2026-10-19 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a41d5b3'
+down_revision: Union[str, None] = '01bca204c995'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('hotkey_worker_change',
+    sa.Column('seq', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('worker', sa.String(), nullable=False),
+    sa.Column('hotkey', sa.String(), nullable=False),
+    sa.Column('registration_time', sa.Float(), nullable=False),
+    sa.Column('signature', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('seq'),
+    sqlite_autoincrement=True,
+    )
+    op.add_column(
+        'validator_sync_offset',
+        sa.Column(
+            'last_change_seq', sa.BigInteger(), nullable=False, server_default='0'
+        ),
+    )
+    # Seed the feed with the existing registrations, then their unbinds
+    op.execute(
+        "INSERT INTO hotkey_worker_change (kind, worker, hotkey, registration_time, signature) "
+        "SELECT 'bind', worker, hotkey, registration_time, signature FROM hotkey_worker "
+        "ORDER BY registration_time_int"
+    )
+    op.execute(
+        "INSERT INTO hotkey_worker_change (kind, worker, hotkey, registration_time, signature) "
+        "SELECT 'unbind', worker, hotkey, registration_time, unbind_signature FROM hotkey_worker "
+        "WHERE unbind_signature IS NOT NULL ORDER BY registration_time_int"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('validator_sync_offset') as batch_op:
+        batch_op.drop_column('last_change_seq')
+    op.drop_table('hotkey_worker_change')
@@ -0,0 +1,44 @@
+"""add hotkey_worker_count and hotkey index
+
+Revision ID: b58f0d3e6a17
+Revises: 7c2e9a41d5b3
+Create Date: 2026-10-19 11:03:54.218940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58f0d3e6a17'
+down_revision: Union[str, None] = '7c2e9a41d5b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_hotkey_worker_hotkey_unbind',
+        'hotkey_worker',
+        ['hotkey', 'unbind_signature'],
+        unique=False,
+    )
+    op.create_table('hotkey_worker_count',
+    sa.Column('hotkey', sa.String(), nullable=False),
+    sa.Column('active', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('hotkey')
+    )
+    op.execute(
+        "INSERT INTO hotkey_worker_count (hotkey, active) "
+        "SELECT hotkey, count(*) FROM hotkey_worker "
+        "WHERE unbind_signature IS NULL GROUP BY hotkey"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('hotkey_worker_count')
+    op.drop_index('ix_hotkey_worker_hotkey_unbind', table_name='hotkey_worker')
@@ -0,0 +1,35 @@
+"""add partial index on active hotkey_worker rows
+
+Revision ID: d3a1c7e90f42
+Revises: b58f0d3e6a17
+Create Date: 2026-10-19 11:41:07.553021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a1c7e90f42'
+down_revision: Union[str, None] = 'b58f0d3e6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_hotkey_worker_active',
+        'hotkey_worker',
+        ['worker', 'hotkey', 'unbind_signature'],
+        unique=False,
+        sqlite_where=sa.text('unbind_signature IS NULL'),
+        postgresql_where=sa.text('unbind_signature IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hotkey_worker_active', table_name='hotkey_worker')
@@ -0,0 +1,66 @@
+"""
+Compare two result files written by benchmarks.run; exits with status 1 if
+any scenario regressed by more than --threshold.
+
+    PYTHONPATH=. python -m benchmarks.compare BASELINE.json CANDIDATE.json
+"""
+
+import argparse
+import sys
+
+from .harness import load_results, result_key
+
+
+def change(base: float, new: float) -> float:
+    return (new - base) / base if base else 0.0
+
+
+def compare(baseline: list[dict], candidate: list[dict], threshold: float):
+    """Yield (key, metric, base, new, relative change, regressed)."""
+    base_by_key = {result_key(entry): entry for entry in baseline}
+    for entry in candidate:
+        key = result_key(entry)
+        base = base_by_key.get(key)
+        if base is None:
+            continue
+        # Lower throughput is worse; higher latency and memory are worse
+        metrics = [("throughput", base["throughput"], entry["throughput"], -1)]
+        if base["latency_ms"] and entry["latency_ms"]:
+            metrics.append(
+                ("p95_ms", base["latency_ms"]["p95"], entry["latency_ms"]["p95"], 1)
+            )
+        metrics.append(
+            ("peak_rss_mib", base["peak_rss_mib"], entry["peak_rss_mib"], 1)
+        )
+        for metric, old, new, worse in metrics:
+            delta = change(old, new)
+            yield key, metric, old, new, delta, delta * worse > threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change counted as a regression (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    regressions = 0
+    for key, metric, old, new, delta, regressed in compare(
+        load_results(args.baseline), load_results(args.candidate), args.threshold
+    ):
+        regressions += regressed
+        flag = "REGRESSION" if regressed else ""
+        print(
+            f"{key:<60} {metric:<13} {old:>12.1f} -> {new:>12.1f} "
+            f"({delta:+7.1%}) {flag}"
+        )
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
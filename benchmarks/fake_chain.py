@@ -0,0 +1,86 @@
+"""
+Fake subtensor: a metagraph of nodes served to everything that calls
+fiber's get_nodes_for_netuid, and a weight setter that only records calls.
+"""
+
+import socket
+import struct
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Iterator, List
+
+import fiber.chain.fetch_nodes
+
+from src import set_weights as set_weights_module
+from src import utils
+from src.constants import MIN_WEIGHTED_STAKE
+
+
+def ip_to_int(ip: str) -> int:
+    return struct.unpack(">I", socket.inet_aton(ip))[0]
+
+
+@dataclass
+class FakeNode:
+    """The attributes of fiber's Node the validator reads."""
+
+    node_id: int
+    hotkey: str
+    ip: str = "0.0.0.0"
+    port: int = 0
+    alpha_stake: float = 0.0
+    tao_stake: float = 0.0
+
+
+class FakeSubstrate:
+    """Placeholder passed where a SubstrateInterface is expected."""
+
+
+class FakeChain:
+    def __init__(self, hotkeys: List[str]):
+        self.nodes = [
+            FakeNode(node_id=i, hotkey=hotkey)
+            for i, hotkey in enumerate(hotkeys)
+        ]
+        self.substrate = FakeSubstrate()
+        self.weight_calls: list[dict] = []
+
+    def add_validator(self, hotkey: str, host: str, port: int) -> FakeNode:
+        """A staked node with an axon, as sync_hotkey_workers_task expects."""
+        node = FakeNode(
+            node_id=len(self.nodes),
+            hotkey=hotkey,
+            # fiber reports the IP as an integer; the validator parses it
+            ip=str(ip_to_int(host)),
+            port=port,
+            alpha_stake=MIN_WEIGHTED_STAKE * 10,
+        )
+        self.nodes.append(node)
+        return node
+
+    def get_nodes_for_netuid(self, substrate, netuid, block=None):
+        # Copies: fix_node_ip rewrites node.ip in place
+        return [replace(node) for node in self.nodes]
+
+    def set_node_weights(self, **kwargs) -> bool:
+        self.weight_calls.append(kwargs)
+        return True
+
+    @contextmanager
+    def install(self) -> Iterator["FakeChain"]:
+        """Route chain access of the validator to this fake while active."""
+        patches = [
+            (fiber.chain.fetch_nodes, "get_nodes_for_netuid", self.get_nodes_for_netuid),
+            (utils, "get_nodes_for_netuid", self.get_nodes_for_netuid),
+            (set_weights_module.weights, "set_node_weights", self.set_node_weights),
+        ]
+        originals = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+        for obj, name, value in patches:
+            setattr(obj, name, value)
+        utils._nodes_cache.clear()
+        try:
+            yield self
+        finally:
+            for obj, name, value in originals:
+                setattr(obj, name, value)
+            utils._nodes_cache.clear()
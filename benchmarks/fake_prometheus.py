@@ -0,0 +1,151 @@
+"""
+Local stand-in for the pool's Prometheus: serves /api/v1/query and
+/api/v1/query_range for the ks_* series MetricsClient asks for, generated
+from a Pool. It runs in its own process so serving the (large) responses
+does not skew the timings of the code under test.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import re
+import socket
+
+from aiohttp import web
+
+from .generators import POOL_WALLET, Pool, generate_pool
+
+# Counter name in the query -> Pool column with its value over the window
+SERIES = {
+    "ks_valid_share_counter": "valid_shares",
+    "ks_invalid_share_counter": "invalid_shares",
+    "ks_valid_share_diff_counter": "total_difficulty",
+    "ks_miner_uptime_seconds": "uptime",
+    "ks_miner_work_seconds_total": "work_seconds",
+}
+_SERIES_RE = re.compile("|".join(sorted(SERIES, key=len, reverse=True)))
+# Window the Pool's counters are spread over for range queries
+WINDOW_SECONDS = 3600
+
+
+def _column(pool: Pool, query: str):
+    match = _SERIES_RE.search(query)
+    if match is None:
+        raise web.HTTPBadRequest(text=f"unsupported query {query!r}")
+    return getattr(pool, SERIES[match.group(0)])
+
+
+def build_app(pool: Pool) -> web.Application:
+    labels = [
+        {"wallet": POOL_WALLET, "worker": worker} for worker in pool.workers
+    ]
+    # Instant queries always return the same vector: render it once
+    vectors = {}
+    for name, column in SERIES.items():
+        values = getattr(pool, column)
+        vectors[name] = json.dumps(
+            {
+                "status": "success",
+                "data": {
+                    "resultType": "vector",
+                    "result": [
+                        {"metric": metric, "value": [0, str(float(value))]}
+                        for metric, value in zip(labels, values)
+                    ],
+                },
+            }
+        ).encode()
+
+    async def query(request: web.Request) -> web.Response:
+        match = _SERIES_RE.search(request.query.get("query", ""))
+        if match is None:
+            raise web.HTTPBadRequest(text="unsupported query")
+        return web.Response(
+            body=vectors[match.group(0)], content_type="application/json"
+        )
+
+    async def query_range(request: web.Request) -> web.Response:
+        values = _column(pool, request.query.get("query", ""))
+        start = int(float(request.query["start"]))
+        end = int(float(request.query["end"]))
+        step = int(float(request.query["step"]))
+        steps = list(range(start, end + 1, step))
+        per_step = step / WINDOW_SECONDS
+        result = [
+            {
+                "metric": metric,
+                "values": [[ts, str(float(value) * per_step)] for ts in steps],
+            }
+            for metric, value in zip(labels, values)
+        ]
+        return web.json_response(
+            {
+                "status": "success",
+                "data": {"resultType": "matrix", "result": result},
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/v1/query", query)
+    app.router.add_get("/api/v1/query_range", query_range)
+    return app
+
+
+def _serve(workers: int, seed: int, port: int, ready) -> None:
+    async def main():
+        runner = web.AppRunner(build_app(generate_pool(workers, seed=seed)))
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakePrometheus:
+    """
+    Serves the pool generated by generate_pool(workers, seed=seed), so the
+    caller can regenerate the same pool (e.g. for the mapping) locally.
+
+        with FakePrometheus(10_000) as prometheus:
+            MetricsClient(endpoint=prometheus.url)
+    """
+
+    def __init__(self, workers: int, seed: int = 0):
+        self.workers = workers
+        self.seed = seed
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._process: multiprocessing.Process | None = None
+
+    def start(self, timeout: float = 300.0) -> "FakePrometheus":
+        ctx = multiprocessing.get_context("spawn")
+        ready = ctx.Event()
+        self._process = ctx.Process(
+            target=_serve,
+            args=(self.workers, self.seed, self.port, ready),
+            daemon=True,
+        )
+        self._process.start()
+        if not ready.wait(timeout):
+            self.stop()
+            raise RuntimeError("Fake Prometheus did not start")
+        return self
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> "FakePrometheus":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
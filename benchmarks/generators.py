@@ -0,0 +1,110 @@
+"""
+Synthetic pool data: hotkeys, their workers and the ks_* counters the Kaspa
+stratum bridge exports for them, plus a helper to load it into a database.
+"""
+
+import hashlib
+import secrets
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from scalecodec.utils.ss58 import ss58_encode
+
+from src.interfaces.database import Base, DatabaseService
+
+POOL_WALLET = (
+    "kaspa:qr4ksh6s3rmy5f4qyql2kh7p9z7f4c55da5r5gz2nnsd8ctt4k69whtr4u0wp"
+)
+
+
+def fake_hotkey(i: int) -> str:
+    """A valid ss58 address (nobody holds its key), stable per index."""
+    return ss58_encode(hashlib.sha256(f"hotkey{i}".encode()).digest(), 42)
+
+
+@dataclass
+class Pool:
+    """Registered workers with one window of mining counters each."""
+
+    hotkeys: List[str]
+    workers: List[str]
+    worker_hotkeys: List[str]
+    valid_shares: np.ndarray
+    invalid_shares: np.ndarray
+    total_difficulty: np.ndarray
+    uptime: np.ndarray
+    work_seconds: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.workers)
+
+
+def generate_pool(
+    workers: int, max_per_hotkey: int = 30, seed: int = 0
+) -> Pool:
+    """
+    `workers` workers owned by hotkeys running 1..max_per_hotkey rigs each
+    (uniformly), so no hotkey exceeds the validator's per-hotkey limit.
+    """
+    rng = np.random.default_rng(seed)
+    hotkeys, worker_names, worker_hotkeys = [], [], []
+    while len(worker_names) < workers:
+        hotkey = fake_hotkey(len(hotkeys))
+        hotkeys.append(hotkey)
+        rigs = min(
+            int(rng.integers(1, max_per_hotkey + 1)),
+            workers - len(worker_names),
+        )
+        for _ in range(rigs):
+            worker_names.append(f"rig{len(worker_names)}_{hotkey}")
+            worker_hotkeys.append(hotkey)
+    valid = rng.poisson(300, size=workers).astype(np.int64)
+    difficulty = rng.choice([1024.0, 2048.0, 4096.0, 8192.0], size=workers)
+    return Pool(
+        hotkeys=hotkeys,
+        workers=worker_names,
+        worker_hotkeys=worker_hotkeys,
+        valid_shares=valid,
+        invalid_shares=rng.poisson(3, size=workers).astype(np.int64),
+        total_difficulty=valid * difficulty,
+        uptime=rng.uniform(0, 3600, size=workers),
+        work_seconds=rng.uniform(1800, 3600, size=workers),
+    )
+
+
+async def populate_database(
+    db_url: str,
+    pool: Pool,
+    unbound_ratio: float = 0.0,
+    batch_size: int = 5000,
+) -> DatabaseService:
+    """
+    Register every worker of `pool` through DatabaseService (so the change
+    feed and the per-hotkey counters are filled as in production), then
+    unbind every 1/unbound_ratio-th worker. Signatures are random bytes and
+    do not verify.
+    """
+    db_service = DatabaseService(db_url)
+    Base.metadata.create_all(db_service.engine)
+    registrations = [
+        (hotkey, worker, secrets.token_hex(64), 1_700_000_000.0 + i)
+        for i, (worker, hotkey) in enumerate(
+            zip(pool.workers, pool.worker_hotkeys)
+        )
+    ]
+    for start in range(0, len(registrations), batch_size):
+        await db_service.add_mappings(
+            registrations[start : start + batch_size]
+        )
+    if unbound_ratio:
+        step = int(1 / unbound_ratio)
+        unbinds = [
+            (hotkey, worker, secrets.token_hex(64))
+            for hotkey, worker, _, _ in registrations[::step]
+        ]
+        for start in range(0, len(unbinds), batch_size):
+            await db_service.mark_workers_unbound(
+                unbinds[start : start + batch_size]
+            )
+    return db_service
@@ -0,0 +1,157 @@
+"""
+Measurement helpers shared by the scenarios: latency percentiles, peak RSS,
+running a scenario in a fresh process and storing results.
+"""
+
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from queue import Empty
+from typing import Awaitable, Callable, Dict, List
+
+import numpy as np
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of latencies given in seconds, in milliseconds."""
+    ms = np.asarray(latencies) * 1000
+    return {
+        "p50": float(np.percentile(ms, 50)),
+        "p95": float(np.percentile(ms, 95)),
+        "p99": float(np.percentile(ms, 99)),
+        "mean": float(ms.mean()),
+        "max": float(ms.max()),
+    }
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process so far (Linux reports KiB)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if sys.platform != "darwin" else rss / 2**20
+
+
+async def timed_calls(
+    fn: Callable[[], Awaitable], repeat: int, warmup: int = 1
+) -> List[float]:
+    """Await fn() warmup + repeat times; returns the repeat latencies."""
+    for _ in range(warmup):
+        await fn()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def result(
+    scenario: str,
+    params: dict,
+    operations: int,
+    seconds: float,
+    unit: str,
+    latencies: List[float] | None = None,
+    **extra,
+) -> dict:
+    """
+    One measurement: `operations` units of work (e.g. rows, requests) done
+    in `seconds`, with optional per-call latencies.
+    """
+    return {
+        "scenario": scenario,
+        "params": params,
+        "operations": operations,
+        "seconds": seconds,
+        "throughput": operations / seconds if seconds else 0.0,
+        "unit": f"{unit}/s",
+        "latency_ms": percentiles(latencies) if latencies else None,
+        "peak_rss_mib": peak_rss_mib(),
+        **extra,
+    }
+
+
+def _child(target, params, queue) -> None:
+    try:
+        queue.put(("ok", target(**params)))
+    except BaseException as e:
+        queue.put(("error", f"{type(e).__name__}: {e}"))
+        raise
+
+
+def run_isolated(target: Callable[..., List[dict]], params: dict) -> List[dict]:
+    """
+    Run a scenario in a fresh interpreter so its peak RSS is its own and no
+    caches leak between scenarios.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(target, params, queue))
+    process.start()
+    while True:
+        try:
+            status, payload = queue.get(timeout=1.0)
+            break
+        except Empty:
+            if process.is_alive():
+                continue
+        # Killed (OOM, signal) before reporting; a result put just before
+        # exiting may still be in flight
+        try:
+            status, payload = queue.get(timeout=1.0)
+            break
+        except Empty:
+            raise RuntimeError(
+                f"{target.__name__}({params}) exited with code "
+                f"{process.exitcode} without a result"
+            ) from None
+    process.join()
+    if status != "ok":
+        raise RuntimeError(f"{target.__name__}({params}) failed: {payload}")
+    return payload
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": multiprocessing.cpu_count(),
+        "timestamp": time.time(),
+    }
+
+
+def save_results(results: List[dict], path: Path | None = None) -> Path:
+    env = environment()
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(env["timestamp"]))
+        path = RESULTS_DIR / f"{stamp}-{env['commit'] or 'nogit'}.json"
+    path.write_text(
+        json.dumps({"environment": env, "results": results}, indent=2)
+    )
+    return path
+
+
+def load_results(path: Path) -> List[dict]:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def result_key(entry: dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(entry["params"].items()))
+    return f"{entry['scenario']}[{params}]"
@@ -0,0 +1,479 @@
+"""
+Concurrent HTTP load against the validator API.
+
+    # In-process through ASGI, all dependencies stubbed
+    PYTHONPATH=. python -m benchmarks.loadtest --workers 20000 --concurrency 64
+    # Same stubs, served by uvicorn in a child process over real sockets
+    PYTHONPATH=. python -m benchmarks.loadtest --server uvicorn
+    # An already running validator (read-only mix by default)
+    PYTHONPATH=. python -m benchmarks.loadtest --url http://127.0.0.1:8000
+
+Reports requests/s and p50/p95/p99 per endpoint, and event-loop lag of the
+server: any callback that blocks the loop (a synchronous DB query, sr25519
+verification, a large JSON encode) delays the probe's wake-up by as long.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import secrets
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List
+
+import httpx
+
+from .fake_chain import FakeChain
+from .fake_prometheus import FakePrometheus, free_port
+from .generators import POOL_WALLET, fake_hotkey, generate_pool, populate_database
+from .harness import percentiles
+
+DEFAULT_MIX = "register=1,unbind=1,metrics=2,mappings=4,hotkey_workers=2"
+READ_ONLY_MIX = "metrics=2,mappings=4,hotkey_workers=2"
+RIGS_PER_HOTKEY = 10
+
+
+class LoopLagProbe:
+    """
+    Wakes up every `interval` seconds and records how late it was. Lag above
+    `threshold` is a stall; the request paths in flight at that moment (see
+    `track`) are counted as suspects.
+    """
+
+    def __init__(self, interval: float = 0.01, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: List[float] = []
+        self.stalls: List[float] = []
+        self.suspects: Counter = Counter()
+        self.in_flight: Counter = Counter()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.lags.append(lag)
+            if lag > self.threshold:
+                self.stalls.append(lag)
+                self.suspects.update(+self.in_flight)
+
+    def track(self, app):
+        """Wrap an ASGI app so requests in flight are known per path."""
+
+        async def tracked(scope, receive, send):
+            if scope["type"] != "http":
+                return await app(scope, receive, send)
+            path = scope["path"]
+            self.in_flight[path] += 1
+            try:
+                await app(scope, receive, send)
+            finally:
+                self.in_flight[path] -= 1
+
+        return tracked
+
+    def summary(self) -> dict:
+        lags = self.lags or [0.0]
+        return {
+            "lag_ms": percentiles(lags),
+            "stalls": len(self.stalls),
+            "stalled_ms": sum(self.stalls) * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "suspects": dict(self.suspects.most_common()),
+        }
+
+
+# --- Synthetic, pre-signed requests -------------------------------------
+
+
+class Signer:
+    """Hotkeys that sign like a miner's wallet, or fake ones when not signing."""
+
+    def __init__(self, sign: bool):
+        self.sign = sign
+
+    def hotkey(self, i: int):
+        if not self.sign:
+            return fake_hotkey(30_000_000 + i), None
+        from fiber import Keypair
+
+        keypair = Keypair.create_from_uri(f"//loadtest{i}")
+        return keypair.ss58_address, keypair
+
+    def signature(self, keypair, payload: dict) -> str:
+        if keypair is None:
+            return secrets.token_hex(64)
+        message = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return keypair.sign(message).hex()
+
+
+@dataclass
+class Workload:
+    registrations: List[tuple] = field(default_factory=list)
+    unbinds: List[tuple] = field(default_factory=list)
+    # Workers the pool reports as online (for /register)
+    online_workers: List[str] = field(default_factory=list)
+    hotkeys: List[str] = field(default_factory=list)
+
+
+async def build_workload(db_url: str, count: int, sign: bool) -> Workload:
+    """
+    `count` signed /register requests for new workers, and `count` signed
+    /unbind requests for workers registered here beforehand.
+    """
+    from src.interfaces.database import DatabaseService
+
+    signer = Signer(sign)
+    workload = Workload()
+    existing = []
+    keys = [signer.hotkey(i) for i in range(2 * -(-count // RIGS_PER_HOTKEY))]
+    workload.hotkeys = [hotkey for hotkey, _ in keys]
+    now = time.time()
+    for i in range(count):
+        hotkey, keypair = keys[i // RIGS_PER_HOTKEY]
+        payload = {
+            "hotkey": hotkey,
+            "worker": f"load{i}_{hotkey}",
+            "registration_time": now,
+        }
+        workload.registrations.append(
+            (payload, signer.signature(keypair, payload))
+        )
+        workload.online_workers.append(payload["worker"])
+
+        hotkey, keypair = keys[len(keys) // 2 + i // RIGS_PER_HOTKEY]
+        worker = f"bound{i}_{hotkey}"
+        payload = {"hotkey": hotkey, "worker": worker}
+        existing.append((hotkey, worker, secrets.token_hex(64), now))
+        workload.unbinds.append((payload, signer.signature(keypair, payload)))
+    db_service = DatabaseService(db_url)
+    await db_service.add_mappings(existing)
+    return workload
+
+
+# --- Stubbed app ---------------------------------------------------------
+
+
+@contextmanager
+def stubbed_app(
+    db_url: str, prometheus_url: str, workload: Workload, sign: bool
+):
+    """The FastAPI app with config, worker index and chain replaced."""
+    from src.config import ValidatorSettings, load_config
+    from src.dependencies import get_substrate, get_worker_provider
+    from src.interfaces.worker_provider import WorkerProvider
+    from src.main import app
+    from src.metrics import MetricsClient, MinerKey
+
+    config = ValidatorSettings(
+        database_url=db_url,
+        prometheus_endpoint=prometheus_url,
+        kaspa_pool_owner_wallet=POOL_WALLET,
+        verify_signature=sign,
+        # Requests are signed up front
+        registration_time_tolerance=timedelta(days=1),
+        metrics_snapshots=False,
+    )
+    provider = WorkerProvider(MetricsClient(prometheus_url))
+    provider._cache = (
+        frozenset(
+            MinerKey(wallet=POOL_WALLET, worker=worker)
+            for worker in workload.online_workers
+        ),
+        time.time() + 86400,
+    )
+    chain = FakeChain(workload.hotkeys)
+    app.dependency_overrides.update(
+        {
+            load_config: lambda: config,
+            get_worker_provider: lambda: provider,
+            get_substrate: lambda: chain.substrate,
+        }
+    )
+    try:
+        with chain.install():
+            yield app
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _serve_uvicorn(
+    db_url, prometheus_url, workload, sign, threshold, port, ready, stop, out
+):
+    import uvicorn
+
+    async def main():
+        with stubbed_app(db_url, prometheus_url, workload, sign) as app:
+            probe = LoopLagProbe(threshold=threshold)
+            server = uvicorn.Server(
+                uvicorn.Config(
+                    probe.track(app),
+                    host="127.0.0.1",
+                    port=port,
+                    lifespan="off",
+                    log_level="warning",
+                )
+            )
+            probe_task = asyncio.create_task(probe.run())
+            serve_task = asyncio.create_task(server.serve())
+            while not server.started:
+                await asyncio.sleep(0.05)
+            ready.set()
+            while not stop.is_set():
+                await asyncio.sleep(0.1)
+            server.should_exit = True
+            await serve_task
+            probe_task.cancel()
+            out.put(probe.summary())
+
+    asyncio.run(main())
+
+
+# --- Load generation -----------------------------------------------------
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _register(workload: Workload):
+    if not workload.registrations:
+        return None
+    payload, signature = workload.registrations.pop()
+    return "POST", "/register", {
+        "json": payload,
+        "headers": {"X-Signature": signature},
+    }
+
+
+def _unbind(workload: Workload):
+    if not workload.unbinds:
+        return None
+    payload, signature = workload.unbinds.pop()
+    return "POST", "/unbind", {
+        "json": payload,
+        "headers": {"X-Signature": signature},
+    }
+
+
+OPERATIONS = {
+    "register": _register,
+    "unbind": _unbind,
+    "metrics": lambda workload: ("GET", "/metrics", {}),
+    "mappings": lambda workload: ("GET", "/mappings", {}),
+    "hotkey_workers": lambda workload: (
+        "GET",
+        "/hotkey_workers",
+        {"params": {"page_size": 100, "page_number": random.randint(1, 20)}},
+    ),
+}
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+) -> dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    names, weights = list(mix), list(mix.values())
+    deadline = time.monotonic() + duration
+
+    async def client_loop():
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            request = OPERATIONS[name](workload)
+            if request is None:
+                # Pre-signed requests of this kind are used up
+                i = names.index(name)
+                del names[i], weights[i]
+                if not names:
+                    return
+                continue
+            method, path, kwargs = request
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, path, **kwargs)
+                statuses[name][resp.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[name][type(e).__name__] += 1
+            latencies[name].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client_loop() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "seconds": elapsed,
+        "requests": total,
+        "rps": total / elapsed,
+        "endpoints": {
+            name: {
+                "requests": len(values),
+                "rps": len(values) / elapsed,
+                "latency_ms": percentiles(values),
+                "statuses": {str(k): v for k, v in statuses[name].items()},
+            }
+            for name, values in sorted(latencies.items())
+        },
+    }
+
+
+def print_report(report: dict, loop: dict | None) -> None:
+    print(
+        f"{report['requests']} requests in {report['seconds']:.1f}s: "
+        f"{report['rps']:.0f} req/s"
+    )
+    for name, stats in report["endpoints"].items():
+        lat = stats["latency_ms"]
+        print(
+            f"  {name:<15} {stats['requests']:>7} req {stats['rps']:>8.1f}/s"
+            f"  p50={lat['p50']:8.1f} p95={lat['p95']:8.1f} p99={lat['p99']:8.1f} ms"
+            f"  {stats['statuses']}"
+        )
+    if loop is not None:
+        lag = loop["lag_ms"]
+        print(
+            f"  event loop lag p50={lag['p50']:.1f} p99={lag['p99']:.1f} "
+            f"max={lag['max']:.1f} ms; {loop['stalls']} stalls over "
+            f"{loop['threshold_ms']:.0f} ms ({loop['stalled_ms']:.0f} ms total)"
+        )
+        if loop["suspects"]:
+            print(f"  in flight during stalls: {loop['suspects']}")
+
+
+async def run_asgi(app, workload, mix, args) -> tuple[dict, dict]:
+    probe = LoopLagProbe(threshold=args.stall_ms / 1000)
+    probe_task = asyncio.create_task(probe.run())
+    transport = httpx.ASGITransport(app=probe.track(app))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://validator", timeout=None
+    ) as client:
+        report = await drive(
+            client, workload, mix, args.concurrency, args.duration
+        )
+    probe_task.cancel()
+    return report, probe.summary()
+
+
+async def run_http(url, workload, mix, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=url, timeout=None, limits=limits
+    ) as client:
+        return await drive(
+            client, workload, mix, args.concurrency, args.duration
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--server", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--url", help="Load an already running validator")
+    parser.add_argument("--workers", type=int, default=10_000)
+    parser.add_argument("--requests-presigned", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--mix", help=f"Weights per operation (default: {DEFAULT_MIX})")
+    parser.add_argument(
+        "--stall-ms",
+        type=float,
+        default=100.0,
+        help="Event loop lag counted as a stall",
+    )
+    parser.add_argument(
+        "--no-sign",
+        action="store_true",
+        help="Random signatures and VERIFY_SIGNATURE=false (no wallet libs needed)",
+    )
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+    sign = not args.no_sign
+
+    if args.url:
+        mix = parse_mix(args.mix or READ_ONLY_MIX)
+        report = asyncio.run(run_http(args.url, Workload(), mix, args))
+        loop = None
+    else:
+        mix = parse_mix(args.mix or DEFAULT_MIX)
+        with tempfile.TemporaryDirectory(prefix="hashtensor-load-") as tmp:
+            db_url = f"sqlite:///{os.path.join(tmp, 'validator.db')}"
+            print(f"Generating {args.workers} workers and signed requests...")
+            asyncio.run(
+                populate_database(db_url, generate_pool(args.workers))
+            )
+            workload = asyncio.run(
+                build_workload(db_url, args.requests_presigned, sign)
+            )
+            with FakePrometheus(args.workers) as prometheus:
+                if args.server == "asgi":
+                    with stubbed_app(
+                        db_url, prometheus.url, workload, sign
+                    ) as app:
+                        report, loop = asyncio.run(
+                            run_asgi(app, workload, mix, args)
+                        )
+                else:
+                    report, loop = _run_uvicorn(
+                        db_url, prometheus.url, workload, sign, mix, args
+                    )
+    print_report(report, loop)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"report": report, "event_loop": loop}, f, indent=2)
+
+
+def _run_uvicorn(db_url, prometheus_url, workload, sign, mix, args):
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop, out = ctx.Event(), ctx.Event(), ctx.Queue()
+    port = free_port()
+    process = ctx.Process(
+        target=_serve_uvicorn,
+        args=(
+            db_url,
+            prometheus_url,
+            workload,
+            sign,
+            args.stall_ms / 1000,
+            port,
+            ready,
+            stop,
+            out,
+        ),
+    )
+    process.start()
+    try:
+        if not ready.wait(120):
+            raise RuntimeError("uvicorn did not start")
+        report = asyncio.run(
+            run_http(f"http://127.0.0.1:{port}", workload, mix, args)
+        )
+        stop.set()
+        loop = out.get(timeout=60)
+    finally:
+        stop.set()
+        process.join(10)
+        if process.is_alive():
+            process.terminate()
+    return report, loop
+
+
+if __name__ == "__main__":
+    main()
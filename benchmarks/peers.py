@@ -0,0 +1,68 @@
+"""
+Peer validators for sync benchmarks: the real validator app (without its
+background tasks) served by uvicorn in a child process over its own
+database, so /openapi.json, /changes and the Merkle endpoints behave
+exactly as on another validator.
+"""
+
+import multiprocessing
+import os
+import time
+import urllib.request
+
+from .fake_prometheus import free_port
+
+
+def _serve(db_url: str, port: int) -> None:
+    os.environ["DATABASE_URL"] = db_url
+    import uvicorn
+
+    uvicorn.run(
+        "src.main:app",
+        host="127.0.0.1",
+        port=port,
+        lifespan="off",
+        log_level="warning",
+    )
+
+
+class PeerValidator:
+    def __init__(self, db_url: str):
+        self.db_url = db_url
+        self.host = "127.0.0.1"
+        self.port = free_port()
+        self._process: multiprocessing.Process | None = None
+
+    def start(self, timeout: float = 60.0) -> "PeerValidator":
+        ctx = multiprocessing.get_context("spawn")
+        self._process = ctx.Process(
+            target=_serve, args=(self.db_url, self.port), daemon=True
+        )
+        self._process.start()
+        deadline = time.monotonic() + timeout
+        while not self._is_up():
+            if time.monotonic() > deadline or not self._process.is_alive():
+                self.stop()
+                raise RuntimeError(f"Peer on port {self.port} did not start")
+            time.sleep(0.2)
+        return self
+
+    def _is_up(self) -> bool:
+        url = f"http://{self.host}:{self.port}/health"
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                return resp.status == 200
+        except OSError:
+            return False
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self) -> "PeerValidator":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,63 @@
+"""
+Run the end-to-end scenarios and store the results.
+
+    PYTHONPATH=. python -m benchmarks.run --workers 10000,100000
+    PYTHONPATH=. python -m benchmarks.run --scenario sync --workers 1000000
+    PYTHONPATH=. python -m benchmarks.compare benchmarks/results/A.json benchmarks/results/B.json
+"""
+
+import argparse
+from pathlib import Path
+
+from .harness import result_key, run_isolated, save_results
+from .scenarios import SCENARIOS
+
+
+def format_row(entry: dict) -> str:
+    latency = entry["latency_ms"]
+    latency_text = (
+        f"p50={latency['p50']:9.1f} p95={latency['p95']:9.1f} "
+        f"p99={latency['p99']:9.1f} ms"
+        if latency
+        else " " * 43
+    )
+    return (
+        f"{result_key(entry):<60} {entry['throughput']:>12.0f} {entry['unit']:<12}"
+        f" {latency_text}  rss={entry['peak_rss_mib']:7.0f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--workers",
+        default="10000,100000",
+        help="Comma-separated pool sizes",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Result file (default: benchmarks/results/<time>-<commit>.json)",
+    )
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.scenario or SCENARIOS:
+        for workers in (int(w) for w in args.workers.split(",")):
+            for entry in run_isolated(SCENARIOS[name], {"workers": workers}):
+                print(format_row(entry), flush=True)
+                results.append(entry)
+    if not args.no_save:
+        path = save_results(results, args.output)
+        print(f"Saved {len(results)} results to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+End-to-end scenarios. Each runs in its own process (see harness.run_isolated)
+and returns a list of harness.result entries.
+
+Signatures in generated data are random, so scenarios turn signature
+verification off (VERIFY_SIGNATURE=false for /register, an accept-all
+verifier for sync); sr25519 verification cost is not part of the numbers.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from .fake_chain import FakeChain
+from .fake_prometheus import FakePrometheus
+from .generators import POOL_WALLET, fake_hotkey, generate_pool, populate_database
+from .harness import result, timed_calls
+from .peers import PeerValidator
+
+
+@contextmanager
+def temporary_database():
+    with tempfile.TemporaryDirectory(prefix="hashtensor-bench-") as tmp:
+        yield tmp, f"sqlite:///{os.path.join(tmp, 'validator.db')}"
+
+
+def load_mapping(workers: int, repeat: int = 5) -> list[dict]:
+    """SqliteMappingSource.load_mapping over `workers` active rows."""
+    from src.interfaces.database import SqliteMappingSource
+
+    params = {"workers": workers}
+    with temporary_database() as (_, db_url):
+        asyncio.run(populate_database(db_url, generate_pool(workers)))
+        source = SqliteMappingSource(db_url)
+        latencies = asyncio.run(timed_calls(source.load_mapping, repeat))
+    return [
+        result(
+            "load_mapping", params, workers * repeat, sum(latencies), "rows",
+            latencies,
+        )
+    ]
+
+
+def compute_ratings(workers: int, repeat: int = 5) -> list[dict]:
+    """
+    Prometheus fetch and the full Validator.compute_ratings pipeline (fetch,
+    load mapping, group by hotkey, rate) against the fake Prometheus.
+    """
+    from src.config import ValidatorSettings
+    from src.interfaces.database import SqliteMappingSource
+    from src.mapping import MappingManager
+    from src.metrics import MetricsClient
+    from src.validator import Validator
+
+    params = {"workers": workers}
+    with temporary_database() as (_, db_url), FakePrometheus(
+        workers
+    ) as prometheus:
+        asyncio.run(populate_database(db_url, generate_pool(workers)))
+        config = ValidatorSettings(
+            prometheus_endpoint=prometheus.url,
+            kaspa_pool_owner_wallet=POOL_WALLET,
+            database_url=db_url,
+            metrics_snapshots=False,
+        )
+        metrics_client = MetricsClient(
+            prometheus.url, pool_owner_wallet=POOL_WALLET
+        )
+        # cache_ttl=0: every run reloads the mapping, as a cold weights run
+        validator = Validator(
+            config,
+            metrics_client,
+            MappingManager(SqliteMappingSource(db_url), cache_ttl=0),
+        )
+
+        async def measure():
+            fetch = await timed_calls(metrics_client.fetch_metrics_batch, repeat)
+            ratings = await validator.compute_ratings()
+            rate = await timed_calls(validator.compute_ratings, repeat)
+            return fetch, rate, len(ratings)
+
+        fetch, rate, hotkeys = asyncio.run(measure())
+    return [
+        result(
+            "fetch_metrics", params, workers * repeat, sum(fetch), "workers",
+            fetch,
+        ),
+        result(
+            "compute_ratings", params, workers * repeat, sum(rate), "workers",
+            rate, hotkeys=hotkeys,
+        ),
+    ]
+
+
+def register(
+    workers: int, requests: int = 2000, concurrency: int = 32
+) -> list[dict]:
+    """
+    POST /register through the ASGI app (no network) with `concurrency`
+    clients, on top of a database already holding `workers` registrations.
+    """
+    import httpx
+
+    from src.config import ValidatorSettings, load_config
+    from src.dependencies import get_substrate, get_worker_provider
+    from src.interfaces.worker_provider import WorkerProvider
+    from src.main import app
+    from src.metrics import MetricsClient, MinerKey
+
+    params = {
+        "workers": workers,
+        "requests": requests,
+        "concurrency": concurrency,
+    }
+    # New miners running 10 rigs each, disjoint from the existing pool
+    new = [
+        (hotkey, f"new{i}_{hotkey}")
+        for i in range(requests)
+        for hotkey in [fake_hotkey(10_000_000 + i // 10)]
+    ]
+    with temporary_database() as (_, db_url):
+        asyncio.run(populate_database(db_url, generate_pool(workers)))
+        config = ValidatorSettings(
+            database_url=db_url,
+            kaspa_pool_owner_wallet=POOL_WALLET,
+            verify_signature=False,
+        )
+        provider = WorkerProvider(MetricsClient("http://unused"))
+        # The presence index as the refresh loop would have built it
+        provider._cache = (
+            frozenset(
+                MinerKey(wallet=POOL_WALLET, worker=worker)
+                for _, worker in new
+            ),
+            time.time() + 3600,
+        )
+        chain = FakeChain(sorted({hotkey for hotkey, _ in new}))
+        app.dependency_overrides.update(
+            {
+                load_config: lambda: config,
+                get_worker_provider: lambda: provider,
+                get_substrate: lambda: chain.substrate,
+            }
+        )
+
+        async def measure():
+            queue = asyncio.Queue()
+            for item in new:
+                queue.put_nowait(item)
+            latencies, statuses = [], Counter()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://validator"
+            ) as client:
+
+                async def client_loop():
+                    while not queue.empty():
+                        hotkey, worker = queue.get_nowait()
+                        start = time.perf_counter()
+                        resp = await client.post(
+                            "/register",
+                            json={
+                                "hotkey": hotkey,
+                                "worker": worker,
+                                "registration_time": time.time(),
+                            },
+                            headers={"X-Signature": "00" * 64},
+                        )
+                        latencies.append(time.perf_counter() - start)
+                        statuses[resp.status_code] += 1
+
+                start = time.perf_counter()
+                await asyncio.gather(
+                    *[client_loop() for _ in range(concurrency)]
+                )
+                return time.perf_counter() - start, latencies, statuses
+
+        try:
+            with chain.install():
+                seconds, latencies, statuses = asyncio.run(measure())
+        finally:
+            app.dependency_overrides.clear()
+    return [
+        result(
+            "register", params, requests, seconds, "requests", latencies,
+            statuses={str(k): v for k, v in statuses.items()},
+        )
+    ]
+
+
+def sync(workers: int, peers: int = 3, unbound_ratio: float = 0.05) -> list[dict]:
+    """
+    sync_hotkey_workers_task against `peers` real validator processes that
+    all hold `workers` registrations (a fraction of them unbound): first
+    into an empty database, then again with nothing left to sync.
+    """
+    from src import tasks
+    from src.config import ValidatorSettings
+    from src.interfaces.database import Base, DatabaseService
+
+    params = {"workers": workers, "peers": peers}
+    with temporary_database() as (tmp, db_url):
+        seed_path = os.path.join(tmp, "peer.db")
+        peer_db = asyncio.run(
+            populate_database(
+                f"sqlite:///{seed_path}", generate_pool(workers), unbound_ratio
+            )
+        )
+        remote_root = peer_db.build_merkle_tree().root
+        peer_db.engine.dispose()
+        peer_urls = []
+        for i in range(peers):
+            path = os.path.join(tmp, f"peer{i}.db")
+            shutil.copy(seed_path, path)
+            peer_urls.append(f"sqlite:///{path}")
+
+        local = DatabaseService(db_url)
+        Base.metadata.create_all(local.engine)
+        config = ValidatorSettings(database_url=db_url)
+        chain = FakeChain([])
+        running = [PeerValidator(url).start() for url in peer_urls]
+        original_verify = tasks.verify_signature
+        tasks.verify_signature = lambda *args: True
+        try:
+            for i, peer in enumerate(running):
+                chain.add_validator(fake_hotkey(20_000_000 + i), peer.host, peer.port)
+            with chain.install():
+                start = time.perf_counter()
+                asyncio.run(
+                    tasks.sync_hotkey_workers_task(local, config, chain.substrate)
+                )
+                cold = time.perf_counter() - start
+                warm = [
+                    asyncio.run(_timed_sync(tasks, local, config, chain))
+                    for _ in range(3)
+                ]
+        finally:
+            tasks.verify_signature = original_verify
+            for peer in running:
+                peer.stop()
+        if local.build_merkle_tree().root != remote_root:
+            raise RuntimeError("Local database did not converge to the peers")
+    return [
+        result("sync.cold", params, workers, cold, "rows"),
+        result("sync.warm", params, len(warm), sum(warm), "rounds", warm),
+    ]
+
+
+async def _timed_sync(tasks, local, config, chain) -> float:
+    start = time.perf_counter()
+    await tasks.sync_hotkey_workers_task(local, config, chain.substrate)
+    return time.perf_counter() - start
+
+
+SCENARIOS = {
+    "load_mapping": load_mapping,
+    "compute_ratings": compute_ratings,
+    "register": register,
+    "sync": sync,
+}
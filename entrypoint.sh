@@ -4,5 +4,20 @@ set -e
 # Run Alembic migrations
 PYTHONPATH=. alembic upgrade head
 
+# With several workers only one of them may run the background tasks
+UVICORN_WORKERS="${UVICORN_WORKERS:-1}"
+if [ "$UVICORN_WORKERS" -gt 1 ] && [ -z "$LEADER_ELECTION" ]; then
+    export LEADER_ELECTION=file
+fi
+if [ "$UVICORN_WORKERS" -gt 1 ] && [ -z "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    # /internal/metrics aggregates the values written here by every worker
+    export PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus_multiproc
+fi
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Start the FastAPI app
-uvicorn src.main:app --host "${HOST:-0.0.0.0}" --port "${PORT:-8000}"
\ No newline at end of file
+uvicorn src.main:app --host "${HOST:-0.0.0.0}" --port "${PORT:-8000}" \
+    --workers "$UVICORN_WORKERS"
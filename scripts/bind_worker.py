@@ -197,6 +197,38 @@ async def post_to_validator(session, node, payload, signature):
         return None
 
 
+async def post_batch_to_validator(session, node, registrations, batch_size=1000):
+    """
+    Register all workers on a validator with /register/batch requests.
+    Validators without the batch endpoint get one /register request per
+    worker instead.
+    """
+    url = f"http://{node['ip']}:{node['port']}/register/batch"
+    for start in range(0, len(registrations), batch_size):
+        chunk = registrations[start : start + batch_size]
+        body = {
+            "registrations": [
+                {**payload, "signature": signature}
+                for payload, signature in chunk
+            ]
+        }
+        try:
+            async with session.post(
+                url, json=body, ssl=False, timeout=60
+            ) as response:
+                if response.status in (404, 405):
+                    for payload, signature in registrations[start:]:
+                        await post_to_validator(
+                            session, node, payload, signature
+                        )
+                    return
+                text = await response.text()
+                print(f"Validator {node['hotkey']} responded: {text}")
+        except Exception as e:
+            print(f"POST to {url} failed: {e}")
+            return
+
+
 def build_registration_payload(
     wallet: Wallet, worker: str
 ) -> tuple[dict, str]:
@@ -216,7 +248,11 @@ async def main():
     parser = argparse.ArgumentParser()
     Wallet.add_args(parser)
     parser.add_argument(
-        "--worker", type=str, required=True, help="Worker name or ID"
+        "--worker",
+        type=str,
+        nargs="+",
+        required=True,
+        help="Worker name or ID; several names are registered in one batch",
     )
     parser.add_argument(
         "--subtensor.network",
@@ -226,7 +262,7 @@ async def main():
         default=FINNEY_NETWORK,
     )
     args = parser.parse_args()
-    worker = getattr(args, "worker", None)
+    workers = getattr(args, "worker", None)
     wallet_name = getattr(args, "wallet.name", "default")
     wallet_hotkey = getattr(args, "wallet.hotkey", "default")
     wallet_path = getattr(args, "wallet.path", "~/.bittensor/wallets/")
@@ -238,16 +274,26 @@ async def main():
     if not nodes:
         print("No validators found")
         return
-    payload, signature = build_registration_payload(wallet, worker)
-    print(f"Registration payload: {json.dumps(payload, indent=2)}")
-    print(f"Signature (X-Signature): {signature}")
+    registrations = [
+        build_registration_payload(wallet, worker) for worker in workers
+    ]
+    for payload, signature in registrations:
+        print(f"Registration payload: {json.dumps(payload, indent=2)}")
+        print(f"Signature (X-Signature): {signature}")
 
     print("\nValidator responses:\n")
     async with aiohttp.ClientSession() as session:
-        tasks = [
-            post_to_validator(session, node, payload, signature)
-            for node in nodes
-        ]
+        if len(registrations) == 1:
+            payload, signature = registrations[0]
+            tasks = [
+                post_to_validator(session, node, payload, signature)
+                for node in nodes
+            ]
+        else:
+            tasks = [
+                post_batch_to_validator(session, node, registrations)
+                for node in nodes
+            ]
         await asyncio.gather(*tasks)
 
 
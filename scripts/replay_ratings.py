@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from src.config import load_config
+from src.interfaces.database import SqliteMappingSource
+from src.rating import RatingCalculator
+from src.snapshots import MetricsSnapshotStore
+from src.validator import Validator
+from fiber.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+async def replay(args):
+    """Recompute ratings for stored metrics snapshots without Prometheus."""
+    config = load_config()
+    store = MetricsSnapshotStore(args.snapshot_dir or config.metrics_snapshot_dir)
+    # Snapshots do not record the mapping; the current one is used for all of them
+    mapping = await SqliteMappingSource(config.database_url).load_mapping()
+    validator = Validator(config, metrics_client=None, mapping_manager=None)
+    calculator = RatingCalculator(
+        args.uptime_alpha
+        if args.uptime_alpha is not None
+        else config.rating_weight,
+        config.window,
+        max_difficulty=(
+            args.max_difficulty
+            if args.max_difficulty is not None
+            else config.max_difficulty
+        ),
+    )
+    count = 0
+    for snapshot in store.iter_snapshots(since=args.since, until=args.until):
+        hotkey_metrics = validator.map_batch_to_hotkeys(
+            snapshot.to_batch(), mapping
+        )
+        ratings = calculator.rate_batch(hotkey_metrics)
+        print(
+            json.dumps(
+                {
+                    "timestamp": snapshot.timestamp,
+                    "time": datetime.fromtimestamp(
+                        snapshot.timestamp, tz=timezone.utc
+                    ).isoformat(),
+                    "ratings": ratings,
+                }
+            )
+        )
+        count += 1
+    logger.info(f"[replay_ratings] Replayed {count} snapshots")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay RatingCalculator over persisted metrics snapshots (JSON lines on stdout)"
+    )
+    parser.add_argument("--snapshot-dir", default=None)
+    parser.add_argument("--since", type=float, default=None, help="Unix timestamp")
+    parser.add_argument("--until", type=float, default=None, help="Unix timestamp")
+    parser.add_argument("--uptime-alpha", type=float, default=None)
+    parser.add_argument("--max-difficulty", type=float, default=None)
+    asyncio.run(replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
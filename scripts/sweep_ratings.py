@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import json
+import time
+from datetime import timedelta
+
+from src.config import load_config
+from src.interfaces.database import SqliteMappingSource
+from src.simulation import (
+    STRATEGIES,
+    RatingParams,
+    gaming_targets,
+    parameter_grid,
+    sweep,
+    synthetic_population,
+)
+from src.snapshots import MetricsSnapshotStore
+from src.validator import Validator
+from fiber.utils import get_logger
+
+logger = get_logger(__name__)
+
+COLUMNS = (
+    "uptime_alpha",
+    "max_difficulty",
+    "shares_per_minute",
+    "window",
+    "gini",
+    "hhi",
+    "top10_share",
+    "nakamoto",
+    "shift",
+    "rank_corr",
+)
+
+
+async def load_population(args, config):
+    if args.synthetic:
+        return synthetic_population(
+            args.synthetic,
+            config.max_workers_per_hotkey,
+            config.window,
+            seed=args.seed,
+        )
+    store = MetricsSnapshotStore(args.snapshot_dir or config.metrics_snapshot_dir)
+    snapshots = [
+        path
+        for timestamp, path in store.list()
+        if args.at is None or timestamp <= args.at
+    ]
+    if not snapshots:
+        raise SystemExit("No metrics snapshot found; use --synthetic instead")
+    snapshot = store.load(snapshots[-1])
+    # Snapshots do not record the mapping; the current one is used
+    mapping = await SqliteMappingSource(config.database_url).load_mapping()
+    validator = Validator(config, metrics_client=None, mapping_manager=None)
+    logger.info(f"[sweep_ratings] Using snapshot {snapshots[-1]}")
+    return validator.map_batch_to_hotkeys(snapshot.to_batch(), mapping)
+
+
+def print_table(results, strategies):
+    columns = COLUMNS + tuple(f"gain_{s}" for s in strategies)
+    widths = [max(12, len(name)) for name in columns]
+    print("  ".join(f"{name:>{w}}" for name, w in zip(columns, widths)))
+    for row in results:
+        print(
+            "  ".join(
+                f"{row[name]:>{w}.6g}" for name, w in zip(columns, widths)
+            )
+        )
+
+
+async def run(args):
+    """Evaluate a grid of RatingCalculator parameters offline."""
+    config = load_config()
+    batch = await load_population(args, config)
+    # The parameters the validator rates with today
+    calculator = Validator(config, None, None).rating_calculator
+    baseline = RatingParams(
+        calculator.uptime_alpha,
+        calculator.max_difficulty,
+        calculator.shares_per_minute,
+        config.window,
+    )
+    grid = parameter_grid(
+        args.uptime_alpha or [baseline.uptime_alpha],
+        args.max_difficulty or [baseline.max_difficulty],
+        args.shares_per_minute or [baseline.shares_per_minute],
+        [timedelta(minutes=m) for m in args.window_minutes]
+        if args.window_minutes
+        else [baseline.window],
+    )
+    start = time.perf_counter()
+    results = sweep(
+        batch,
+        grid,
+        baseline,
+        strategies=args.strategies,
+        max_workers=config.max_workers_per_hotkey,
+        jobs=args.jobs,
+        targets=gaming_targets(batch, args.targets),
+    )
+    logger.info(
+        f"[sweep_ratings] {len(grid)} parameter sets over "
+        f"{len(batch.hotkeys)} hotkeys / {len(batch.metrics)} workers "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    if args.json:
+        for row in results:
+            print(json.dumps(row))
+    else:
+        print_table(results, args.strategies)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Sweep RatingCalculator parameters over the latest metrics "
+            "snapshot (or a synthetic population) and report weight "
+            "concentration, the shift from the configured parameters and "
+            "how much gaming strategies gain (gain > 1 means it pays)"
+        )
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--snapshot-dir", default=None)
+    source.add_argument(
+        "--synthetic",
+        type=int,
+        default=None,
+        metavar="HOTKEYS",
+        help="Simulate this many hotkeys instead of loading a snapshot",
+    )
+    parser.add_argument(
+        "--at",
+        type=float,
+        default=None,
+        help="Use the last snapshot before this Unix timestamp",
+    )
+    parser.add_argument("--uptime-alpha", type=float, nargs="+")
+    parser.add_argument("--max-difficulty", type=float, nargs="+")
+    parser.add_argument("--shares-per-minute", type=int, nargs="+")
+    parser.add_argument(
+        "--window-minutes",
+        type=float,
+        nargs="+",
+        help="Rating windows to try over the recorded metrics",
+    )
+    parser.add_argument(
+        "--strategies", nargs="*", choices=STRATEGIES, default=list(STRATEGIES)
+    )
+    parser.add_argument(
+        "--targets", type=int, default=16, help="Hotkeys that try each strategy"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Worker processes (default: all cores)"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="JSON lines instead of a table"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
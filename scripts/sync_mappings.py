@@ -6,7 +6,7 @@ import json
 from src.config import ValidatorSettings
 from src.interfaces.database import DatabaseService
 from src.utils import (
-    fetch_hotkey_workers_from_validator,
+    iter_hotkey_workers_from_validator,
     verify_signature,
 )
 from fiber.utils import get_logger
@@ -14,30 +14,20 @@ from fiber.utils import get_logger
 logger = get_logger(__name__)
 
 async def fetch_workers_paginated(session, ip, port, db_service: DatabaseService):
-    page_size = 100
-    page_number = 1
+    # Streams rows as NDJSON; peers without streaming return one JSON page per
+    # request, so keep asking from the newest registration time seen.
     last_registration_time = 0
     total_added = 0
     total_failed = 0
     while True:
-        url = f"http://{ip}:{port}/hotkey_workers"
-        params = {
-            "since_timestamp": last_registration_time,
-            "page_size": page_size,
-            "page_number": page_number,
-        }
-        async with session.get(url, params=params, timeout=10) as resp:
-            if resp.status != 200:
-                logger.error(f"Failed to fetch workers: {resp.status}")
-                break
-            workers = await resp.json()
-        if not workers:
-            break
-        logger.info(f"[sync_mappings] Fetched {len(workers)} workers from {ip}:{port} (page {page_number})")
+        fetched = 0
         page_added = 0
         page_failed = 0
         max_registration_time = last_registration_time
-        for worker_obj in workers:
+        async for worker_obj in iter_hotkey_workers_from_validator(
+            session, ip, port, last_registration_time
+        ):
+            fetched += 1
             worker = worker_obj["worker"]
             worker_hotkey = worker_obj["hotkey"]
             registration_time = worker_obj["registration_time"]
@@ -63,11 +53,12 @@ async def fetch_workers_paginated(session, ip, port, db_service: DatabaseService
             except Exception as e:
                 logger.error(f"Failed to add worker {worker}: {e}")
                 page_failed += 1
+        if fetched:
+            logger.info(f"[sync_mappings] Fetched {fetched} workers from {ip}:{port} since {last_registration_time}")
         total_added += page_added
         total_failed += page_failed
-        if len(workers) < page_size:
+        if not fetched or max_registration_time <= last_registration_time:
             break
-        page_number += 1
         last_registration_time = max_registration_time
     logger.info(f"[sync_mappings] Total Added: {total_added}, Total Failed: {total_failed}")
 
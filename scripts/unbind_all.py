@@ -182,11 +182,13 @@ async def get_validators(
     return [node for node, is_valid in zip(real_nodes, results) if is_valid]
 
 
-async def get_mappings_from_validator(session, node):
-    """Fetch mappings from a validator"""
+async def get_mappings_from_validator(session, node, hotkey_address):
+    """Fetch the mappings of one hotkey from a validator"""
     url = f"http://{node['ip']}:{node['port']}/mappings"
     try:
-        async with session.get(url, timeout=10) as resp:
+        async with session.get(
+            url, params={"hotkey": hotkey_address}, timeout=30
+        ) as resp:
             if resp.status != 200:
                 print(f"Failed to get mappings from {node['hotkey']}: {resp.status}")
                 return {}
@@ -212,6 +214,89 @@ async def post_unbind_to_validator(session, node, payload, signature):
         return None
 
 
+async def post_unbind_chunk(session, node, url, body, retries):
+    """
+    POST one /unbind/batch body, retrying connection errors and 5xx with
+    backoff. Returns (status, json body), or None once the retries ran out.
+    """
+    for attempt in range(retries):
+        try:
+            async with session.post(
+                url, json=body, ssl=False, timeout=60
+            ) as response:
+                if response.status < 500:
+                    try:
+                        result = await response.json(content_type=None)
+                    except ValueError:
+                        result = {}
+                    return response.status, result
+                print(f"Validator {node['hotkey']} returned {response.status}")
+        except Exception as e:
+            print(f"POST unbind batch to {url} failed: {e}")
+        if attempt + 1 < retries:
+            await asyncio.sleep(2**attempt)
+    return None
+
+
+async def post_unbind_batch_to_validator(
+    session, node, hotkey_address, unbinds, retries=3, batch_size=1000
+):
+    """
+    Unbind all workers on a validator with /unbind/batch requests. Batches
+    start at the validators' default limit and are halved whenever a
+    validator answers 413 because it accepts fewer per request. Validators
+    without the batch endpoint get one /unbind request per worker instead.
+    """
+    url = f"http://{node['ip']}:{node['port']}/unbind/batch"
+    start = 0
+    while start < len(unbinds):
+        chunk = unbinds[start : start + batch_size]
+        body = {
+            "hotkey": hotkey_address,
+            "unbinds": [
+                {"worker": payload["worker"], "signature": signature}
+                for payload, signature in chunk
+            ],
+        }
+        reply = await post_unbind_chunk(session, node, url, body, retries)
+        if reply is None:
+            print(f"Giving up on validator {node['hotkey']}")
+            return
+        status, result = reply
+        if status in (404, 405):
+            for payload, signature in unbinds[start:]:
+                await post_unbind_to_validator(
+                    session, node, payload, signature
+                )
+            return
+        if status == 413 and len(chunk) > 1:
+            batch_size = len(chunk) // 2
+            continue
+        if status != 200:
+            print(
+                f"Validator {node['hotkey']} rejected the unbinds "
+                f"({status}): {result.get('detail')}"
+            )
+            return
+        print(
+            f"Validator {node['hotkey']}: "
+            f"{result.get('unbound')} unbound, "
+            f"{result.get('failed')} failed"
+        )
+        start += len(chunk)
+
+
+async def gather_limited(coros, limit):
+    """Run coroutines concurrently, at most `limit` at a time."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+
 def build_unbind_payload(
     wallet: Wallet, worker: str
 ) -> tuple[dict, str]:
@@ -244,6 +329,12 @@ async def main():
         help="Subtensor network",
         default=FINNEY_NETWORK,
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Validators contacted at the same time",
+    )
     parser.add_argument(
         "--confirm",
         action="store_true",
@@ -256,6 +347,7 @@ async def main():
     wallet_path = getattr(args, "wallet.path", "~/.bittensor/wallets/")
     subtensor_network = getattr(args, "subtensor.network", FINNEY_NETWORK)
     confirm = getattr(args, "confirm", False)
+    concurrency = max(1, getattr(args, "concurrency", 16))
     
     wallet = Wallet(config=Config(wallet_name, wallet_hotkey, wallet_path))
     hotkey_address = wallet.get_hotkey().ss58_address
@@ -277,9 +369,10 @@ async def main():
     print("\nFetching mappings from validators...")
     async with aiohttp.ClientSession() as session:
         mapping_tasks = [
-            get_mappings_from_validator(session, node) for node in nodes
+            get_mappings_from_validator(session, node, hotkey_address)
+            for node in nodes
         ]
-        mappings_results = await asyncio.gather(*mapping_tasks)
+        mappings_results = await gather_limited(mapping_tasks, concurrency)
     
     # Collect all workers for this hotkey
     all_workers = set()
@@ -324,18 +417,19 @@ async def main():
     
     # Unbind all workers
     print(f"\nUnbinding {len(all_workers)} workers...")
+    unbinds = [
+        build_unbind_payload(wallet, worker) for worker in sorted(all_workers)
+    ]
     async with aiohttp.ClientSession() as session:
-        for worker in all_workers:
-            print(f"\nUnbinding worker: {worker}")
-            payload, signature = build_unbind_payload(wallet, worker)
-            
-            # Send unbind request to all validators
-            unbind_tasks = [
-                post_unbind_to_validator(session, node, payload, signature)
-                for node in nodes
-            ]
-            await asyncio.gather(*unbind_tasks)
-    
+        # One batch per validator, carrying every worker's signed unbind
+        unbind_tasks = [
+            post_unbind_batch_to_validator(
+                session, node, hotkey_address, unbinds
+            )
+            for node in nodes
+        ]
+        await gather_limited(unbind_tasks, concurrency)
+
     print(f"\nUnbind process completed for {len(all_workers)} workers")
 
 
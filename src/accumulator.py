@@ -0,0 +1,174 @@
+# accumulator.py
+# Rolling-window accumulation of Prometheus counter increases per miner
+
+import threading
+from collections import deque
+from datetime import timedelta
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .metrics import MinerKey
+
+
+BUCKET_SECONDS = 60
+# Leave the current minute to Prometheus scrapes before bucketing it
+SCRAPE_DELAY = 30
+
+# Counters accumulated per bucket, in the order values are stored
+ACCUMULATED_COUNTERS = (
+    "ks_valid_share_counter",
+    "ks_invalid_share_counter",
+    "ks_valid_share_diff_counter",
+    "ks_miner_work_seconds_total",
+)
+
+Bucket = Dict["MinerKey", Tuple[float, ...]]
+
+
+class MetricsAccumulator:
+    """
+    Keeps minute buckets of counter increases and derives window totals.
+
+    Each bucket holds the increase of every counter in ACCUMULATED_COUNTERS
+    over one minute, for the miners that had any activity in that minute.
+    Running totals are kept for every configured window: a new bucket is
+    added to each of them, and buckets that fall out of a window are
+    subtracted again, so reading a total never rescans the history.
+    """
+
+    def __init__(self, windows: Iterable[timedelta]):
+        self.windows: List[int] = sorted(
+            {int(w.total_seconds()) for w in windows}
+        )
+        if not self.windows:
+            raise ValueError("At least one window is required")
+        self.horizon = self.windows[-1]
+        self.last_bucket_end: int | None = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._buckets: Deque[Tuple[int, Bucket]] = deque()
+        self._first_seq = 0  # sequence number of self._buckets[0]
+        # Sequence number of the oldest bucket still counted in each window
+        self._heads: Dict[int, int] = {w: 0 for w in self.windows}
+        self._totals: Dict[int, Dict["MinerKey", List[float]]] = {
+            w: {} for w in self.windows
+        }
+        self._counts: Dict[int, Dict["MinerKey", int]] = {
+            w: {} for w in self.windows
+        }
+        self.last_bucket_end = None
+
+    def pending_range(self, now: float) -> Tuple[int, int] | None:
+        """
+        Return the (start, end) bucket timestamps still to be fetched, or None
+        if the accumulator is up to date. A cold or too-old accumulator asks
+        for the whole horizon.
+        """
+        end = int(now - SCRAPE_DELAY) // BUCKET_SECONDS * BUCKET_SECONDS
+        last = self.last_bucket_end
+        if last is None or end - last > self.horizon:
+            return end - self.horizon + BUCKET_SECONDS, end
+        if end <= last:
+            return None
+        return last + BUCKET_SECONDS, end
+
+    def add_range(
+        self,
+        start: int,
+        end: int,
+        counters: Sequence[Dict[int, Dict["MinerKey", float]]],
+    ) -> None:
+        """
+        Merge per-counter results of a range query into buckets.
+
+        `counters` holds one {timestamp: {MinerKey: increase}} map per entry
+        of ACCUMULATED_COUNTERS. Buckets already accumulated (e.g. by a
+        concurrent fetch of the same range) are ignored.
+        """
+        timestamps = sorted(
+            {ts for series in counters for ts in series if start <= ts <= end}
+        )
+        with self._lock:
+            if (
+                self.last_bucket_end is None
+                or start > self.last_bucket_end + BUCKET_SECONDS
+            ):
+                self._reset()
+            elif end <= self.last_bucket_end:
+                return
+            for ts in timestamps:
+                if (
+                    self.last_bucket_end is not None
+                    and ts <= self.last_bucket_end
+                ):
+                    continue
+                keys = set()
+                for series in counters:
+                    keys.update(series.get(ts, {}))
+                bucket: Bucket = {}
+                for key in keys:
+                    values = tuple(
+                        series.get(ts, {}).get(key, 0.0) for series in counters
+                    )
+                    if any(values):
+                        bucket[key] = values
+                self._add(ts, bucket)
+            self.last_bucket_end = end
+            self._evict(end)
+
+    def _add(self, ts: int, bucket: Bucket) -> None:
+        self._buckets.append((ts, bucket))
+        for w in self.windows:
+            totals, counts = self._totals[w], self._counts[w]
+            for key, values in bucket.items():
+                acc = totals.get(key)
+                if acc is None:
+                    totals[key] = list(values)
+                    counts[key] = 1
+                    continue
+                for i, value in enumerate(values):
+                    acc[i] += value
+                counts[key] += 1
+        self.last_bucket_end = ts
+
+    def _evict(self, now: int) -> None:
+        end_seq = self._first_seq + len(self._buckets)
+        for w in self.windows:
+            cutoff = now - w
+            totals, counts = self._totals[w], self._counts[w]
+            head = self._heads[w]
+            while head < end_seq:
+                ts, bucket = self._buckets[head - self._first_seq]
+                if ts > cutoff:
+                    break
+                for key, values in bucket.items():
+                    counts[key] -= 1
+                    if counts[key] == 0:
+                        # Drop the key outright so float drift cannot linger
+                        del counts[key]
+                        del totals[key]
+                        continue
+                    acc = totals[key]
+                    for i, value in enumerate(values):
+                        acc[i] -= value
+                head += 1
+            self._heads[w] = head
+        # The largest window owns the oldest bucket still needed
+        while self._first_seq < self._heads[self.horizon]:
+            self._buckets.popleft()
+            self._first_seq += 1
+
+    def totals(
+        self, window: timedelta
+    ) -> Dict["MinerKey", Tuple[float, ...]]:
+        """Return counter totals per miner over one of the configured windows."""
+        seconds = int(window.total_seconds())
+        if seconds not in self._totals:
+            raise ValueError(f"Window {window} is not accumulated")
+        with self._lock:
+            return {
+                key: tuple(values)
+                for key, values in self._totals[seconds].items()
+            }
@@ -2,6 +2,7 @@
 # Loads configuration using pydantic-settings (BaseSettings) with Pydantic v2 syntax
 
 from datetime import timedelta
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Literal
 from fiber.constants import FINNEY_NETWORK, FINNEY_TEST_NETWORK
@@ -15,8 +16,24 @@ class ValidatorSettings(BaseSettings):
     ] = "database"
     rating_weight: float = 1.0
     window: timedelta = timedelta(minutes=60)
+    metrics_accumulator: bool = False
+    metrics_accumulator_views: list[timedelta] = [
+        timedelta(minutes=5),
+        timedelta(hours=24),
+    ]
+    metrics_snapshots: bool = True
+    metrics_snapshot_dir: str = "data/snapshots"
+    metrics_snapshot_interval: timedelta = timedelta(minutes=15)
+    metrics_snapshot_retention: timedelta = timedelta(hours=24)
+    metrics_snapshot_max_age: timedelta = timedelta(minutes=10)
     database_url: str = "sqlite:///data/mapping.db"
+    # Connection pool for server databases (e.g. postgresql+psycopg://...);
+    # ignored for SQLite
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_recycle: timedelta = timedelta(minutes=30)
     cache_ttl: timedelta = timedelta(seconds=15)
+    worker_index_max_staleness: timedelta = timedelta(minutes=2)
     kaspa_pool_owner_wallet: str = (
         "kaspa:qr4ksh6s3rmy5f4qyql2kh7p9z7f4c55da5r5gz2nnsd8ctt4k69whtr4u0wp"
     )
@@ -24,9 +41,33 @@ class ValidatorSettings(BaseSettings):
     registration_time_tolerance: timedelta = timedelta(minutes=1)
     verify_signature: bool = True
     set_weights_interval: timedelta = timedelta(minutes=60)
+    # Weights are only resubmitted when they moved by at least
+    # set_weights_min_change (L1 distance of the normalized quantized
+    # vectors, 0..2; 0 = always), the metagraph changed, or the last
+    # submission is older than set_weights_max_age
+    set_weights_min_change: float = 0.01
+    set_weights_max_age: timedelta = timedelta(hours=6)
     max_workers_per_hotkey: int = 30
+    # Items accepted per /register/batch or /unbind/batch request
+    register_batch_max_size: int = 1000
     sync_hotkey_workers_interval: timedelta = timedelta(minutes=5)
     disable_set_weights: bool = False
+    # Which process runs the background tasks when several serve the API
+    # (UVICORN_WORKERS > 1): "none" = every process, "file" = flock on
+    # leader_lock_file (one host), "database" = lease row in database_url
+    leader_election: Literal["none", "file", "database"] = "none"
+    leader_lock_file: str = "data/leader.lock"
+    leader_lease_ttl: timedelta = timedelta(seconds=30)
+    # Log the event loop stack whenever a blocking call stalls it longer
+    # than loop_stall_threshold; lag is exported on /internal/metrics
+    loop_monitor: bool = False
+    loop_monitor_interval: timedelta = timedelta(milliseconds=50)
+    loop_stall_threshold: timedelta = timedelta(milliseconds=250)
+    # /internal/profile is only served when enabled and called with
+    # X-Admin-Token: <admin_token>
+    profiling_enabled: bool = False
+    admin_token: str | None = None
+    profiling_max_duration: timedelta = timedelta(seconds=60)
     max_difficulty: float = 16384.0
     
     wallet_name: str = "default"
@@ -35,10 +76,27 @@ class ValidatorSettings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @model_validator(mode="after")
+    def check_leader_snapshots(self) -> "ValidatorSettings":
+        # Followers take their metrics from the snapshots the leader publishes
+        if self.leader_election != "none" and not self.metrics_snapshots:
+            raise ValueError(
+                "leader_election requires metrics_snapshots to be enabled"
+            )
+        return self
+
     @property
     def netuid(self) -> int:
         return get_netuid(self.subtensor_network)
 
+    @property
+    def database_engine_options(self) -> dict:
+        return dict(
+            pool_size=self.database_pool_size,
+            max_overflow=self.database_max_overflow,
+            pool_recycle=int(self.database_pool_recycle.total_seconds()),
+        )
+
 
 def load_config() -> ValidatorSettings:
     """Load config from environment variables and .env file."""
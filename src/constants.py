@@ -13,3 +13,5 @@ NETWORK_TO_NETUID = {
 SECONDS_IN_BLOCK = 12
 
 MIN_WEIGHTED_STAKE = 1000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
@@ -1,12 +1,19 @@
 from fastapi import Depends
-from typing import Annotated
+from typing import Annotated, Iterator
 
 from fiber import SubstrateInterface
 
 
 from .mapping import MappingManager, MappingSource
 
+from .leader import (
+    DatabaseLeaseLeaderElection,
+    FileLockLeaderElection,
+    LeaderElection,
+)
+from .merkle import MerkleTreeCache
 from .metrics import MetricsClient
+from .snapshots import MetricsSnapshotStore
 
 from .interfaces.worker_provider import WorkerProvider
 
@@ -21,22 +28,47 @@ from .config import ValidatorSettings, load_config
 
 substrate: SubstrateInterface | None = None
 worker_provider: WorkerProvider | None = None
+metrics_client: MetricsClient | None = None
+merkle_tree_cache: MerkleTreeCache | None = None
+mapping_manager: MappingManager | None = None
+validator: Validator | None = None
+leader_election: LeaderElection | None = None
 
 
 def get_metrics_client(
     config: Annotated[ValidatorSettings, Depends(load_config)],
 ) -> MetricsClient:
-    return MetricsClient(
-        config.prometheus_endpoint,
-        pool_owner_wallet=config.kaspa_pool_owner_wallet,
-    )
+    # Shared so accumulated metrics history survives across requests
+    global metrics_client
+    if metrics_client is None:
+        metrics_client = MetricsClient(
+            config.prometheus_endpoint,
+            pool_owner_wallet=config.kaspa_pool_owner_wallet,
+            accumulator_views=(
+                config.metrics_accumulator_views
+                if config.metrics_accumulator
+                else None
+            ),
+            snapshot_store=(
+                MetricsSnapshotStore(
+                    config.metrics_snapshot_dir,
+                    retention=config.metrics_snapshot_retention,
+                    interval=config.metrics_snapshot_interval,
+                )
+                if config.metrics_snapshots
+                else None
+            ),
+        )
+    return metrics_client
 
 
 def get_mapping_source(
     config: Annotated[ValidatorSettings, Depends(load_config)],
 ) -> MappingSource:
     if config.mapping_source == "database":
-        return SqliteMappingSource()
+        return SqliteMappingSource(
+            config.database_url, config.database_engine_options
+        )
     raise ValueError(f"Invalid mapping source: {config.mapping_source}")
 
 
@@ -44,7 +76,14 @@ def get_mapping_manager(
     mapping_source: Annotated[MappingSource, Depends(get_mapping_source)],
     config: Annotated[ValidatorSettings, Depends(load_config)],
 ) -> MappingManager:
-    return MappingManager(mapping_source, config.cache_ttl.total_seconds())
+    # Shared so the mapping and its index are loaded once per cache_ttl,
+    # not on every request
+    global mapping_manager
+    if mapping_manager is None:
+        mapping_manager = MappingManager(
+            mapping_source, config.cache_ttl.total_seconds()
+        )
+    return mapping_manager
 
 
 def get_worker_provider(
@@ -54,16 +93,40 @@ def get_worker_provider(
     global worker_provider
     if worker_provider is None:
         worker_provider = WorkerProvider(
-            metrics_client, config.cache_ttl.total_seconds()
+            metrics_client,
+            config.cache_ttl.total_seconds(),
+            config.worker_index_max_staleness.total_seconds(),
         )
     return worker_provider
 
 
+def create_database_service(config: ValidatorSettings) -> DatabaseService:
+    return DatabaseService(
+        config.database_url,
+        config.max_workers_per_hotkey,
+        config.database_engine_options,
+    )
+
+
 def get_database_service(
     config: Annotated[ValidatorSettings, Depends(load_config)],
-) -> DatabaseService:
-    # In production, you might want to use a singleton  or DI container
-    return DatabaseService(config.database_url, config.max_workers_per_hotkey)
+) -> Iterator[DatabaseService]:
+    # One service per request; its session must be closed afterwards, or it
+    # keeps a connection of the engine's shared pool checked out
+    db_service = create_database_service(config)
+    try:
+        yield db_service
+    finally:
+        db_service.close()
+
+
+def get_merkle_tree_cache(
+    config: Annotated[ValidatorSettings, Depends(load_config)],
+) -> MerkleTreeCache:
+    global merkle_tree_cache
+    if merkle_tree_cache is None:
+        merkle_tree_cache = MerkleTreeCache(config.cache_ttl.total_seconds())
+    return merkle_tree_cache
 
 
 def get_validator(
@@ -71,7 +134,11 @@ def get_validator(
     metrics_client: Annotated[MetricsClient, Depends(get_metrics_client)],
     mapping_manager: Annotated[MappingManager, Depends(get_mapping_manager)],
 ) -> Validator:
-    return Validator(config, metrics_client, mapping_manager)
+    # Shared so the /metrics index survives across requests
+    global validator
+    if validator is None:
+        validator = Validator(config, metrics_client, mapping_manager)
+    return validator
 
 
 def get_substrate(
@@ -88,4 +155,23 @@ def get_substrate(
 def get_dynamic_config_service(
     config: Annotated[ValidatorSettings, Depends(load_config)],
 ) -> DynamicConfigService:
-    return DynamicConfigService(config.database_url)
+    return DynamicConfigService(
+        config.database_url, config.database_engine_options
+    )
+
+
+def get_leader_election(
+    config: Annotated[ValidatorSettings, Depends(load_config)],
+) -> LeaderElection:
+    global leader_election
+    if leader_election is None:
+        if config.leader_election == "file":
+            leader_election = FileLockLeaderElection(config.leader_lock_file)
+        elif config.leader_election == "database":
+            leader_election = DatabaseLeaseLeaderElection(
+                config.database_url,
+                config.leader_lease_ttl.total_seconds(),
+            )
+        else:
+            leader_election = LeaderElection()
+    return leader_election
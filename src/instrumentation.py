@@ -0,0 +1,141 @@
+# instrumentation.py
+# Operational metrics about the validator itself, served on /internal/metrics
+# (not to be confused with the miner metrics served on /metrics)
+
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+PREFIX = "hashtensor_validator"
+
+F = TypeVar("F", bound=Callable)
+
+# Prometheus queries take seconds; database writes and cache loads take
+# milliseconds, so the buckets span both
+DURATION_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+OPERATION_SECONDS = Histogram(
+    f"{PREFIX}_operation_duration_seconds",
+    "Duration of validator operations",
+    ["operation"],
+    buckets=DURATION_BUCKETS,
+)
+OPERATION_ERRORS = Counter(
+    f"{PREFIX}_operation_errors_total",
+    "Validator operations that raised an exception",
+    ["operation"],
+)
+CACHE_REQUESTS = Counter(
+    f"{PREFIX}_cache_requests_total",
+    "Cache lookups by cache and result (hit, stale, miss, snapshot)",
+    ["cache", "result"],
+)
+SYNC_CHANGES = Counter(
+    f"{PREFIX}_sync_changes_total",
+    "Registrations and unbinds received from other validators, by outcome",
+    ["result"],
+)
+SET_WEIGHTS = Counter(
+    f"{PREFIX}_set_weights_total",
+    "set_weights attempts by result (success, failure, skipped)",
+    ["result"],
+)
+WEIGHTS_DECISIONS = Counter(
+    f"{PREFIX}_weights_decisions_total",
+    "Weight submission decisions by reason (first, metagraph, max_age, "
+    "changed, unchanged)",
+    ["reason"],
+)
+# Only the process running set_weights sets these, so the most recent
+# value is the one to export when several processes serve the API
+WEIGHTS_CHANGE = Gauge(
+    f"{PREFIX}_weights_change",
+    "L1 distance between the computed and the last submitted normalized weights",
+    multiprocess_mode="mostrecent",
+)
+WEIGHTS_AGE = Gauge(
+    f"{PREFIX}_weights_age_seconds",
+    "Age of the last submitted weights when they were last checked",
+    multiprocess_mode="mostrecent",
+)
+EVENT_LOOP_LAG = Histogram(
+    f"{PREFIX}_event_loop_lag_seconds",
+    "How late the API event loop ran a scheduled callback",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_STALLS = Counter(
+    f"{PREFIX}_event_loop_stalls_total",
+    "Times the API event loop was blocked for longer than the stall threshold",
+)
+
+
+@contextmanager
+def observe(operation: str) -> Iterator[None]:
+    """Record the duration of the block, and count it if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        OPERATION_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        OPERATION_SECONDS.labels(operation).observe(
+            time.perf_counter() - start
+        )
+
+
+def timed(operation: str) -> Callable[[F], F]:
+    """Decorator form of `observe` for plain and async functions."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with observe(operation):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with observe(operation):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def cache_lookup(cache: str, result: str) -> None:
+    CACHE_REQUESTS.labels(cache, result).inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Exposition of all metrics and its content type. When the API runs in
+    several processes (PROMETHEUS_MULTIPROC_DIR is set), the values of all
+    of them are aggregated.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
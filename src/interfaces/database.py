@@ -1,30 +1,95 @@
 # interfaces/sqlite.py
 # SQLite interface for hotkey <-> worker mapping using SQLAlchemy
 
+from collections import Counter
 from datetime import datetime
+import json
 import os
+import threading
 from sqlalchemy import (
     DateTime,
     Float,
     create_engine,
+    select,
     String,
     Column,
     BigInteger,
+    Index,
+    Integer,
+    delete,
+    func,
+    insert,
+    make_url,
+    text,
 )
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import (
     sessionmaker,
     declarative_base,
     Mapped,
     mapped_column,
 )
+from ..instrumentation import timed
 from ..mapping import MappingSource
-from typing import Optional
+from ..merkle import UNBOUND_MARKER, MerkleRow, MerkleTree
+from typing import Iterable, Iterator, Optional
 import time
 
 DATABASE_URL = f"sqlite:///data/mapping.db"
 
 Base = declarative_base()
 
+_engines: dict[tuple, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def create_db_engine(
+    db_url: str = DATABASE_URL,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_recycle: int = 1800,
+) -> Engine:
+    """
+    Return the shared engine for a database URL, creating it on first use.
+
+    Services are created per request, so sharing the engine (and with it the
+    connection pool) avoids reconnecting every time. SQLite connections may
+    be used from the background task threads; server databases get a sized
+    pool with pre-ping so connections dropped by the server are replaced.
+    """
+    key = (db_url, pool_size, max_overflow, pool_recycle)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            if make_url(db_url).get_backend_name() == "sqlite":
+                engine = create_engine(
+                    db_url, connect_args={"check_same_thread": False}
+                )
+            else:
+                engine = create_engine(
+                    db_url,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    pool_recycle=pool_recycle,
+                    pool_pre_ping=True,
+                )
+            _engines[key] = engine
+        return engine
+
+
+def insert_ignoring_conflicts(engine: Engine, table, index_elements: list[str]):
+    """INSERT ... ON CONFLICT DO NOTHING for the engine's dialect."""
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise ValueError(f"Unsupported database dialect: {dialect}")
+    return dialect_insert(table).on_conflict_do_nothing(
+        index_elements=index_elements
+    )
+
 
 class HotkeyWorker(Base):
     __tablename__ = "hotkey_worker"
@@ -37,19 +102,76 @@ class HotkeyWorker(Base):
     signature: Mapped[str] = mapped_column(String, nullable=False)
     unbind_signature: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
+    __table_args__ = (
+        Index("ix_hotkey_worker_hotkey_unbind", "hotkey", "unbind_signature"),
+        # Covers load_mapping: active rows only, without the signature. The
+        # (always NULL) unbind_signature lets SQLite treat it as covering.
+        Index(
+            "ix_hotkey_worker_active",
+            "worker",
+            "hotkey",
+            "unbind_signature",
+            sqlite_where=text("unbind_signature IS NULL"),
+            postgresql_where=text("unbind_signature IS NULL"),
+        ),
+    )
+
+
+class HotkeyWorkerCount(Base):
+    """Active (bound) workers per hotkey, kept in step with hotkey_worker."""
+
+    __tablename__ = "hotkey_worker_count"
+    hotkey: Mapped[str] = mapped_column(String, primary_key=True)
+    active: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+CHANGE_BIND = "bind"
+CHANGE_UNBIND = "unbind"
+
+
+class HotkeyWorkerChange(Base):
+    """
+    Append-only feed of registrations and unbinds (tombstones), ordered by a
+    monotonic sequence number so peers can follow it with a single offset.
+    For binds `signature` is the registration signature, for unbinds it is
+    the unbind signature.
+    """
+
+    __tablename__ = "hotkey_worker_change"
+    # AUTOINCREMENT keeps sequence numbers from being reused on SQLite
+    __table_args__ = {"sqlite_autoincrement": True}
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    worker: Mapped[str] = mapped_column(String, nullable=False)
+    hotkey: Mapped[str] = mapped_column(String, nullable=False)
+    registration_time: Mapped[float] = mapped_column(Float, nullable=False)
+    signature: Mapped[str] = mapped_column(String, nullable=False)
+
 
 class ValidatorSyncOffset(Base):
     __tablename__ = "validator_sync_offset"
     hotkey: Mapped[str] = mapped_column(String, primary_key=True)
     last_registration_time: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     last_sync_time: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    last_change_seq: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+
+
+class LeaderLease(Base):
+    """Lease deciding which process runs the background tasks (see leader.py)."""
+
+    __tablename__ = "leader_lease"
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    holder: Mapped[str] = mapped_column(String, nullable=False)
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False)
 
 
 class SqliteMappingSource(MappingSource):
-    def __init__(self, db_url: str = DATABASE_URL):
-        self.engine = create_engine(
-            db_url, connect_args={"check_same_thread": False}
-        )
+    def __init__(
+        self, db_url: str = DATABASE_URL, engine_options: dict | None = None
+    ):
+        self.engine = create_db_engine(db_url, **(engine_options or {}))
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
@@ -58,23 +180,42 @@ class SqliteMappingSource(MappingSource):
     async def load_mapping(self):
         # Load mapping from SQLite database: worker -> hotkey
         # This is a synchronous DB call, but the method is async for interface compatibility
-        result = {}
-        for row in self.session.query(HotkeyWorker).filter(HotkeyWorker.unbind_signature.is_(None)).all():
-            result[row.worker] = row.hotkey
-        return result
+        # Plain (worker, hotkey) tuples, answered from ix_hotkey_worker_active
+        # without loading ORM entities or the signature columns
+        stmt = select(HotkeyWorker.worker, HotkeyWorker.hotkey).where(
+            HotkeyWorker.unbind_signature.is_(None)
+        )
+        with self.engine.connect() as conn:
+            return {worker: hotkey for worker, hotkey in conn.execute(stmt)}
+
+
+def registration_times(registration_time: float | int) -> tuple[float, int]:
+    """Return (seconds, microseconds) for a float-seconds or int-micros time."""
+    # Store both float and int
+    if isinstance(registration_time, float):
+        return registration_time, int(registration_time * 1_000_000)
+    return float(registration_time) / 1_000_000, int(registration_time)
 
 
 class DatabaseService:
-    def __init__(self, db_url: str = DATABASE_URL, max_workers: int = 30):
-        self.engine = create_engine(
-            db_url, connect_args={"check_same_thread": False}
-        )
+    def __init__(
+        self,
+        db_url: str = DATABASE_URL,
+        max_workers: int = 30,
+        engine_options: dict | None = None,
+    ):
+        self.engine = create_db_engine(db_url, **(engine_options or {}))
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
         self.session = self.SessionLocal()
         self.max_workers = max_workers
 
+    def close(self) -> None:
+        # Returns the session's connection to the shared engine's pool
+        self.session.close()
+
+    @timed("db_add_mapping")
     async def add_mapping(
         self,
         hotkey: str,
@@ -89,20 +230,12 @@ class DatabaseService:
         if existing:
             raise ValueError("Worker already registered")
         # Restrict number of workers per hotkey
-        worker_count = (
-            self.session.query(HotkeyWorker).filter_by(hotkey=hotkey, unbind_signature=None).count()
-        )
+        worker_count = self.get_active_worker_count(hotkey)
         if worker_count >= self.max_workers:
             raise ValueError(
                 f"Maximum number of workers ({self.max_workers}) for this hotkey reached"
             )
-        # Store both float and int
-        if isinstance(registration_time, float):
-            reg_time_float = registration_time
-            reg_time_int = int(registration_time * 1_000_000)
-        else:
-            reg_time_float = float(registration_time) / 1_000_000
-            reg_time_int = int(registration_time)
+        reg_time_float, reg_time_int = registration_times(registration_time)
         new_mapping = HotkeyWorker(
             worker=worker,
             hotkey=hotkey,
@@ -111,9 +244,141 @@ class DatabaseService:
             registration_time_int=reg_time_int,
         )
         self.session.add(new_mapping)
+        self._record_change(
+            CHANGE_BIND, worker, hotkey, reg_time_float, signature
+        )
+        self._adjust_worker_count(hotkey, 1)
         self.session.commit()
         return None  # Success
 
+    @timed("db_add_mappings")
+    async def add_mappings(
+        self, registrations: list[tuple[str, str, str, float | int]]
+    ) -> list[str | None]:
+        """
+        Store (hotkey, worker, signature, registration_time) registrations in
+        one transaction with a single INSERT ... ON CONFLICT DO NOTHING.
+
+        Returns one entry per registration: None if it was stored, otherwise
+        the reason it was rejected (same messages as add_mapping).
+        """
+        results: list[str | None] = [None] * len(registrations)
+        existing = self.existing_workers(
+            [worker for _, worker, _, _ in registrations]
+        )
+        hotkeys = {hotkey for hotkey, _, _, _ in registrations}
+        counts = {
+            row.hotkey: row.active
+            for row in self.session.query(HotkeyWorkerCount).filter(
+                HotkeyWorkerCount.hotkey.in_(hotkeys)
+            )
+        }
+        rows, positions = [], []
+        for i, (hotkey, worker, signature, registration_time) in enumerate(
+            registrations
+        ):
+            if worker in existing:
+                results[i] = "Worker already registered"
+                continue
+            if counts.get(hotkey, 0) >= self.max_workers:
+                results[i] = (
+                    f"Maximum number of workers ({self.max_workers}) for this hotkey reached"
+                )
+                continue
+            existing.add(worker)
+            counts[hotkey] = counts.get(hotkey, 0) + 1
+            reg_time_float, reg_time_int = registration_times(registration_time)
+            rows.append(
+                {
+                    "worker": worker,
+                    "hotkey": hotkey,
+                    "signature": signature,
+                    "registration_time": reg_time_float,
+                    "registration_time_int": reg_time_int,
+                }
+            )
+            positions.append(i)
+        if not rows:
+            return results
+
+        stmt = insert_ignoring_conflicts(
+            self.engine, HotkeyWorker.__table__, ["worker"]
+        ).returning(HotkeyWorker.worker)
+        # A concurrent writer may have registered a worker since the check
+        inserted = set(self.session.scalars(stmt, rows))
+        added: Counter[str] = Counter()
+        for i, row in zip(positions, rows):
+            if row["worker"] not in inserted:
+                results[i] = "Worker already registered"
+                continue
+            self._record_change(
+                CHANGE_BIND,
+                row["worker"],
+                row["hotkey"],
+                row["registration_time"],
+                row["signature"],
+            )
+            added[row["hotkey"]] += 1
+        for hotkey, count in added.items():
+            self._adjust_worker_count(hotkey, count)
+        self.session.commit()
+        return results
+
+    def _record_change(
+        self,
+        kind: str,
+        worker: str,
+        hotkey: str,
+        registration_time: float,
+        signature: str,
+    ) -> None:
+        # Added to the current session so it commits with the change itself
+        self.session.add(
+            HotkeyWorkerChange(
+                kind=kind,
+                worker=worker,
+                hotkey=hotkey,
+                registration_time=registration_time,
+                signature=signature,
+            )
+        )
+
+    @timed("db_existing_workers")
+    def existing_workers(self, workers: list[str]) -> set[str]:
+        """Return which of the given workers are registered (bound or not)."""
+        return set(
+            self.session.scalars(
+                select(HotkeyWorker.worker).where(HotkeyWorker.worker.in_(workers))
+            )
+        )
+
+    def get_active_worker_count(self, hotkey: str) -> int:
+        row = self.session.get(HotkeyWorkerCount, hotkey)
+        return row.active if row else 0
+
+    def _adjust_worker_count(self, hotkey: str, delta: int) -> None:
+        row = self.session.get(HotkeyWorkerCount, hotkey)
+        if row is None:
+            self.session.add(HotkeyWorkerCount(hotkey=hotkey, active=delta))
+        else:
+            # Incremented in SQL so concurrent writers do not lose updates;
+            # callers adjust a hotkey at most once per transaction
+            row.active = HotkeyWorkerCount.active + delta
+
+    @timed("db_rebuild_worker_counts")
+    def rebuild_worker_counts(self) -> None:
+        """Recompute hotkey_worker_count from hotkey_worker, e.g. at startup."""
+        with self.engine.begin() as conn:
+            conn.execute(delete(HotkeyWorkerCount))
+            conn.execute(
+                insert(HotkeyWorkerCount).from_select(
+                    ["hotkey", "active"],
+                    select(HotkeyWorker.hotkey, func.count())
+                    .where(HotkeyWorker.unbind_signature.is_(None))
+                    .group_by(HotkeyWorker.hotkey),
+                )
+            )
+
     async def get_hotkey_workers_by_time(
         self,
         since_timestamp: float = 0.0,
@@ -142,6 +407,101 @@ class DatabaseService:
             for row in results
         ]
 
+    def iter_hotkey_workers_by_time(
+        self, since_timestamp: float = 0.0, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """
+        Yield all registrations newer than since_timestamp in registration
+        order, reading them through a server-side cursor in constant memory.
+        """
+        since_ts_int = int(since_timestamp * 1_000_000)
+        stmt = (
+            select(
+                HotkeyWorker.worker,
+                HotkeyWorker.hotkey,
+                HotkeyWorker.registration_time,
+                HotkeyWorker.registration_time_int,
+                HotkeyWorker.signature,
+            )
+            .where(HotkeyWorker.registration_time_int > since_ts_int)
+            .order_by(HotkeyWorker.registration_time_int)
+        )
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(stmt)
+            for row in result:
+                yield row._asdict()
+
+    def iter_active_mappings(
+        self, hotkey: str | None = None, batch_size: int = 1000
+    ) -> Iterator[dict]:
+        """
+        Yield bound worker -> hotkey rows through a server-side cursor,
+        optionally only those of one hotkey.
+        """
+        stmt = (
+            select(HotkeyWorker.worker, HotkeyWorker.hotkey)
+            .where(HotkeyWorker.unbind_signature.is_(None))
+            .order_by(HotkeyWorker.worker)
+        )
+        if hotkey is not None:
+            stmt = stmt.where(HotkeyWorker.hotkey == hotkey)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(stmt)
+            for row in result:
+                yield row._asdict()
+
+    def iter_merkle_rows(self, batch_size: int = 1000) -> Iterator[MerkleRow]:
+        """
+        Yield the (worker, hotkey, signature) leaves of every registration,
+        with UNBOUND_MARKER appended for unbound workers.
+        """
+        stmt = select(
+            HotkeyWorker.worker,
+            HotkeyWorker.hotkey,
+            HotkeyWorker.signature,
+            HotkeyWorker.unbind_signature,
+        )
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(stmt)
+            for worker, hotkey, signature, unbind_signature in result:
+                if unbind_signature is None:
+                    yield worker, hotkey, signature
+                else:
+                    yield worker, hotkey, signature, UNBOUND_MARKER
+
+    @timed("db_build_merkle_tree")
+    def build_merkle_tree(self) -> MerkleTree:
+        return MerkleTree(self.iter_merkle_rows())
+
+    def iter_hotkey_workers_by_worker(
+        self, workers: Iterable[str], batch_size: int = 500
+    ) -> Iterator[dict]:
+        """Yield the registration rows of the given workers, in chunks."""
+        workers = list(workers)
+        with self.engine.connect() as conn:
+            for i in range(0, len(workers), batch_size):
+                stmt = (
+                    select(
+                        HotkeyWorker.worker,
+                        HotkeyWorker.hotkey,
+                        HotkeyWorker.registration_time,
+                        HotkeyWorker.registration_time_int,
+                        HotkeyWorker.signature,
+                        HotkeyWorker.unbind_signature,
+                    )
+                    .where(HotkeyWorker.worker.in_(workers[i : i + batch_size]))
+                    .order_by(HotkeyWorker.worker)
+                )
+                for row in conn.execute(stmt):
+                    yield row._asdict()
+
+    @timed("db_mark_worker_unbound")
     async def mark_worker_unbound(
         self,
         hotkey: str,
@@ -155,9 +515,76 @@ class DatabaseService:
         if obj.unbind_signature:
             raise ValueError("Worker already unbound")
         obj.unbind_signature = unbind_signature
+        self._record_change(
+            CHANGE_UNBIND, worker, hotkey, obj.registration_time, unbind_signature
+        )
+        self._adjust_worker_count(hotkey, -1)
         self.session.commit()
         return None
 
+    @timed("db_mark_workers_unbound")
+    async def mark_workers_unbound(
+        self, unbinds: list[tuple[str, str, str]]
+    ) -> int:
+        """
+        Apply (hotkey, worker, unbind_signature) tombstones in one transaction.
+        Unknown, foreign or already unbound workers are ignored; returns the
+        number of workers unbound.
+        """
+        rows = {
+            row.worker: row
+            for row in self.session.query(HotkeyWorker).filter(
+                HotkeyWorker.worker.in_([worker for _, worker, _ in unbinds]),
+                HotkeyWorker.unbind_signature.is_(None),
+            )
+        }
+        unbound: Counter[str] = Counter()
+        for hotkey, worker, unbind_signature in unbinds:
+            row = rows.get(worker)
+            if row is None or row.hotkey != hotkey or row.unbind_signature:
+                continue
+            row.unbind_signature = unbind_signature
+            self._record_change(
+                CHANGE_UNBIND,
+                worker,
+                hotkey,
+                row.registration_time,
+                unbind_signature,
+            )
+            unbound[hotkey] += 1
+        for hotkey, count in unbound.items():
+            self._adjust_worker_count(hotkey, -count)
+        self.session.commit()
+        return sum(unbound.values())
+
+    def iter_changes(
+        self,
+        since_seq: int = 0,
+        limit: int | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        """Yield change feed entries after since_seq in sequence order."""
+        stmt = (
+            select(
+                HotkeyWorkerChange.seq,
+                HotkeyWorkerChange.kind,
+                HotkeyWorkerChange.worker,
+                HotkeyWorkerChange.hotkey,
+                HotkeyWorkerChange.registration_time,
+                HotkeyWorkerChange.signature,
+            )
+            .where(HotkeyWorkerChange.seq > since_seq)
+            .order_by(HotkeyWorkerChange.seq)
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(stmt)
+            for row in result:
+                yield row._asdict()
+
     async def get_validator_sync_offset(self, hotkey: str) -> float:
         """Get the last registration time synced for a validator hotkey"""
         row = self.session.query(ValidatorSyncOffset).filter_by(hotkey=hotkey).first()
@@ -180,6 +607,29 @@ class DatabaseService:
             self.session.add(row)
         self.session.commit()
 
+    async def get_validator_change_seq(self, hotkey: str) -> int:
+        """Get the last change feed sequence number synced from a validator"""
+        row = self.session.query(ValidatorSyncOffset).filter_by(hotkey=hotkey).first()
+        if row:
+            return row.last_change_seq
+        return 0
+
+    async def update_validator_change_seq(self, hotkey: str, seq: int) -> None:
+        """Update the last change feed sequence number synced from a validator"""
+        row = self.session.query(ValidatorSyncOffset).filter_by(hotkey=hotkey).first()
+        if row:
+            row.last_change_seq = seq
+            row.last_sync_time = time.time()
+        else:
+            row = ValidatorSyncOffset(
+                hotkey=hotkey,
+                last_registration_time=0.0,
+                last_sync_time=time.time(),
+                last_change_seq=seq,
+            )
+            self.session.add(row)
+        self.session.commit()
+
     async def get_all_validator_sync_offsets(self, page_size: int = 100, page_number: int = 1) -> list[dict]:
         """Return all records from validator_sync_offset table as list of dicts, paginated."""
         query = self.session.query(ValidatorSyncOffset).order_by(ValidatorSyncOffset.hotkey)
@@ -189,6 +639,7 @@ class DatabaseService:
                 "hotkey": row.hotkey,
                 "last_registration_time": row.last_registration_time,
                 "last_sync_time": row.last_sync_time,
+                "last_change_seq": row.last_change_seq,
             }
             for row in results
         ]
@@ -201,29 +652,73 @@ class DynamicConfig(Base):
 
 
 class DynamicConfigService:
-    def __init__(self, db_url: str = DATABASE_URL):
-        self.engine = create_engine(
-            db_url, connect_args={"check_same_thread": False}
-        )
+    """
+    Key/value settings stored in dynamic_config, served from memory.
+
+    All keys are loaded on first use and writes go through to the database
+    and the in-memory map. On SQLite, edits made by other processes (e.g.
+    scripts) are noticed via `PRAGMA data_version` on a dedicated
+    connection, which changes whenever another connection commits; reads
+    are otherwise free. Other databases reload the map on every read.
+    """
+
+    def __init__(
+        self, db_url: str = DATABASE_URL, engine_options: dict | None = None
+    ):
+        self.engine = create_db_engine(db_url, **(engine_options or {}))
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
         self.session = self.SessionLocal()
+        self._lock = threading.Lock()
+        self._values: dict[str, str] | None = None
+        self._data_version: int | None = None
+        self._version_conn = None
+
+    def _read_data_version(self) -> int | None:
+        if self.engine.dialect.name != "sqlite":
+            return None
+        if self._version_conn is None:
+            # data_version is per connection, so the same one must be reused
+            self._version_conn = self.engine.connect()
+        version = self._version_conn.exec_driver_sql(
+            "PRAGMA data_version"
+        ).scalar()
+        self._version_conn.rollback()
+        return version
+
+    def _load(self) -> dict[str, str]:
+        with self._lock:
+            version = self._read_data_version()
+            if (
+                self._values is None
+                or version is None
+                or version != self._data_version
+            ):
+                with self.engine.connect() as conn:
+                    self._values = {
+                        key: value
+                        for key, value in conn.execute(
+                            select(DynamicConfig.key, DynamicConfig.value)
+                        )
+                    }
+                self._data_version = version
+            return self._values
 
     def _get(self, key: str, default=None):
-        row = self.session.query(DynamicConfig).filter_by(key=key).first()
-        if row:
-            return row.value
-        return default
+        return self._load().get(key, default)
 
     def _set(self, key: str, value: str):
-        row = self.session.query(DynamicConfig).filter_by(key=key).first()
-        if row:
-            row.value = value
-        else:
-            row = DynamicConfig(key=key, value=value)
-            self.session.add(row)
-        self.session.commit()
+        with self._lock:
+            row = self.session.query(DynamicConfig).filter_by(key=key).first()
+            if row:
+                row.value = value
+            else:
+                row = DynamicConfig(key=key, value=value)
+                self.session.add(row)
+            self.session.commit()
+            if self._values is not None:
+                self._values[key] = value
 
     def get_last_set_weights_time(self) -> float:
         value = self._get("last_set_weights_time")
@@ -234,3 +729,34 @@ class DynamicConfigService:
 
     def set_last_set_weights_time(self, timestamp: float):
         self._set("last_set_weights_time", str(timestamp))
+
+    def get_last_weights_check_time(self) -> float:
+        value = self._get("last_weights_check_time")
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def set_last_weights_check_time(self, timestamp: float):
+        self._set("last_weights_check_time", str(timestamp))
+
+    def get_last_weights(self) -> tuple[dict[int, int], str] | None:
+        """Last submitted uid -> u16 weights and their metagraph version."""
+        value = self._get("last_weights")
+        try:
+            data = json.loads(value)
+            weights = {int(uid): int(w) for uid, w in data["weights"].items()}
+            return weights, str(data["metagraph_version"])
+        except (TypeError, ValueError, KeyError, AttributeError):
+            return None
+
+    def set_last_weights(
+        self, weights: dict[int, int], metagraph_version: str
+    ):
+        self._set(
+            "last_weights",
+            json.dumps(
+                {"metagraph_version": metagraph_version, "weights": weights},
+                separators=(",", ":"),
+            ),
+        )
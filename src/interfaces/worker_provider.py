@@ -1,26 +1,87 @@
+import asyncio
 import time
 import aiohttp
-from typing import Set
+from typing import FrozenSet, Set
+from fiber.utils import get_logger
+from ..instrumentation import cache_lookup, timed
 from ..metrics import MetricsClient, MinerKey
 
 
+logger = get_logger(__name__)
+
+
 class WorkerProvider:
-    def __init__(self, metrics_client: MetricsClient, cache_ttl: int = 15):
+    """
+    Worker presence index backed by Prometheus uptime data.
+
+    The index is refreshed by `run_refresh_loop` in the background every
+    `cache_ttl` seconds and swapped atomically, so lookups only read the
+    current set. A lookup falls back to a synchronous refresh only when the
+    index is older than `max_staleness` (e.g. the refresher is not running
+    or Prometheus has been failing); concurrent fallbacks share one refresh.
+    """
+
+    def __init__(
+        self,
+        metrics_client: MetricsClient,
+        cache_ttl: int = 15,
+        max_staleness: float = 120,
+    ):
         self.metrics_client = metrics_client
         self.cache_ttl = cache_ttl
-        self._cache = (set(), 0.0)  # (workers, last_update_time)
+        self.max_staleness = max_staleness
+        self._cache: tuple[FrozenSet[MinerKey], float] = (
+            frozenset(),
+            0.0,
+        )  # (workers, last_update_time)
+        self._refresh_lock: asyncio.Lock | None = None
 
-    async def fetch_pool_workers(self) -> Set[MinerKey]:
-        now = time.time()
-        workers, last_update = self._cache
-        if now - last_update < self.cache_ttl:
-            return workers
+    @property
+    def staleness(self) -> float:
+        """Seconds since the index was last refreshed successfully."""
+        return time.time() - self._cache[1]
+
+    @timed("worker_index_refresh")
+    async def refresh(self) -> FrozenSet[MinerKey]:
+        """Query Prometheus and atomically replace the presence index."""
         async with aiohttp.ClientSession() as session:
             uptimes = await self.metrics_client._get_uptime(session)
-        workers = {key for key, uptime in uptimes.items() if uptime > 0}
-        self._cache = (workers, now)
+        workers = frozenset(
+            key for key, uptime in uptimes.items() if uptime > 0
+        )
+        self._cache = (workers, time.time())
         return workers
 
+    async def _refresh_once(self) -> FrozenSet[MinerKey]:
+        # The lock is created lazily so it binds to the running event loop
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        last_update = self._cache[1]
+        async with self._refresh_lock:
+            # Another caller refreshed the index while we were waiting
+            if self._cache[1] != last_update:
+                return self._cache[0]
+            return await self.refresh()
+
+    async def run_refresh_loop(self) -> None:
+        """Keep the presence index fresh; meant to run as a background task."""
+        while True:
+            try:
+                await self._refresh_once()
+            except Exception as e:
+                logger.warning(
+                    f"Worker index refresh failed (stale for {self.staleness:.0f}s): {e}"
+                )
+            await asyncio.sleep(self.cache_ttl)
+
+    async def fetch_pool_workers(self) -> Set[MinerKey]:
+        workers, last_update = self._cache
+        if time.time() - last_update <= self.max_staleness:
+            cache_lookup("worker_index", "hit")
+            return workers
+        cache_lookup("worker_index", "miss")
+        return await self._refresh_once()
+
     async def is_worker_exists(self, wallet: str, worker: str) -> bool:
         workers = await self.fetch_pool_workers()
         return MinerKey(wallet=wallet, worker=worker) in workers
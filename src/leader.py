@@ -0,0 +1,138 @@
+# leader.py
+# Elects the single process that runs the background tasks when the API is
+# served by several uvicorn workers (or hosts)
+
+import os
+import socket
+import time
+import uuid
+
+from fiber.utils import get_logger
+from sqlalchemy import select, update
+
+from .interfaces.database import (
+    LeaderLease,
+    create_db_engine,
+    insert_ignoring_conflicts,
+)
+
+logger = get_logger(__name__)
+
+
+class LeaderElection:
+    """Every process is the leader: the single-process default."""
+
+    # Seconds between try_acquire calls while leading or waiting to lead
+    renew_interval: float = 10.0
+
+    def try_acquire(self) -> bool:
+        """Become or stay the leader; returns whether this process leads."""
+        return True
+
+    def is_leader(self) -> bool:
+        """Whether this process still leads, without renewing anything."""
+        return True
+
+    def release(self) -> None:
+        pass
+
+
+class FileLockLeaderElection(LeaderElection):
+    """
+    Leader is whoever holds an exclusive flock on `path`. The kernel drops
+    the lock when the holder exits or crashes, so a waiting process takes
+    over on its next attempt. Only covers processes on one host.
+    """
+
+    renew_interval = 5.0
+
+    def __init__(self, path: str = "data/leader.lock"):
+        self.path = path
+        self._fd: int | None = None
+
+    def try_acquire(self) -> bool:
+        import fcntl
+
+        if self._fd is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self._fd = fd
+        return True
+
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class DatabaseLeaseLeaderElection(LeaderElection):
+    """
+    Leader is the holder of an unexpired row in leader_lease. The leader
+    renews it every ttl/3; if it stops renewing, any process may take the
+    lease over once it has expired. Works across hosts sharing a database.
+    """
+
+    def __init__(self, db_url: str, ttl: float = 30.0, name: str = "tasks"):
+        self.engine = create_db_engine(db_url)
+        self.ttl = ttl
+        self.name = name
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.renew_interval = ttl / 3
+
+    def try_acquire(self) -> bool:
+        now = time.time()
+        table = LeaderLease.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                insert_ignoring_conflicts(self.engine, table, ["name"]).values(
+                    name=self.name, holder=self.holder, expires_at=now + self.ttl
+                )
+            )
+            # Renew our own lease or take over an expired one
+            conn.execute(
+                update(table)
+                .where(
+                    table.c.name == self.name,
+                    (table.c.holder == self.holder)
+                    | (table.c.expires_at < now),
+                )
+                .values(holder=self.holder, expires_at=now + self.ttl)
+            )
+            holder = conn.execute(
+                select(table.c.holder).where(table.c.name == self.name)
+            ).scalar()
+        return holder == self.holder
+
+    def is_leader(self) -> bool:
+        table = LeaderLease.__table__
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(table.c.holder, table.c.expires_at).where(
+                    table.c.name == self.name
+                )
+            ).first()
+        return (
+            row is not None
+            and row.holder == self.holder
+            and row.expires_at >= time.time()
+        )
+
+    def release(self) -> None:
+        table = LeaderLease.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(table)
+                .where(table.c.name == self.name, table.c.holder == self.holder)
+                .values(expires_at=0.0)
+            )
@@ -0,0 +1,96 @@
+# loop_monitor.py
+# Detects event loop stalls caused by blocking calls in async code
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from fiber.utils import get_logger
+
+from .instrumentation import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = get_logger(__name__)
+
+
+class LoopMonitor:
+    """
+    Measures event loop scheduling delay and reports what blocks it.
+
+    A heartbeat task sleeps `interval` seconds and records how late it woke
+    up (exported as hashtensor_validator_event_loop_lag_seconds). A watchdog
+    thread checks the heartbeat; when it has not run for `threshold`
+    seconds, the loop thread is still busy with the blocking call, so its
+    stack is captured and logged right then.
+    """
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.25):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = 0
+        self.last_stall_stack: str | None = None
+        self._last_beat = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start monitoring the running loop; call from within it."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(0.0, now - expected))
+            self._last_beat = now
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked > self.threshold and beat != reported_beat:
+                # Report each stall once, while it is still happening
+                reported_beat = beat
+                self._report_stall(blocked)
+
+    def _report_stall(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        self.stalls += 1
+        EVENT_LOOP_STALLS.inc()
+        stack = "".join(traceback.format_stack(frame, limit=30))
+        self.last_stall_stack = stack
+        try:
+            # Reads the loop's current-task slot; fine from another thread
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        task_name = task.get_name() if task is not None else "-"
+        logger.warning(
+            f"Event loop blocked for {blocked * 1000:.0f}ms+ "
+            f"(task {task_name}); loop thread stack:\n{stack}"
+        )
@@ -3,37 +3,68 @@
 
 from datetime import timedelta
 import os
-from fastapi import Depends, FastAPI, HTTPException, Header
-from typing import Annotated, List
+from fastapi import Depends, FastAPI, HTTPException, Header, Query
+from typing import Annotated, Iterable, List
+import hmac
 import json
 import time
 from contextlib import asynccontextmanager
 import asyncio
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from fiber import SubstrateInterface
 
 from .mapping import MappingManager
+from .metrics import MinerKey
 
 from .tasks import set_weights_task, sync_hotkey_workers_task
 
-from .utils import is_hotkey_registered, verify_signature
+from .utils import (
+    is_hotkey_registered,
+    registered_hotkeys,
+    verify_signature,
+    verify_signatures,
+)
 
 from .interfaces.worker_provider import WorkerProvider
 
 from .validator import Validator
 
-from .models import HotkeyWorkerRegistration, MetricsResponse, UnbindWorkerRequest
+from .models import (
+    BatchRegistrationResponse,
+    BatchUnbindResponse,
+    HotkeyWorkerBatchRegistration,
+    HotkeyWorkerRegistration,
+    MetricsResponse,
+    MetricsSummaryResponse,
+    ProjectedMetricsResponse,
+    RatingExplanation,
+    RatingParameters,
+    RatingsExplanationResponse,
+    RegistrationResult,
+    UnbindResult,
+    UnbindWorkerBatchRequest,
+    UnbindWorkerRequest,
+)
 
 from .config import ValidatorSettings, load_config
+from .constants import NDJSON_MEDIA_TYPE
+from .instrumentation import render_metrics
+from .loop_monitor import LoopMonitor
+from . import profiling
+from .merkle import MERKLE_MAX_PREFIXES, MerkleTree, MerkleTreeCache
 from fiber.chain import chain_utils
 from fiber.utils import get_logger
 
 from .dependencies import (
+    create_database_service,
     get_database_service,
     get_dynamic_config_service,
+    get_leader_election,
     get_mapping_manager,
     get_mapping_source,
+    get_merkle_tree_cache,
     get_metrics_client,
     get_substrate,
     get_validator,
@@ -63,6 +94,7 @@ async def lifespan(app: FastAPI):
     config = load_config()
     dynamic_config_service = get_dynamic_config_service(config)
     metrics_client = get_metrics_client(config)
+    metrics_client.warm_start()
     mapping_source = get_mapping_source(config)
     mapping_manager = get_mapping_manager(mapping_source, config)
     validator = get_validator(
@@ -74,7 +106,9 @@ async def lifespan(app: FastAPI):
     keypair = chain_utils.load_hotkey_keypair(
         wallet_name=config.wallet_name, hotkey_name=config.wallet_hotkey
     )
-    db_service = get_database_service(config)
+    db_service = create_database_service(config)
+    worker_provider = get_worker_provider(metrics_client, config)
+    leader_election = get_leader_election(config)
 
     async def weights_loop():
         while True:
@@ -88,6 +122,7 @@ async def lifespan(app: FastAPI):
                             validator,
                             substrate,
                             keypair,
+                            leader_election.is_leader,
                         )
                     )
                 )
@@ -109,21 +144,93 @@ async def lifespan(app: FastAPI):
                 config.sync_hotkey_workers_interval.total_seconds()
             )
 
-    # Create tasks conditionally based on feature flags
-    tasks = []
-    
-    if not config.disable_set_weights:
-        task1 = asyncio.create_task(weights_loop())
-        tasks.append(task1)
-        logger.info("Set weights task started")
-    else:
-        logger.info("Set weights task disabled by DISABLE_SET_WEIGHTS flag")
-    
-    task2 = asyncio.create_task(sync_hotkey_workers_loop())
-    tasks.append(task2)
-    
+    async def publish_metrics_loop():
+        # Publishes a snapshot about every cache_ttl for the followers, even
+        # when this process serves no requests that need metrics
+        while True:
+            started = time.monotonic()
+            try:
+                await metrics_client.get_cached_metrics(
+                    config.cache_ttl.total_seconds()
+                )
+            except Exception as e:
+                logger.warning(f"Failed to refresh metrics: {e}")
+            await asyncio.sleep(
+                max(
+                    0.0,
+                    config.cache_ttl.total_seconds()
+                    - (time.monotonic() - started),
+                )
+            )
+
+    async def start_leader_tasks() -> list[asyncio.Task]:
+        # Counters may have drifted if the table was edited outside the service
+        await asyncio.to_thread(db_service.rebuild_worker_counts)
+        metrics_client.follow_snapshots = False
+        metrics_client.publish_snapshots = config.leader_election != "none"
+        # Create tasks conditionally based on feature flags
+        leader_tasks = []
+
+        if not config.disable_set_weights:
+            leader_tasks.append(asyncio.create_task(weights_loop()))
+            logger.info("Set weights task started")
+        else:
+            logger.info("Set weights task disabled by DISABLE_SET_WEIGHTS flag")
+
+        leader_tasks.append(asyncio.create_task(sync_hotkey_workers_loop()))
+        if config.leader_election != "none":
+            leader_tasks.append(asyncio.create_task(publish_metrics_loop()))
+        return leader_tasks
+
+    async def leadership_loop():
+        leader_tasks: list[asyncio.Task] = []
+        while True:
+            try:
+                is_leader = await asyncio.to_thread(leader_election.try_acquire)
+            except Exception as e:
+                logger.warning(f"Leader election failed: {e}")
+                is_leader = False
+            if is_leader and not leader_tasks:
+                try:
+                    leader_tasks = await start_leader_tasks()
+                    logger.info(f"Process {os.getpid()} became the leader")
+                except Exception as e:
+                    # Retried on the next tick while the lease is still held
+                    logger.warning(f"Failed to start leader tasks: {e}")
+            elif not is_leader and leader_tasks:
+                logger.warning(f"Process {os.getpid()} lost leadership")
+                for task in leader_tasks:
+                    task.cancel()
+                leader_tasks = []
+            if not is_leader:
+                # Serve metrics published by the leader instead of querying
+                # Prometheus from every worker
+                metrics_client.follow_snapshots = True
+                metrics_client.publish_snapshots = False
+            await asyncio.sleep(leader_election.renew_interval)
+
+    loop_monitor = None
+    if config.loop_monitor:
+        loop_monitor = LoopMonitor(
+            config.loop_monitor_interval.total_seconds(),
+            config.loop_stall_threshold.total_seconds(),
+        )
+        loop_monitor.start()
+
+    tasks = [
+        asyncio.create_task(leadership_loop()),
+        # Every process serves /register, which needs the worker list
+        asyncio.create_task(worker_provider.run_refresh_loop()),
+    ]
+
     yield
 
+    for task in tasks:
+        task.cancel()
+    if loop_monitor is not None:
+        loop_monitor.stop()
+    await asyncio.to_thread(leader_election.release)
+
 
 app = FastAPI(
     prefix="/api",
@@ -144,11 +251,107 @@ app.add_middleware(
 )
 
 
+def wants_ndjson(accept: str | None) -> bool:
+    return accept is not None and NDJSON_MEDIA_TYPE in accept
+
+
+def ndjson_response(rows: Iterable[dict]) -> StreamingResponse:
+    """Stream rows as newline-delimited JSON without buffering the payload."""
+    return StreamingResponse(
+        (json.dumps(row, separators=(",", ":")) + "\n" for row in rows),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @app.get("/health")
 def health_check():
     return {"status": "OK"}
 
 
+@app.get("/internal/metrics", include_in_schema=False)
+def internal_metrics():
+    """Operational metrics of this validator in Prometheus text format."""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
+def require_profiling(
+    config: Annotated[ValidatorSettings, Depends(load_config)],
+    x_admin_token: Annotated[str | None, Header(alias="X-Admin-Token")] = None,
+) -> ValidatorSettings:
+    if not config.profiling_enabled or not config.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token, config.admin_token
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    return config
+
+
+def check_profile_duration(config: ValidatorSettings, duration: float) -> None:
+    max_duration = config.profiling_max_duration.total_seconds()
+    if not 0 < duration <= max_duration:
+        raise HTTPException(
+            status_code=400,
+            detail=f"duration must be in (0, {max_duration:g}] seconds",
+        )
+
+
+@app.get("/internal/profile", include_in_schema=False)
+async def profile_process(
+    config: Annotated[ValidatorSettings, Depends(require_profiling)],
+    duration: float = 10.0,
+    mode: Annotated[str, Query(pattern="^(sample|cprofile)$")] = "sample",
+    interval: Annotated[float, Query(ge=0.001, le=1.0)] = 0.005,
+):
+    """
+    Profile the running process for `duration` seconds.
+
+    - sample: stacks of all threads (event loop and to_thread workers)
+      sampled every `interval` seconds, as collapsed-stack text
+    - cprofile: deterministic profile of the event loop thread, as a
+      pstats file (python -m pstats / snakeviz)
+    """
+    check_profile_duration(config, duration)
+    try:
+        if mode == "cprofile":
+            stats = await profiling.profile_event_loop(duration)
+            return Response(
+                content=stats,
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Disposition": 'attachment; filename="validator.pstats"'
+                },
+            )
+        stacks = await asyncio.to_thread(
+            profiling.sample_stacks, duration, interval
+        )
+    except profiling.ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(
+        content=profiling.format_collapsed(stacks), media_type="text/plain"
+    )
+
+
+@app.get("/internal/profile/memory", include_in_schema=False)
+async def profile_memory(
+    config: Annotated[ValidatorSettings, Depends(require_profiling)],
+    duration: float = 10.0,
+    limit: Annotated[int, Query(ge=1, le=500)] = 25,
+    key_type: Annotated[
+        str, Query(pattern="^(lineno|filename|traceback)$")
+    ] = "lineno",
+):
+    """tracemalloc top allocations (see profiling.top_allocations)."""
+    check_profile_duration(config, duration)
+    try:
+        return await asyncio.to_thread(
+            profiling.top_allocations, duration, limit, key_type
+        )
+    except profiling.ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
 @app.post("/register")
 async def register_hotkey_worker(
     reg: HotkeyWorkerRegistration,
@@ -209,11 +412,139 @@ async def register_hotkey_worker(
     return dict(message="Registration successful")
 
 
-@app.get("/metrics")
+@app.post("/register/batch")
+async def register_hotkey_workers_batch(
+    batch: HotkeyWorkerBatchRegistration,
+    db_service: Annotated[DatabaseService, Depends(get_database_service)],
+    worker_provider: Annotated[WorkerProvider, Depends(get_worker_provider)],
+    config: Annotated[ValidatorSettings, Depends(load_config)],
+    substrate: Annotated[SubstrateInterface, Depends(get_substrate)],
+) -> BatchRegistrationResponse:
+    """
+    Register many workers at once. Each item is checked like a /register
+    request and carries its own signature; the response holds one result
+    per item in request order.
+    """
+    registrations = batch.registrations
+    if not registrations:
+        raise HTTPException(status_code=400, detail="No registrations given")
+    if len(registrations) > config.register_batch_max_size:
+        # 413 tells clients to retry in smaller batches
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {config.register_batch_max_size} registrations per batch",
+        )
+    errors: list[str | None] = [None] * len(registrations)
+    now = time.time()
+    tolerance = config.registration_time_tolerance.total_seconds()
+    # One presence snapshot and one metagraph lookup for the whole batch
+    online_workers = await worker_provider.fetch_pool_workers()
+    chain_hotkeys = await asyncio.to_thread(
+        registered_hotkeys, substrate, config.netuid
+    )
+    pending = []
+    for i, reg in enumerate(registrations):
+        if abs(now - reg.registration_time) > tolerance:
+            errors[i] = "Registration time is too far from current UTC time."
+        elif reg.hotkey not in reg.worker:
+            errors[i] = "Worker name must contain the hotkey for security validation."
+        elif (
+            MinerKey(wallet=config.kaspa_pool_owner_wallet, worker=reg.worker)
+            not in online_workers
+        ):
+            errors[i] = "Worker not found. Make sure you are using the correct wallet address"
+        elif reg.hotkey not in chain_hotkeys:
+            errors[i] = "Hotkey not registered. To register in subnet use btcli command: `btcli subnet register`"
+        else:
+            pending.append(i)
+    if config.verify_signature:
+        verified = await verify_signatures(
+            [
+                (
+                    registrations[i].hotkey,
+                    registrations[i].signed_json(),
+                    registrations[i].signature,
+                )
+                for i in pending
+            ]
+        )
+        for i, ok in zip(pending, verified):
+            if not ok:
+                errors[i] = "Invalid signature"
+        pending = [i for i in pending if errors[i] is None]
+    if pending:
+        # Everything that passed is stored in a single transaction
+        stored = await db_service.add_mappings(
+            [
+                (
+                    registrations[i].hotkey,
+                    registrations[i].worker,
+                    registrations[i].signature,
+                    registrations[i].registration_time,
+                )
+                for i in pending
+            ]
+        )
+        for i, error in zip(pending, stored):
+            errors[i] = error
+    results = [
+        RegistrationResult(
+            worker=reg.worker, registered=error is None, detail=error
+        )
+        for reg, error in zip(registrations, errors)
+    ]
+    registered = sum(result.registered for result in results)
+    return BatchRegistrationResponse(
+        registered=registered,
+        failed=len(results) - registered,
+        results=results,
+    )
+
+
+@app.get(
+    "/metrics",
+    # Filtered queries are serialized straight from the index, so the models
+    # only document the response
+    response_model=None,
+    responses={
+        200: {
+            "model": List[MetricsResponse]
+            | List[ProjectedMetricsResponse]
+            | List[MetricsSummaryResponse],
+            "description": "MetricsResponse entries without a query, "
+            "ProjectedMetricsResponse when filtered by hotkey, worker or "
+            "fields, and MetricsSummaryResponse with summary=true",
+        }
+    },
+)
 async def get_metrics(
-    validator: Annotated[Validator, Depends(get_validator)]
-) -> List[MetricsResponse]:
-    hotkey_metrics = await validator.get_hotkey_metrics_map()
+    validator: Annotated[Validator, Depends(get_validator)],
+    config: Annotated[ValidatorSettings, Depends(load_config)],
+    hotkey: Annotated[List[str] | None, Query()] = None,
+    worker: Annotated[List[str] | None, Query()] = None,
+    fields: Annotated[List[str] | None, Query()] = None,
+    summary: bool = False,
+    sort: str | None = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+) -> List[MetricsResponse] | JSONResponse:
+    max_age = config.cache_ttl.total_seconds()
+    if hotkey or worker or fields or summary or sort or limit:
+        # Filtered queries are answered from the index over the cached
+        # metrics; fields may be repeated or comma-separated
+        index = await validator.get_metrics_index(max_age)
+        try:
+            rows = index.query(
+                hotkeys=hotkey,
+                workers=worker,
+                fields=[f for value in fields or [] for f in value.split(",") if f],
+                summary=summary,
+                sort=sort,
+                limit=limit,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return JSONResponse(rows)
+    hotkey_metrics = await validator.get_hotkey_metrics_map(max_age=max_age)
     return [
         MetricsResponse(
             hotkey=hotkey,
@@ -227,9 +558,36 @@ async def get_metrics(
 
 @app.get("/mappings")
 async def get_mappings(
-    mapping_manager: Annotated[MappingManager, Depends(get_mapping_manager)]
+    mapping_manager: Annotated[MappingManager, Depends(get_mapping_manager)],
+    db_service: Annotated[DatabaseService, Depends(get_database_service)],
+    response: Response,
+    hotkey: str | None = None,
+    worker_prefix: str = "",
+    cursor: str | None = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    accept: Annotated[str | None, Header()] = None,
 ):
-    return await mapping_manager.get_mapping()
+    # Accept: application/x-ndjson streams {"worker", "hotkey"} rows from the DB
+    paginated = worker_prefix or cursor is not None or limit is not None
+    if wants_ndjson(accept) and not paginated:
+        return ndjson_response(db_service.iter_active_mappings(hotkey))
+    if hotkey is None and not paginated:
+        return await mapping_manager.get_mapping()
+    # Filtered queries are answered from the in-memory index, in worker
+    # order; X-Next-Cursor is the cursor of the next page, if any
+    mapping, next_cursor = await mapping_manager.query(
+        hotkey, worker_prefix, cursor, limit
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if wants_ndjson(accept):
+        rows = (
+            {"worker": worker, "hotkey": hk} for worker, hk in mapping.items()
+        )
+        stream = ndjson_response(rows)
+        stream.headers.update(headers)
+        return stream
+    response.headers.update(headers)
+    return mapping
 
 
 @app.get("/hotkey_workers")
@@ -238,7 +596,14 @@ async def get_hotkey_workers(
     since_timestamp: float = 0.0,
     page_size: int = 100,
     page_number: int = 1,
+    accept: Annotated[str | None, Header()] = None,
 ):
+    # Accept: application/x-ndjson streams every row since since_timestamp in
+    # registration order; pagination is not needed and is ignored
+    if wants_ndjson(accept):
+        return ndjson_response(
+            db_service.iter_hotkey_workers_by_time(since_timestamp)
+        )
     return await db_service.get_hotkey_workers_by_time(
         since_timestamp=since_timestamp,
         page_size=page_size,
@@ -246,6 +611,104 @@ async def get_hotkey_workers(
     )
 
 
+@app.get("/changes")
+async def get_changes(
+    db_service: Annotated[DatabaseService, Depends(get_database_service)],
+    since_seq: int = 0,
+    limit: int = 1000,
+    accept: Annotated[str | None, Header()] = None,
+):
+    # Registrations ("bind") and unbinds ("unbind") in sequence order. Peers
+    # keep the last seq they ingested; NDJSON streams everything after it.
+    if wants_ndjson(accept):
+        return ndjson_response(db_service.iter_changes(since_seq))
+    return await asyncio.to_thread(
+        list, db_service.iter_changes(since_seq, limit)
+    )
+
+
+async def get_merkle_tree(
+    db_service: DatabaseService, merkle_cache: MerkleTreeCache, prefixes: List[str]
+) -> MerkleTree:
+    if len(prefixes) > MERKLE_MAX_PREFIXES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MERKLE_MAX_PREFIXES} prefixes per request",
+        )
+    tree = await asyncio.to_thread(merkle_cache.get, db_service.build_merkle_tree)
+    for prefix in prefixes:
+        if len(prefix) > tree.depth or prefix.strip("0123456789abcdef"):
+            raise HTTPException(
+                status_code=400, detail=f"Invalid prefix: {prefix!r}"
+            )
+    return tree
+
+
+@app.get("/hotkey_workers/merkle")
+async def get_hotkey_workers_merkle(
+    db_service: Annotated[DatabaseService, Depends(get_database_service)],
+    merkle_cache: Annotated[MerkleTreeCache, Depends(get_merkle_tree_cache)],
+    prefix: Annotated[List[str], Query()] = [""],
+):
+    # Hash tree over all registrations, bucketed by sha256(worker) hex prefix.
+    # Peers start at the root ("") and only descend into differing children.
+    tree = await get_merkle_tree(db_service, merkle_cache, prefix)
+    return {
+        "depth": tree.depth,
+        "nodes": {p: tree.describe(p) for p in prefix},
+    }
+
+
+@app.get("/hotkey_workers/buckets")
+async def get_hotkey_workers_buckets(
+    db_service: Annotated[DatabaseService, Depends(get_database_service)],
+    merkle_cache: Annotated[MerkleTreeCache, Depends(get_merkle_tree_cache)],
+    prefix: Annotated[List[str], Query()],
+    accept: Annotated[str | None, Header()] = None,
+):
+    # Registrations of every worker in the given Merkle buckets
+    tree = await get_merkle_tree(db_service, merkle_cache, prefix)
+    workers = [w for p in prefix for w in tree.bucket_workers(p)]
+    rows = db_service.iter_hotkey_workers_by_worker(workers)
+    if wants_ndjson(accept):
+        return ndjson_response(rows)
+    return await asyncio.to_thread(list, rows)
+
+
+@app.get("/ratings/explain")
+async def explain_ratings(
+    validator: Annotated[Validator, Depends(get_validator)],
+    config: Annotated[ValidatorSettings, Depends(load_config)],
+    hotkey: Annotated[List[str] | None, Query()] = None,
+    uptime_alpha: Annotated[float | None, Query(ge=0)] = None,
+    max_difficulty: Annotated[float | None, Query(gt=0)] = None,
+    shares_per_minute: Annotated[int | None, Query(gt=0)] = None,
+) -> RatingsExplanationResponse:
+    # Breakdown of every hotkey's rating over the cached metrics, ordered by
+    # rank. The override parameters are a dry run: nothing is stored or set.
+    calculator, explanation = await validator.explain_ratings(
+        config.cache_ttl.total_seconds(),
+        uptime_alpha,
+        max_difficulty,
+        shares_per_minute,
+    )
+    hotkeys = explanation if hotkey is None else [
+        hk for hk in dict.fromkeys(hotkey) if hk in explanation
+    ]
+    ratings = sorted(
+        (RatingExplanation(hotkey=hk, **explanation[hk]) for hk in hotkeys),
+        key=lambda rating: rating.rank,
+    )
+    return RatingsExplanationResponse(
+        parameters=RatingParameters(
+            uptime_alpha=calculator.uptime_alpha,
+            max_difficulty=calculator.max_difficulty,
+            shares_per_minute=calculator.shares_per_minute,
+        ),
+        ratings=ratings,
+    )
+
+
 # Only define /ratings if ENV == "test"
 if ENV == "test":
 
@@ -291,6 +754,91 @@ async def unbind_worker(
     return dict(message="Worker unbound successfully")
 
 
+@app.post("/unbind/batch")
+async def unbind_workers_batch(
+    batch: UnbindWorkerBatchRequest,
+    db_service: Annotated[DatabaseService, Depends(get_database_service)],
+    config: Annotated[ValidatorSettings, Depends(load_config)],
+    substrate: Annotated[SubstrateInterface, Depends(get_substrate)],
+) -> BatchUnbindResponse:
+    """
+    Unbind many workers of one hotkey at once. Each item carries the
+    signature /unbind expects for that worker, so peers can verify the
+    tombstones individually; the response holds one result per item.
+    """
+    unbinds = batch.unbinds
+    if not unbinds:
+        raise HTTPException(status_code=400, detail="No unbinds given")
+    if len(unbinds) > config.register_batch_max_size:
+        # 413 tells clients to retry in smaller batches
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {config.register_batch_max_size} unbinds per batch",
+        )
+    if not await asyncio.to_thread(
+        is_hotkey_registered, batch.hotkey, substrate, config.netuid
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Hotkey not registered. To register in subnet use btcli command: `btcli subnet register`",
+        )
+    errors: list[str | None] = [None] * len(unbinds)
+    if config.verify_signature:
+        verified = await verify_signatures(
+            [
+                (batch.hotkey, batch.signed_json(item.worker), item.signature)
+                for item in unbinds
+            ]
+        )
+        for i, ok in enumerate(verified):
+            if not ok:
+                errors[i] = "Invalid signature"
+    rows = {
+        row["worker"]: row
+        for row in await asyncio.to_thread(
+            list,
+            db_service.iter_hotkey_workers_by_worker(
+                {item.worker for item in unbinds}
+            ),
+        )
+    }
+    pending: dict[str, int] = {}
+    for i, item in enumerate(unbinds):
+        if errors[i] is not None:
+            continue
+        row = rows.get(item.worker)
+        if row is None or row["hotkey"] != batch.hotkey:
+            errors[i] = "Worker not found for this hotkey"
+        elif row["unbind_signature"] or item.worker in pending:
+            errors[i] = "Worker already unbound"
+        else:
+            pending[item.worker] = i
+    if pending:
+        # Everything that passed is applied in a single transaction
+        applied = await db_service.mark_workers_unbound(
+            [
+                (batch.hotkey, worker, unbinds[i].signature)
+                for worker, i in pending.items()
+            ]
+        )
+        if applied < len(pending):
+            # Some were unbound by a concurrent request after they were read
+            for row in await asyncio.to_thread(
+                list, db_service.iter_hotkey_workers_by_worker(set(pending))
+            ):
+                i = pending[row["worker"]]
+                if row["unbind_signature"] != unbinds[i].signature:
+                    errors[i] = "Worker already unbound"
+    results = [
+        UnbindResult(worker=item.worker, unbound=error is None, detail=error)
+        for item, error in zip(unbinds, errors)
+    ]
+    unbound = sum(result.unbound for result in results)
+    return BatchUnbindResponse(
+        unbound=unbound, failed=len(results) - unbound, results=results
+    )
+
+
 @app.get("/validator_sync_offsets")
 async def get_validator_sync_offsets(
     db_service: Annotated[DatabaseService, Depends(get_database_service)],
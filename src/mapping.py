@@ -1,8 +1,11 @@
 # mapping.py
 # Manages Bittensor hotkey <-> Kaspa worker name resolution
 
+import bisect
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .instrumentation import cache_lookup, observe
 
 
 class MappingSource:
@@ -17,14 +20,64 @@ class MappingManager:
         self.cache_ttl = cache_ttl
         self._mapping: Dict[str, str] = {}
         self._last_update: float = 0.0
+        # Sorted worker names, overall and per hotkey, rebuilt with the
+        # mapping so filtered queries can bisect instead of scanning
+        self._workers: List[str] = []
+        self._workers_by_hotkey: Dict[str, List[str]] = {}
 
     async def get_mapping(self) -> Dict[str, str]:
         now = time.time()
         if now - self._last_update > self.cache_ttl:
-            self._mapping = await self.source.load_mapping()
+            cache_lookup("mapping", "miss")
+            with observe("load_mapping"):
+                mapping = await self.source.load_mapping()
+                self._build_index(mapping)
+                self._mapping = mapping
             self._last_update = now
+        else:
+            cache_lookup("mapping", "hit")
         return self._mapping
 
+    def _build_index(self, mapping: Dict[str, str]) -> None:
+        workers = sorted(mapping)
+        by_hotkey: Dict[str, List[str]] = {}
+        for worker in workers:
+            by_hotkey.setdefault(mapping[worker], []).append(worker)
+        self._workers = workers
+        self._workers_by_hotkey = by_hotkey
+
+    async def query(
+        self,
+        hotkey: Optional[str] = None,
+        worker_prefix: str = "",
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[Dict[str, str], Optional[str]]:
+        """
+        Worker -> hotkey entries in worker order, optionally of one hotkey
+        and/or with names starting with worker_prefix, after the `cursor`
+        worker and at most `limit` of them. Returns the entries and the
+        cursor of the next page (None on the last one).
+        """
+        mapping = await self.get_mapping()
+        workers = (
+            self._workers
+            if hotkey is None
+            else self._workers_by_hotkey.get(hotkey, [])
+        )
+        start = bisect.bisect_left(workers, worker_prefix)
+        if cursor is not None:
+            start = max(start, bisect.bisect_right(workers, cursor))
+        result: Dict[str, str] = {}
+        for i in range(start, len(workers)):
+            worker = workers[i]
+            if not worker.startswith(worker_prefix):
+                break
+            if limit is not None and len(result) == limit:
+                return result, workers[i - 1]
+            result[worker] = mapping[worker]
+        return result, None
+
     async def get_hotkey(self, worker: str) -> Optional[str]:
         mapping = await self.get_mapping()
         return mapping.get(worker)
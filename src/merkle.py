@@ -0,0 +1,140 @@
+# merkle.py
+# Hash tree over hotkey_worker rows for anti-entropy between validators
+
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Leaf buckets are addressed by this many hex digits of sha256(worker),
+# i.e. 16**3 = 4096 buckets with 16 children per inner node.
+MERKLE_DEPTH = 3
+# Upper bound on prefixes described or downloaded per request
+MERKLE_MAX_PREFIXES = 256
+
+# (worker, hotkey, signature), plus UNBOUND_MARKER once the worker is unbound
+MerkleRow = Tuple[str, ...]
+# Stands in for the unbind signature in leaves: sr25519 signatures differ on
+# every signing, so validators that each received a separate unbind of the
+# same worker would otherwise never agree on its leaf
+UNBOUND_MARKER = "unbound"
+
+
+def bucket_of(worker: str, depth: int = MERKLE_DEPTH) -> str:
+    return hashlib.sha256(worker.encode()).hexdigest()[:depth]
+
+
+def leaf_hash(row: MerkleRow) -> bytes:
+    return hashlib.sha256("\0".join(row).encode()).digest()
+
+
+class MerkleTree:
+    """
+    Hash tree over registrations, bucketed by the hash prefix of the worker.
+
+    Hashing the worker name spreads rows evenly over buckets whatever the
+    naming scheme. Each leaf bucket hashes its rows' leaf hashes in worker
+    order; each inner node hashes its (child prefix, child hash) pairs. Two
+    validators holding the same rows therefore get the same root, and the
+    prefixes whose hashes differ lead straight to the diverging buckets.
+    Empty subtrees have no node at all.
+    """
+
+    def __init__(self, rows: Iterable[MerkleRow], depth: int = MERKLE_DEPTH):
+        self.depth = depth
+        buckets: Dict[str, List[Tuple[str, bytes]]] = defaultdict(list)
+        for row in rows:
+            buckets[bucket_of(row[0], depth)].append((row[0], leaf_hash(row)))
+        self._workers: Dict[str, List[str]] = {}
+        self._nodes: Dict[str, bytes] = {}
+        for prefix, leaves in buckets.items():
+            leaves.sort()
+            self._workers[prefix] = [worker for worker, _ in leaves]
+            self._nodes[prefix] = hashlib.sha256(
+                b"".join(h for _, h in leaves)
+            ).digest()
+        level = list(self._nodes)
+        for _ in range(depth):
+            children: Dict[str, List[str]] = defaultdict(list)
+            for prefix in level:
+                children[prefix[:-1]].append(prefix)
+            for parent, kids in children.items():
+                self._nodes[parent] = hashlib.sha256(
+                    b"".join(
+                        kid.encode() + self._nodes[kid] for kid in sorted(kids)
+                    )
+                ).digest()
+            level = list(children)
+
+    def node(self, prefix: str) -> str | None:
+        digest = self._nodes.get(prefix)
+        return digest.hex() if digest is not None else None
+
+    @property
+    def root(self) -> str | None:
+        return self.node("")
+
+    def children(self, prefix: str) -> Dict[str, str]:
+        if len(prefix) >= self.depth:
+            return {}
+        return {
+            child: self._nodes[child].hex()
+            for child in (prefix + c for c in "0123456789abcdef")
+            if child in self._nodes
+        }
+
+    def describe(self, prefix: str) -> dict:
+        """API representation of a node and its direct children."""
+        return {"hash": self.node(prefix), "children": self.children(prefix)}
+
+    def bucket_workers(self, prefix: str) -> List[str]:
+        """Workers in every leaf bucket under `prefix`."""
+        if len(prefix) == self.depth:
+            return list(self._workers.get(prefix, []))
+        return [
+            worker
+            for bucket, workers in self._workers.items()
+            if bucket.startswith(prefix)
+            for worker in workers
+        ]
+
+
+def diverging_buckets(
+    local: MerkleTree, remote_nodes: Dict[str, dict]
+) -> Tuple[List[str], List[str]]:
+    """
+    Compare described remote nodes against the local tree.
+
+    Returns (prefixes to descend into next, leaf buckets to download). Only
+    subtrees the remote has and whose hash differs are followed, since rows
+    only the local side holds are for the remote to pull.
+    """
+    descend, download = [], []
+    for prefix, remote in remote_nodes.items():
+        if remote.get("hash") is None or remote["hash"] == local.node(prefix):
+            continue
+        if len(prefix) >= local.depth:
+            download.append(prefix)
+            continue
+        for child, child_hash in remote.get("children", {}).items():
+            if child_hash != local.node(child):
+                descend.append(child)
+    return descend, download
+
+
+class MerkleTreeCache:
+    """Keeps a built tree for `ttl` seconds; rebuilding is a full scan."""
+
+    def __init__(self, ttl: float = 15):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tree: MerkleTree | None = None
+        self._built_at = 0.0
+
+    def get(self, build: Callable[[], MerkleTree]) -> MerkleTree:
+        with self._lock:
+            if self._tree is None or time.time() - self._built_at > self.ttl:
+                self._tree = build()
+                self._built_at = time.time()
+            return self._tree
@@ -2,10 +2,27 @@
 # Handles Prometheus client and metrics parsing for Kaspa Stratum Bridge
 
 import asyncio
+import json
+import time
 from datetime import timedelta, datetime
-from typing import Dict, Any, NamedTuple, Self
+from typing import TYPE_CHECKING, Dict, Any, List, NamedTuple, Self, Sequence
 from pydantic import BaseModel, ConfigDict, Field
 import aiohttp
+import numpy as np
+from fiber.utils import get_logger
+
+from .accumulator import (
+    ACCUMULATED_COUNTERS,
+    BUCKET_SECONDS,
+    MetricsAccumulator,
+)
+from .instrumentation import cache_lookup, timed
+
+if TYPE_CHECKING:
+    from .snapshots import MetricsSnapshotStore
+
+
+logger = get_logger(__name__)
 
 
 class MinerKey(BaseModel):
@@ -42,9 +59,170 @@ class MinerMetrics(BaseModel):
 
     @classmethod
     def default_instance(cls, worker_name: str | None = None) -> Self:
+        if worker_name is None:
+            # Frozen, so one shared instance can stand in for every empty row
+            global _DEFAULT_METRICS
+            if _DEFAULT_METRICS is None:
+                _DEFAULT_METRICS = cls()
+            return _DEFAULT_METRICS
         return cls(worker_name=worker_name)
 
 
+_DEFAULT_METRICS: MinerMetrics | None = None
+
+# Numeric MinerMetrics fields, stored column-wise by MinerMetricsBatch
+METRICS_COLUMNS = (
+    "uptime",
+    "valid_shares",
+    "invalid_shares",
+    "total_difficulty",
+    "difficulty",
+    "hashrate",
+    "uptime_seconds",
+)
+_INT_COLUMNS = {"valid_shares", "invalid_shares"}
+
+
+class MinerMetricsBatch:
+    """
+    Struct-of-arrays form of many MinerMetrics.
+
+    Row i describes the worker `workers[i]` of wallet `wallets[i]`; every
+    numeric MinerMetrics field is a NumPy column of the same length. This is
+    what the client, validator and rating engine pass around; MinerMetrics
+    objects are only materialized for API responses.
+    """
+
+    __slots__ = ("wallets", "workers", *METRICS_COLUMNS, "_index")
+
+    def __init__(
+        self,
+        wallets: List[str],
+        workers: List[str],
+        **columns: Sequence[float],
+    ):
+        if len(wallets) != len(workers):
+            raise ValueError("wallets and workers must have the same length")
+        self.wallets = wallets
+        self.workers = workers
+        for name in METRICS_COLUMNS:
+            dtype = np.int64 if name in _INT_COLUMNS else np.float64
+            column = columns.get(name)
+            setattr(
+                self,
+                name,
+                (
+                    np.zeros(len(workers), dtype=dtype)
+                    if column is None
+                    else np.asarray(column, dtype=dtype)
+                ),
+            )
+        self._index: Dict[tuple[str, str], int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.workers)
+
+    @classmethod
+    def from_metrics(
+        cls, metrics: Dict[MinerKey, MinerMetrics]
+    ) -> "MinerMetricsBatch":
+        values = list(metrics.values())
+        return cls(
+            [key.wallet for key in metrics],
+            [key.worker for key in metrics],
+            **{
+                name: [getattr(m, name) for m in values]
+                for name in METRICS_COLUMNS
+            },
+        )
+
+    def index(self, wallet: str, worker: str) -> int:
+        """Row of (wallet, worker), or -1 if the batch has no data for it."""
+        if self._index is None:
+            self._index = {
+                key: i for i, key in enumerate(zip(self.wallets, self.workers))
+            }
+        return self._index.get((wallet, worker), -1)
+
+    def take(self, rows: np.ndarray, workers: List[str], wallet: str) -> Self:
+        """
+        Select rows into a new batch. Rows equal to -1 become zero rows, so
+        mapped workers without data need no per-worker default objects.
+        """
+        columns = {}
+        for name in METRICS_COLUMNS:
+            column = getattr(self, name)
+            # Index -1 picks the appended zero row
+            padded = np.concatenate([column, np.zeros(1, dtype=column.dtype)])
+            columns[name] = padded[rows]
+        return type(self)([wallet] * len(workers), workers, **columns)
+
+    def materialize(self, i: int) -> MinerMetrics:
+        return MinerMetrics(
+            worker_name=self.workers[i],
+            **{name: getattr(self, name)[i].item() for name in METRICS_COLUMNS},
+        )
+
+    def to_metrics(self) -> Dict[MinerKey, MinerMetrics]:
+        return {
+            MinerKey(wallet=wallet, worker=worker): self.materialize(i)
+            for i, (wallet, worker) in enumerate(zip(self.wallets, self.workers))
+        }
+
+
+class HotkeyMetricsBatch(NamedTuple):
+    """
+    Worker metrics grouped by hotkey: the rows of `hotkeys[i]` are
+    `metrics[offsets[i]:offsets[i + 1]]`.
+    """
+
+    hotkeys: List[str]
+    offsets: np.ndarray
+    metrics: MinerMetricsBatch
+
+    @classmethod
+    def from_hotkey_metrics(
+        cls, hotkey_metrics: Dict[str, List[MinerMetrics]]
+    ) -> "HotkeyMetricsBatch":
+        rows = [m for ms in hotkey_metrics.values() for m in ms]
+        metrics = MinerMetricsBatch(
+            [""] * len(rows),
+            [m.worker_name for m in rows],
+            **{
+                name: [getattr(m, name) for m in rows]
+                for name in METRICS_COLUMNS
+            },
+        )
+        counts = [len(ms) for ms in hotkey_metrics.values()]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(list(hotkey_metrics), offsets, metrics)
+
+    def group_ids(self) -> np.ndarray:
+        """Index into `hotkeys` for every row of `metrics`."""
+        return np.repeat(
+            np.arange(len(self.hotkeys)), np.diff(self.offsets)
+        )
+
+    def to_hotkey_metrics(self) -> Dict[str, List[MinerMetrics]]:
+        return {
+            hotkey: [
+                self.metrics.materialize(i)
+                for i in range(self.offsets[h], self.offsets[h + 1])
+            ]
+            for h, hotkey in enumerate(self.hotkeys)
+        }
+
+
+class QueryStats(NamedTuple):
+    """Payload size and timing of the last response for a Prometheus query."""
+
+    payload_bytes: int
+    series: int
+    samples: int
+    duration: float
+
+
 PROM_QUERY = (
     "sum(increase(ks_valid_share_counter[{resolution}])) by (wallet, worker)"
 )
@@ -56,10 +234,40 @@ class MetricsClient:
         endpoint: str,
         window: timedelta = timedelta(minutes=60),
         pool_owner_wallet: str | None = None,
+        accumulator_views: Sequence[timedelta] | None = None,
+        snapshot_store: "MetricsSnapshotStore | None" = None,
     ):
+        """
+        accumulator_views: When set, counters are accumulated incrementally in
+        minute buckets (see MetricsAccumulator) for `window` plus these extra
+        windows, instead of re-querying the whole window on every fetch.
+        snapshot_store: When set, every fetch over `window` is persisted there
+        and the latest snapshot can be loaded back with `warm_start`.
+
+        Setting `publish_snapshots` stores every fetch regardless of the
+        store interval, and setting `follow_snapshots` makes
+        `get_cached_metrics` take metrics from the snapshots another process
+        (the leader) publishes that way, only querying Prometheus itself
+        when the leader stopped publishing.
+        """
         self.endpoint = endpoint
         self.window = window
         self.pool_owner_wallet = pool_owner_wallet
+        self.query_stats: Dict[str, QueryStats] = {}
+        self.accumulator = (
+            MetricsAccumulator([window, *accumulator_views])
+            if accumulator_views is not None
+            else None
+        )
+        self.snapshot_store = snapshot_store
+        self.last_metrics: MinerMetricsBatch | None = None
+        self.last_metrics_time: float = 0.0
+        self.publish_snapshots = False
+        self.follow_snapshots = False
+        self._refresh_task: asyncio.Task | None = None
+
+    def _resolution(self, window: timedelta | None = None) -> str:
+        return f"{int((window or self.window).total_seconds())}s"
 
     async def _fetch_metric(
         self, session: aiohttp.ClientSession, query: str, value_type=int
@@ -67,114 +275,345 @@ class MetricsClient:
         """Generic Prometheus query fetcher for (wallet, worker) keyed results."""
         url = f"{self.endpoint}/api/v1/query"
         params = {"query": query}
+        started = time.perf_counter()
         async with session.get(url, params=params) as resp:
             resp.raise_for_status()
-            data = await resp.json()
+            body = await resp.read()
+        data = json.loads(body).get("data", {})
+        items = data.get("result", [])
         result = {}
-        for item in data.get("data", {}).get("result", []):
-            metric = item["metric"]
-            if metric.get("wallet") is None or metric.get("worker") is None:
-                continue
-            if "value" in item:
-                value = float(item["value"][1])
-            elif "values" in item and item["values"]:
-                value = float(item["values"][-1][1])  # last value in the range
-            else:
-                continue
-            miner_key = MinerKey(**metric)
-            result[miner_key] = value_type(value)
+        samples = 0
+        if data.get("resultType") == "vector":
+            # Fast path: instant vectors carry exactly one sample per series
+            samples = len(items)
+            for item in items:
+                metric = item["metric"]
+                if metric.get("wallet") is None or metric.get("worker") is None:
+                    continue
+                miner_key = MinerKey(**metric)
+                result[miner_key] = value_type(float(item["value"][1]))
+        else:
+            for item in items:
+                metric = item["metric"]
+                if metric.get("wallet") is None or metric.get("worker") is None:
+                    continue
+                if "value" in item:
+                    samples += 1
+                    value = float(item["value"][1])
+                elif "values" in item and item["values"]:
+                    samples += len(item["values"])
+                    value = float(item["values"][-1][1])  # last value in the range
+                else:
+                    continue
+                miner_key = MinerKey(**metric)
+                result[miner_key] = value_type(value)
+        stats = QueryStats(
+            payload_bytes=len(body),
+            series=len(items),
+            samples=samples,
+            duration=time.perf_counter() - started,
+        )
+        self.query_stats[query] = stats
+        logger.debug(
+            f"Prometheus query {query!r}: {stats.payload_bytes} bytes, "
+            f"{stats.series} series, {stats.samples} samples in {stats.duration:.3f}s"
+        )
         return result
 
     async def _get_valid_shares(
-        self, session: aiohttp.ClientSession
+        self,
+        session: aiohttp.ClientSession,
+        window: timedelta | None = None,
     ) -> Dict[MinerKey, int]:
         """Get number of valid shares per (wallet, worker)."""
-        resolution = f"{int(self.window.total_seconds())}s"
+        resolution = self._resolution(window)
         query = f"sum(increase(ks_valid_share_counter[{resolution}])) by (wallet, worker)"
         return await self._fetch_metric(session, query, int)
 
     async def _get_invalid_shares(
-        self, session: aiohttp.ClientSession
+        self,
+        session: aiohttp.ClientSession,
+        window: timedelta | None = None,
     ) -> Dict[MinerKey, int]:
-        resolution = f"{int(self.window.total_seconds())}s"
+        resolution = self._resolution(window)
         query = f"sum(increase(ks_invalid_share_counter[{resolution}])) by (wallet, worker)"
         return await self._fetch_metric(session, query, int)
 
     async def _get_total_share_diff(
-        self, session: aiohttp.ClientSession
+        self,
+        session: aiohttp.ClientSession,
+        window: timedelta | None = None,
     ) -> Dict[MinerKey, float]:
         """Get total difficulty of all shares per (wallet, worker)."""
-        resolution = f"{int(self.window.total_seconds())}s"
+        resolution = self._resolution(window)
         query = f"sum(increase(ks_valid_share_diff_counter[{resolution}])) by (wallet, worker)"
         return await self._fetch_metric(session, query, float)
 
     async def _get_uptime(
-        self, session: aiohttp.ClientSession
+        self,
+        session: aiohttp.ClientSession,
+        window: timedelta | None = None,
     ) -> Dict[MinerKey, float]:
-        """Query Prometheus and return uptime (ks_miner_uptime_seconds) per (wallet, worker)."""
-        resolution = f"{int(self.window.total_seconds())}s"
-        query = f"ks_miner_uptime_seconds[{resolution}]"
+        """
+        Query Prometheus and return uptime (ks_miner_uptime_seconds) per (wallet, worker).
+
+        Uses last_over_time so Prometheus returns one sample per worker seen in
+        the window instead of every raw sample of the range vector.
+        """
+        resolution = self._resolution(window)
+        query = f"max(last_over_time(ks_miner_uptime_seconds[{resolution}])) by (wallet, worker)"
         return await self._fetch_metric(session, query, float)
 
     async def _get_uptime_seconds(
-        self, session: aiohttp.ClientSession
+        self,
+        session: aiohttp.ClientSession,
+        window: timedelta | None = None,
     ) -> Dict[MinerKey, float]:
         """Query Prometheus for sum(increase(ks_miner_work_seconds_total[window])) by (worker, wallet)."""
-        resolution = f"{int(self.window.total_seconds())}s"
+        resolution = self._resolution(window)
         query = f"sum(increase(ks_miner_work_seconds_total[{resolution}])) by (worker, wallet)"
         return await self._fetch_metric(session, query, float)
 
-    async def fetch_metrics(self) -> Dict[MinerKey, MinerMetrics]:
+    async def _fetch_metric_range(
+        self,
+        session: aiohttp.ClientSession,
+        query: str,
+        start: int,
+        end: int,
+        step: int,
+    ) -> Dict[int, Dict[MinerKey, float]]:
+        """Prometheus range query fetcher returning {timestamp: {MinerKey: value}}."""
+        url = f"{self.endpoint}/api/v1/query_range"
+        params = {"query": query, "start": start, "end": end, "step": step}
+        started = time.perf_counter()
+        async with session.get(url, params=params) as resp:
+            resp.raise_for_status()
+            body = await resp.read()
+        items = json.loads(body).get("data", {}).get("result", [])
+        result: Dict[int, Dict[MinerKey, float]] = {}
+        samples = 0
+        for item in items:
+            metric = item["metric"]
+            if metric.get("wallet") is None or metric.get("worker") is None:
+                continue
+            miner_key = MinerKey(**metric)
+            for ts, value in item.get("values", []):
+                result.setdefault(int(float(ts)), {})[miner_key] = float(value)
+            samples += len(item.get("values", []))
+        stats = QueryStats(
+            payload_bytes=len(body),
+            series=len(items),
+            samples=samples,
+            duration=time.perf_counter() - started,
+        )
+        self.query_stats[query] = stats
+        logger.debug(
+            f"Prometheus range query {query!r} [{start}, {end}]: {stats.payload_bytes} bytes, "
+            f"{stats.series} series, {stats.samples} samples in {stats.duration:.3f}s"
+        )
+        return result
+
+    async def _get_accumulated_counters(
+        self, session: aiohttp.ClientSession, window: timedelta
+    ) -> Dict[MinerKey, tuple]:
+        """
+        Fetch only the minute buckets missing since the last fetch and return
+        accumulated counter totals per (wallet, worker) over `window`.
+        """
+        pending = self.accumulator.pending_range(time.time())
+        if pending is not None:
+            start, end = pending
+            counters = await asyncio.gather(
+                *[
+                    self._fetch_metric_range(
+                        session,
+                        f"sum(increase({counter}[{BUCKET_SECONDS}s])) by (wallet, worker)",
+                        start,
+                        end,
+                        BUCKET_SECONDS,
+                    )
+                    for counter in ACCUMULATED_COUNTERS
+                ]
+            )
+            self.accumulator.add_range(start, end, counters)
+        return self.accumulator.totals(window)
+
+    async def fetch_metrics(
+        self, window: timedelta | None = None
+    ) -> Dict[MinerKey, MinerMetrics]:
+        """Fetch metrics (see fetch_metrics_batch) as MinerMetrics objects."""
+        batch = await self.fetch_metrics_batch(window)
+        return batch.to_metrics()
+
+    @timed("fetch_metrics")
+    async def fetch_metrics_batch(
+        self, window: timedelta | None = None
+    ) -> MinerMetricsBatch:
         """
         Fetch and parse metrics from Prometheus endpoint for all wallets.
 
         - ks_valid_share_counter: Number of valid shares (from Go: stats.SharesFound.Add(1))
         - ks_valid_share_diff_counter: Sum of share difficulties (from Go: stats.SharesDiff.Add(state.stratumDiff.hashValue))
         - Hashrate is calculated as (valid_shares * avg_difficulty * 2^32) / window_seconds
+        - window: Defaults to self.window; with an accumulator it must be one of the accumulated windows.
         """
+        window = window or self.window
         async with aiohttp.ClientSession() as session:
-            (
-                valid_shares_map,
-                invalid_shares_map,
-                total_diff_map,
-                uptime_map,
-                uptime_seconds_map,
-            ) = await asyncio.gather(
-                self._get_valid_shares(session),
-                self._get_invalid_shares(session),
-                self._get_total_share_diff(session),
-                self._get_uptime(session),
-                self._get_uptime_seconds(session),
-            )
-            result = {}
-            window_seconds = int(self.window.total_seconds())
-
-            for miner_key, valid_shares in valid_shares_map.items():
-                if (
-                    self.pool_owner_wallet
-                    and miner_key.wallet != self.pool_owner_wallet
-                ):
-                    continue
-                total_diff = total_diff_map.get(miner_key, 0.0)
-                invalid_shares = invalid_shares_map.get(miner_key, 0)
-                total_shares = valid_shares + invalid_shares
-                avg_difficulty = (
-                    total_diff / total_shares if total_shares > 0 else 0.0
+            if self.accumulator is not None:
+                counters, uptime_map = await asyncio.gather(
+                    self._get_accumulated_counters(session, window),
+                    self._get_uptime(session, window),
                 )
-                hashrate = (
-                    (valid_shares * avg_difficulty * 2**32) / window_seconds
-                    if valid_shares > 0
-                    else 0.0
+                valid_shares_map = {
+                    key: int(values[0]) for key, values in counters.items()
+                }
+                invalid_shares_map = {
+                    key: int(values[1]) for key, values in counters.items()
+                }
+                total_diff_map = {
+                    key: values[2] for key, values in counters.items()
+                }
+                uptime_seconds_map = {
+                    key: values[3] for key, values in counters.items()
+                }
+            else:
+                (
+                    valid_shares_map,
+                    invalid_shares_map,
+                    total_diff_map,
+                    uptime_map,
+                    uptime_seconds_map,
+                ) = await asyncio.gather(
+                    self._get_valid_shares(session, window),
+                    self._get_invalid_shares(session, window),
+                    self._get_total_share_diff(session, window),
+                    self._get_uptime(session, window),
+                    self._get_uptime_seconds(session, window),
                 )
-                miner_metrics = MinerMetrics(
-                    uptime=uptime_map.get(miner_key, 0.0),
-                    valid_shares=valid_shares,
-                    invalid_shares=invalid_shares_map.get(miner_key, 0),
-                    total_difficulty=total_diff,
-                    difficulty=avg_difficulty,  # Store average difficulty per share
-                    hashrate=hashrate,
-                    worker_name=miner_key.worker,
-                    uptime_seconds=uptime_seconds_map.get(miner_key, 0.0),
+        window_seconds = int(window.total_seconds())
+        wallets, workers = [], []
+        columns = {name: [] for name in METRICS_COLUMNS}
+
+        for miner_key, valid_shares in valid_shares_map.items():
+            if (
+                self.pool_owner_wallet
+                and miner_key.wallet != self.pool_owner_wallet
+            ):
+                continue
+            total_diff = total_diff_map.get(miner_key, 0.0)
+            invalid_shares = invalid_shares_map.get(miner_key, 0)
+            total_shares = valid_shares + invalid_shares
+            avg_difficulty = (
+                total_diff / total_shares if total_shares > 0 else 0.0
+            )
+            hashrate = (
+                (valid_shares * avg_difficulty * 2**32) / window_seconds
+                if valid_shares > 0
+                else 0.0
+            )
+            wallets.append(miner_key.wallet)
+            workers.append(miner_key.worker)
+            columns["uptime"].append(uptime_map.get(miner_key, 0.0))
+            columns["valid_shares"].append(valid_shares)
+            columns["invalid_shares"].append(invalid_shares)
+            columns["total_difficulty"].append(total_diff)
+            # Store average difficulty per share
+            columns["difficulty"].append(avg_difficulty)
+            columns["hashrate"].append(hashrate)
+            columns["uptime_seconds"].append(
+                uptime_seconds_map.get(miner_key, 0.0)
+            )
+        result = MinerMetricsBatch(wallets, workers, **columns)
+        if window == self.window:
+            await self._remember(result, time.time())
+        return result
+
+    async def _remember(
+        self, metrics: MinerMetricsBatch, fetched_at: float
+    ) -> None:
+        self.last_metrics = metrics
+        self.last_metrics_time = fetched_at
+        if self.snapshot_store is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self.snapshot_store.save,
+                metrics,
+                fetched_at,
+                self.publish_snapshots,
+            )
+        except OSError as e:
+            logger.warning(f"Failed to persist metrics snapshot: {e}")
+
+    def _load_newer_snapshot(self) -> bool:
+        """Adopt the latest stored snapshot if it is newer than last_metrics."""
+        snapshots = self.snapshot_store.list()
+        if not snapshots or snapshots[-1][0] <= self.last_metrics_time:
+            return False
+        try:
+            snapshot = self.snapshot_store.load(snapshots[-1][1])
+            batch = snapshot.to_batch()
+        except (OSError, ValueError) as e:
+            # e.g. pruned by the writer between listing and loading
+            logger.debug(f"Could not load snapshot {snapshots[-1][1]}: {e}")
+            return False
+        self.last_metrics = batch
+        self.last_metrics_time = snapshot.timestamp
+        return True
+
+    def warm_start(self) -> bool:
+        """Load the latest persisted snapshot as the last known metrics."""
+        if self.snapshot_store is None:
+            return False
+        if not self._load_newer_snapshot():
+            return False
+        snapshot_age = time.time() - self.last_metrics_time
+        logger.info(
+            f"Warm-started with {len(self.last_metrics)} workers from snapshot "
+            f"taken {snapshot_age:.0f}s ago"
+        )
+        return True
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        # Nothing awaits the background refresh; without this its exception
+        # would only surface as "Task exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                f"Background metrics refresh failed: {task.exception()!r}"
+            )
+
+    async def get_cached_metrics(
+        self, max_age: float, stale_age: float = 0.0
+    ) -> MinerMetricsBatch:
+        """
+        Return the last fetched metrics if younger than `max_age` seconds.
+
+        Metrics older than that but younger than `stale_age` (e.g. loaded by
+        `warm_start` after a restart) are returned immediately while a single
+        background fetch refreshes them. Anything older is fetched inline.
+
+        When following, a snapshot is only taken while it is younger than
+        twice `max_age`: the leader publishes one about every `max_age`, so
+        an older one means it stopped and the stale path takes over.
+        """
+        age = time.time() - self.last_metrics_time
+        if self.last_metrics is not None and age <= max_age:
+            cache_lookup("metrics", "hit")
+            return self.last_metrics
+        if self.follow_snapshots and self.snapshot_store is not None:
+            await asyncio.to_thread(self._load_newer_snapshot)
+            age = time.time() - self.last_metrics_time
+            if self.last_metrics is not None and age <= 2 * max_age:
+                cache_lookup("metrics", "snapshot")
+                return self.last_metrics
+        if self.last_metrics is not None and age <= stale_age:
+            cache_lookup("metrics", "stale")
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(
+                    self.fetch_metrics_batch()
                 )
-                result[miner_key] = miner_metrics
-            return result
+                self._refresh_task.add_done_callback(self._log_refresh_failure)
+            return self.last_metrics
+        cache_lookup("metrics", "miss")
+        return await self.fetch_metrics_batch()
@@ -0,0 +1,142 @@
+# metrics_index.py
+# Precomputed per-hotkey lookups and totals for filtered /metrics queries
+
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from .metrics import METRICS_COLUMNS, HotkeyMetricsBatch
+
+# Columns summed per hotkey in summary mode and usable as sort keys
+SUMMED_COLUMNS = (
+    "valid_shares",
+    "invalid_shares",
+    "total_difficulty",
+    "hashrate",
+    "uptime_seconds",
+)
+SORT_KEYS = SUMMED_COLUMNS + ("active_workers", "total_workers")
+METRICS_FIELDS = METRICS_COLUMNS + ("worker_name",)
+
+
+class HotkeyMetricsIndex:
+    """
+    Read-only view over one HotkeyMetricsBatch for answering /metrics
+    queries. Worker counts and column totals per hotkey are computed once
+    with NumPy; a query then only touches the hotkeys and rows it returns.
+    """
+
+    def __init__(self, batch: HotkeyMetricsBatch):
+        self.batch = batch
+        n = len(batch.hotkeys)
+        self.groups = batch.group_ids()
+        self.positions = {hotkey: h for h, hotkey in enumerate(batch.hotkeys)}
+        self.worker_rows = {
+            worker: i for i, worker in enumerate(batch.metrics.workers)
+        }
+        self.total_workers = np.diff(batch.offsets)
+        self.active_workers = np.bincount(
+            self.groups,
+            weights=(batch.metrics.uptime > 0).astype(np.float64),
+            minlength=n,
+        ).astype(np.int64)
+        self.totals = {}
+        for name in SUMMED_COLUMNS:
+            column = getattr(batch.metrics, name)
+            total = np.bincount(self.groups, weights=column, minlength=n)
+            # bincount sums in float64; share counts stay integers
+            self.totals[name] = total.astype(column.dtype)
+
+    def _sort_key(self, name: str) -> np.ndarray:
+        if name == "active_workers":
+            return self.active_workers
+        if name == "total_workers":
+            return self.total_workers
+        return self.totals[name]
+
+    def _project(self, i: int, fields: Sequence[str]) -> Dict[str, Any]:
+        metrics = self.batch.metrics
+        return {
+            name: (
+                metrics.workers[i]
+                if name == "worker_name"
+                else getattr(metrics, name)[i].item()
+            )
+            for name in fields
+        }
+
+    def _entry(self, h: int) -> Dict[str, Any]:
+        active = int(self.active_workers[h])
+        return {
+            "hotkey": self.batch.hotkeys[h],
+            "active_workers": active,
+            "total_workers": int(self.total_workers[h]),
+            "is_active": active != 0,
+        }
+
+    def query(
+        self,
+        hotkeys: Iterable[str] | None = None,
+        workers: Iterable[str] | None = None,
+        fields: Sequence[str] | None = None,
+        summary: bool = False,
+        sort: str | None = None,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Hotkey entries shaped like MetricsResponse, optionally restricted to
+        some hotkeys and/or workers, with only `fields` of every worker's
+        metrics. `summary` replaces the worker list with per-hotkey totals.
+        `sort` orders hotkeys by a total (descending), and their workers by
+        that column when it is one; `limit` keeps the first hotkeys.
+
+        Raises ValueError for unknown field or sort names.
+        """
+        fields = tuple(fields or METRICS_FIELDS)
+        unknown = [name for name in fields if name not in METRICS_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown metrics fields: {', '.join(unknown)}")
+        if sort is not None and sort not in SORT_KEYS:
+            raise ValueError(
+                f"Unknown sort key: {sort}. Use one of: {', '.join(SORT_KEYS)}"
+            )
+        if hotkeys is None:
+            selected = list(range(len(self.batch.hotkeys)))
+        else:
+            selected = list(
+                dict.fromkeys(
+                    self.positions[hk] for hk in hotkeys if hk in self.positions
+                )
+            )
+        rows_by_hotkey: Dict[int, List[int]] | None = None
+        if workers is not None:
+            rows_by_hotkey = {}
+            for worker in dict.fromkeys(workers):
+                i = self.worker_rows.get(worker)
+                if i is not None:
+                    rows_by_hotkey.setdefault(int(self.groups[i]), []).append(i)
+            selected = [h for h in selected if h in rows_by_hotkey]
+        if sort is not None:
+            key = self._sort_key(sort)[selected]
+            selected = [selected[j] for j in np.argsort(-key, kind="stable")]
+        if limit is not None:
+            selected = selected[:limit]
+
+        result = []
+        for h in selected:
+            entry = self._entry(h)
+            if summary:
+                for name in SUMMED_COLUMNS:
+                    entry[name] = self.totals[name][h].item()
+            else:
+                rows = (
+                    rows_by_hotkey[h]
+                    if rows_by_hotkey is not None
+                    else range(self.batch.offsets[h], self.batch.offsets[h + 1])
+                )
+                if sort in METRICS_COLUMNS:
+                    column = getattr(self.batch.metrics, sort)
+                    rows = sorted(rows, key=lambda i: -column[i])
+                entry["metrics"] = [self._project(i, fields) for i in rows]
+            result.append(entry)
+        return result
@@ -1,3 +1,5 @@
+import json
+
 from pydantic import BaseModel, Field, field_validator, computed_field
 from scalecodec.utils.ss58 import ss58_decode
 from typing import List
@@ -22,11 +24,75 @@ class HotkeyWorkerRegistration(BaseModel):
         return v
 
 
+class SignedHotkeyWorkerRegistration(HotkeyWorkerRegistration):
+    signature: str = Field(
+        ...,
+        description="Hex signature of the registration, as X-Signature on /register",
+    )
+
+    def signed_json(self) -> str:
+        """The payload the signature covers (what /register verifies)."""
+        return json.dumps(
+            self.model_dump(exclude={"signature"}),
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+
+class HotkeyWorkerBatchRegistration(BaseModel):
+    registrations: List[SignedHotkeyWorkerRegistration]
+
+
+class RegistrationResult(BaseModel):
+    worker: str
+    registered: bool
+    detail: str | None = None
+
+
+class BatchRegistrationResponse(BaseModel):
+    registered: int
+    failed: int
+    results: List[RegistrationResult]
+
+
 class UnbindWorkerRequest(BaseModel):
     hotkey: str
     worker: str
 
 
+class SignedUnbind(BaseModel):
+    worker: str
+    signature: str = Field(
+        ...,
+        description="Hex signature of {hotkey, worker}, as X-Signature on /unbind",
+    )
+
+
+class UnbindWorkerBatchRequest(BaseModel):
+    hotkey: str
+    unbinds: List[SignedUnbind]
+
+    def signed_json(self, worker: str) -> str:
+        """The payload one worker's signature covers (what /unbind verifies)."""
+        return json.dumps(
+            UnbindWorkerRequest(hotkey=self.hotkey, worker=worker).model_dump(),
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+
+
+class UnbindResult(BaseModel):
+    worker: str
+    unbound: bool
+    detail: str | None = None
+
+
+class BatchUnbindResponse(BaseModel):
+    unbound: int
+    failed: int
+    results: List[UnbindResult]
+
+
 class MetricsResponse(BaseModel):
     hotkey: str = Field(..., description="Bittensor hotkey")
     active_workers: int = Field(..., description="Number of active workers")
@@ -37,3 +103,71 @@ class MetricsResponse(BaseModel):
     @property
     def is_active(self) -> bool:
         return self.active_workers != 0
+
+
+class ProjectedMinerMetrics(BaseModel):
+    """Worker metrics restricted to the requested `fields`; others are absent."""
+
+    uptime: float | None = None
+    valid_shares: int | None = None
+    invalid_shares: int | None = None
+    total_difficulty: float | None = None
+    difficulty: float | None = None
+    hashrate: float | None = None
+    worker_name: str | None = None
+    uptime_seconds: float | None = None
+
+
+class ProjectedMetricsResponse(BaseModel):
+    hotkey: str = Field(..., description="Bittensor hotkey")
+    active_workers: int = Field(..., description="Number of active workers")
+    total_workers: int = Field(..., description="Total number of workers")
+    is_active: bool
+    metrics: List[ProjectedMinerMetrics] = Field(
+        ..., description="Matching workers, with only the requested fields"
+    )
+
+
+class MetricsSummaryResponse(BaseModel):
+    hotkey: str = Field(..., description="Bittensor hotkey")
+    active_workers: int = Field(..., description="Number of active workers")
+    total_workers: int = Field(..., description="Total number of workers")
+    is_active: bool
+    valid_shares: int = Field(..., description="Sum over the hotkey's workers")
+    invalid_shares: int = Field(..., description="Sum over the hotkey's workers")
+    total_difficulty: float = Field(
+        ..., description="Sum over the hotkey's workers"
+    )
+    hashrate: float = Field(..., description="Sum over the hotkey's workers")
+    uptime_seconds: float = Field(..., description="Sum over the hotkey's workers")
+
+
+class RatingParameters(BaseModel):
+    uptime_alpha: float
+    max_difficulty: float
+    shares_per_minute: int
+
+
+class RatingExplanation(BaseModel):
+    hotkey: str
+    effective_work: float = Field(
+        ..., description="Sum of valid_shares * capped difficulty after penalties"
+    )
+    difficulty_penalty: float = Field(
+        ..., description="Share of work kept by the difficulty penalty (1 = none)"
+    )
+    share_rate_penalty: float = Field(
+        ..., description="Share of work kept by the share-rate penalty (1 = none)"
+    )
+    avg_uptime: float = Field(..., description="Average worker uptime fraction")
+    uptime_factor: float = Field(..., description="avg_uptime ** uptime_alpha")
+    normalized_work: float = Field(
+        ..., description="effective_work relative to the best hotkey"
+    )
+    score: float
+    rank: int = Field(..., description="1 for the highest score; ties share a rank")
+
+
+class RatingsExplanationResponse(BaseModel):
+    parameters: RatingParameters
+    ratings: List[RatingExplanation]
@@ -0,0 +1,118 @@
+# profiling.py
+# On-demand profiling of the running validator (see /internal/profile)
+
+import asyncio
+import cProfile
+import io
+import marshal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict
+
+# Only one capture runs at a time; cProfile and tracemalloc are process-wide
+_capture_lock = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+class _exclusive:
+    def __enter__(self):
+        if not _capture_lock.acquire(blocking=False):
+            raise ProfilerBusy("Another profile is being captured")
+
+    def __exit__(self, *exc):
+        _capture_lock.release()
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def sample_stacks(duration: float, interval: float = 0.005) -> Counter:
+    """
+    Sample the Python stack of every thread (the event loop as well as the
+    asyncio.to_thread workers running set_weights and sync) for `duration`
+    seconds. Returns a Counter of collapsed stacks, "thread;outer;...;inner",
+    to the number of samples they were seen in.
+    """
+    with _exclusive():
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                stacks[";".join(reversed(labels))] += 1
+            time.sleep(interval)
+        return stacks
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """Collapsed-stack text, as consumed by flamegraph.pl and speedscope."""
+    return "".join(
+        f"{stack} {count}\n" for stack, count in stacks.most_common()
+    )
+
+
+async def profile_event_loop(duration: float) -> bytes:
+    """
+    Run cProfile on the event loop thread for `duration` seconds. Returns the
+    stats in the binary format read by pstats.Stats / snakeviz.
+    """
+    with _exclusive():
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+        profiler.create_stats()
+        return marshal.dumps(profiler.stats)
+
+
+def top_allocations(
+    duration: float, limit: int = 25, key_type: str = "lineno"
+) -> Dict:
+    """
+    Top `limit` live allocations grouped by `key_type` ("lineno", "filename"
+    or "traceback"). If tracemalloc is not already tracing (PYTHONTRACEMALLOC)
+    it is started for `duration` seconds, so only memory allocated during
+    that window and still alive at its end is reported.
+    """
+    with _exclusive():
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+            time.sleep(duration)
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+    snapshot = snapshot.filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+    stats = snapshot.statistics(key_type)
+    out = io.StringIO()
+    for stat in stats[:limit]:
+        out.write(f"{stat}\n")
+    return {
+        "tracing_since_startup": not started,
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "top": out.getvalue().splitlines(),
+    }
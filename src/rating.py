@@ -5,7 +5,9 @@ from datetime import timedelta
 from typing import Dict, List
 import math
 
-from .metrics import MinerMetrics
+import numpy as np
+
+from .metrics import HotkeyMetricsBatch, MinerMetrics
 from fiber.utils import get_logger
 
 
@@ -99,3 +101,143 @@ class RatingCalculator:
             # 3. Clamp to [0.0, 1.0]
             scores[hotkey] = round(max(0.0, min(1.0, penalized)), self.ndigits)
         return scores
+
+    def with_overrides(
+        self,
+        uptime_alpha: float | None = None,
+        max_difficulty: float | None = None,
+        shares_per_minute: int | None = None,
+    ) -> "RatingCalculator":
+        """Copy of this calculator with some parameters replaced (what-if)."""
+        return RatingCalculator(
+            self.uptime_alpha if uptime_alpha is None else uptime_alpha,
+            timedelta(seconds=self.window_seconds),
+            self.ndigits,
+            self.max_difficulty if max_difficulty is None else max_difficulty,
+            (
+                self.shares_per_minute
+                if shares_per_minute is None
+                else shares_per_minute
+            ),
+        )
+
+    def _batch_terms(
+        self, hotkey_metrics: HotkeyMetricsBatch
+    ) -> Dict[str, np.ndarray]:
+        """Per-hotkey intermediate values of rate_batch, as NumPy arrays."""
+        n = len(hotkey_metrics.hotkeys)
+        m = hotkey_metrics.metrics
+        group = hotkey_metrics.group_ids()
+        counts = np.diff(hotkey_metrics.offsets)
+
+        # 1. Total work (per-worker difficulty and share-rate penalties)
+        window_minutes = self.window_seconds / 60.0
+        allowed_shares = window_minutes * self.shares_per_minute
+        valid_shares = m.valid_shares.astype(np.float64)
+        share_penalty = np.where(
+            valid_shares > allowed_shares,
+            np.exp(-(valid_shares - allowed_shares) / allowed_shares),
+            1.0,
+        )
+        difficulty_penalty = np.where(
+            m.difficulty > self.max_difficulty,
+            np.exp(-(m.difficulty - self.max_difficulty) / self.max_difficulty),
+            1.0,
+        )
+        raw_worker_work = valid_shares * np.minimum(
+            m.difficulty, self.max_difficulty
+        )
+        worker_work = raw_worker_work * difficulty_penalty * share_penalty
+        work = np.bincount(group, weights=worker_work, minlength=n)
+        max_work = work.max()
+
+        # 2. Normalization + uptime penalty
+        uptime = (
+            np.clip(m.uptime_seconds, 0.0, self.window_seconds)
+            / self.window_seconds
+        )
+        uptime_sum = np.bincount(group, weights=uptime, minlength=n)
+        avg_uptime = np.divide(
+            uptime_sum,
+            counts,
+            out=np.zeros(n, dtype=np.float64),
+            where=counts > 0,
+        )
+        norm_score = (
+            np.zeros(n, dtype=np.float64) if max_work == 0 else work / max_work
+        )
+        uptime_factor = avg_uptime**self.uptime_alpha
+        penalized = norm_score * uptime_factor
+        return {
+            "raw_work": np.bincount(group, weights=raw_worker_work, minlength=n),
+            "difficulty_penalized_work": np.bincount(
+                group, weights=raw_worker_work * difficulty_penalty, minlength=n
+            ),
+            "effective_work": work,
+            "avg_uptime": avg_uptime,
+            "uptime_factor": uptime_factor,
+            "normalized_work": norm_score,
+            # 3. Clamp to [0.0, 1.0]
+            "score": np.clip(penalized, 0.0, 1.0),
+        }
+
+    def rate_batch(self, hotkey_metrics: HotkeyMetricsBatch) -> Dict[str, float]:
+        """
+        Vectorized equivalent of rate_all over column-wise metrics grouped by
+        hotkey; per-worker terms are computed for all rows at once and summed
+        per hotkey in row order, so scores match rate_all.
+        """
+        if not hotkey_metrics.hotkeys:
+            return {}
+        scores = self._batch_terms(hotkey_metrics)["score"].tolist()
+        # Python round keeps results identical to rate_all
+        return {
+            hotkey: round(score, self.ndigits)
+            for hotkey, score in zip(hotkey_metrics.hotkeys, scores)
+        }
+
+    def explain_batch(
+        self, hotkey_metrics: HotkeyMetricsBatch
+    ) -> Dict[str, Dict[str, float | int]]:
+        """
+        How rate_batch arrives at each hotkey's score: effective work and the
+        share of raw work kept by the difficulty and share-rate penalties
+        (1.0 = no penalty), average uptime and its factor, work normalized to
+        the best hotkey, the score itself and its rank (1 = highest).
+        """
+        if not hotkey_metrics.hotkeys:
+            return {}
+        terms = self._batch_terms(hotkey_metrics)
+        raw = terms["raw_work"]
+        difficulty_work = terms["difficulty_penalized_work"]
+        difficulty_penalty = np.divide(
+            difficulty_work, raw, out=np.ones_like(raw), where=raw > 0
+        )
+        share_rate_penalty = np.divide(
+            terms["effective_work"],
+            difficulty_work,
+            out=np.ones_like(raw),
+            where=difficulty_work > 0,
+        )
+        scores = [round(score, self.ndigits) for score in terms["score"].tolist()]
+        # Competition ranking: ties share the best rank
+        ordered = sorted(scores, reverse=True)
+        first_rank = {}
+        for position, score in enumerate(ordered, start=1):
+            first_rank.setdefault(score, position)
+        columns = {
+            "effective_work": terms["effective_work"].tolist(),
+            "difficulty_penalty": difficulty_penalty.tolist(),
+            "share_rate_penalty": share_rate_penalty.tolist(),
+            "avg_uptime": terms["avg_uptime"].tolist(),
+            "uptime_factor": terms["uptime_factor"].tolist(),
+            "normalized_work": terms["normalized_work"].tolist(),
+        }
+        return {
+            hotkey: {
+                **{name: values[h] for name, values in columns.items()},
+                "score": scores[h],
+                "rank": first_rank[scores[h]],
+            }
+            for h, hotkey in enumerate(hotkey_metrics.hotkeys)
+        }
@@ -1,5 +1,8 @@
 import asyncio
+import hashlib
 import json
+from typing import NamedTuple
+
 from fiber import Keypair, SubstrateInterface
 from fiber.chain import weights
 from fiber.utils import get_logger
@@ -21,12 +24,103 @@ from .utils import get_nodes_for_netuid_cached
 logger = get_logger(__name__)
 
 
+U16_MAX = 65535
+
+
+class WeightVector(NamedTuple):
+    """Weights for every node of the metagraph, in node order."""
+
+    node_ids: list[int]
+    node_weights: list[float]
+    metagraph_version: str
+
+    def quantized(self) -> dict[int, int]:
+        """
+        uid -> u16 weight as the chain stores it: scaled so the largest is
+        U16_MAX and rounded, zero weights left out (as fiber submits them).
+        """
+        top = max(self.node_weights, default=0)
+        if top <= 0:
+            return {}
+        scale = U16_MAX / top
+        return {
+            node_id: round(weight * scale)
+            for node_id, weight in zip(self.node_ids, self.node_weights)
+            if weight > 0
+        }
+
+
+def metagraph_version(nodes) -> str:
+    """Fingerprint of the uid -> hotkey assignment of the metagraph."""
+    digest = hashlib.sha256()
+    for node in nodes:
+        digest.update(f"{node.node_id}:{node.hotkey}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def build_weight_vector(
+    hotkey_to_rating: dict[str, float], nodes
+) -> WeightVector:
+    return WeightVector(
+        [node.node_id for node in nodes],
+        [hotkey_to_rating.get(node.hotkey, 0) for node in nodes],
+        metagraph_version(nodes),
+    )
+
+
+def weights_change(previous: dict[int, int], current: dict[int, int]) -> float:
+    """
+    L1 distance between two quantized weight vectors normalized to sum to
+    1: 0 when identical, 2 when they share no uid.
+    """
+    previous_total = sum(previous.values()) or 1
+    current_total = sum(current.values()) or 1
+    return sum(
+        abs(
+            previous.get(uid, 0) / previous_total
+            - current.get(uid, 0) / current_total
+        )
+        for uid in previous.keys() | current.keys()
+    )
+
+
+def weights_decision(
+    vector: WeightVector,
+    last: tuple[dict[int, int], str] | None,
+    age: float,
+    min_change: float,
+    max_age: float,
+) -> tuple[str, float]:
+    """
+    Whether to submit `vector` given the last submitted (weights, metagraph
+    version) and its age in seconds. Returns the reason and the change:
+    "first", "metagraph", "max_age" and "changed" submit, "unchanged" skips.
+    """
+    current = vector.quantized()
+    if last is None:
+        return "first", weights_change({}, current)
+    previous, version = last
+    change = weights_change(previous, current)
+    if version != vector.metagraph_version:
+        return "metagraph", change
+    if age >= max_age:
+        return "max_age", change
+    if change >= min_change:
+        return "changed", change
+    return "unchanged", change
+
+
 def set_weights(
     hotkey_to_rating: dict[str, float],
     substrate: SubstrateInterface,
     keypair: Keypair,
     netuid: int,
+    vector: WeightVector | None = None,
 ) -> bool:
+    """
+    Submit ratings as node weights. `vector` is the weight vector already
+    built from them (see build_weight_vector), if the caller has one.
+    """
     if not hotkey_to_rating:
         logger.warning("No ratings provided, skipping weight set")
         return
@@ -47,15 +141,15 @@ def set_weights(
 
     logger.info(f"Validator node id: {validator_node_id}")
 
-    node_ids = [node.node_id for node in nodes]
-    node_weights = [hotkey_to_rating.get(node.hotkey, 0) for node in nodes]
+    if vector is None:
+        vector = build_weight_vector(hotkey_to_rating, nodes)
 
     try:
         return weights.set_node_weights(
             substrate=substrate,
             keypair=keypair,
-            node_ids=node_ids,
-            node_weights=node_weights,
+            node_ids=vector.node_ids,
+            node_weights=vector.node_weights,
             netuid=netuid,
             validator_node_id=validator_node_id,
             version_key=__spec_version__,
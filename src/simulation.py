@@ -0,0 +1,309 @@
+# simulation.py
+# Offline evaluation of RatingCalculator parameters over recorded or
+# synthetic miner populations (see scripts/sweep_ratings.py)
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from .metrics import METRICS_COLUMNS, HotkeyMetricsBatch, MinerMetricsBatch
+from .rating import RatingCalculator
+
+# Hashes behind one share of difficulty 1
+HASHES_PER_SHARE = 2**32
+
+
+@dataclass(frozen=True)
+class RatingParams:
+    uptime_alpha: float
+    max_difficulty: float
+    shares_per_minute: int
+    window: timedelta
+
+    def calculator(self) -> RatingCalculator:
+        return RatingCalculator(
+            self.uptime_alpha,
+            self.window,
+            max_difficulty=self.max_difficulty,
+            shares_per_minute=self.shares_per_minute,
+        )
+
+
+def parameter_grid(
+    uptime_alpha: Sequence[float],
+    max_difficulty: Sequence[float],
+    shares_per_minute: Sequence[int],
+    window: Sequence[timedelta],
+) -> List[RatingParams]:
+    return [
+        RatingParams(*values)
+        for values in itertools.product(
+            uptime_alpha, max_difficulty, shares_per_minute, window
+        )
+    ]
+
+
+def _regroup(
+    hotkeys: List[str],
+    groups: np.ndarray,
+    workers: List[str],
+    columns: Dict[str, np.ndarray],
+) -> HotkeyMetricsBatch:
+    """Build a HotkeyMetricsBatch from rows tagged with their hotkey index."""
+    order = np.argsort(groups, kind="stable")
+    counts = np.bincount(groups, minlength=len(hotkeys))
+    offsets = np.zeros(len(hotkeys) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    metrics = MinerMetricsBatch(
+        [""] * len(order),
+        [workers[i] for i in order.tolist()],
+        **{name: column[order] for name, column in columns.items()},
+    )
+    return HotkeyMetricsBatch(hotkeys, offsets, metrics)
+
+
+def synthetic_population(
+    hotkeys: int = 256,
+    max_workers: int = 30,
+    window: timedelta = timedelta(hours=1),
+    seed: int = 0,
+) -> HotkeyMetricsBatch:
+    """
+    Random miner population: a skewed number of workers per hotkey,
+    log-normal hashrates (median 1 TH/s), mostly high uptime, and a
+    difficulty per worker as a vardiff pool assigns it (about 10 shares a
+    minute, so the fastest rigs exceed the default max_difficulty).
+    """
+    rng = np.random.default_rng(seed)
+    window_seconds = window.total_seconds()
+    per_hotkey = np.minimum(rng.geometric(0.15, hotkeys), max_workers)
+    groups = np.repeat(np.arange(hotkeys), per_hotkey)
+    n = len(groups)
+    hashrate = rng.lognormal(np.log(1e12), 1.2, n)
+    uptime_seconds = window_seconds * rng.beta(5.0, 1.0, n)
+    difficulty = np.maximum(1.0, hashrate * 60 / (10 * HASHES_PER_SHARE))
+    expected_shares = hashrate * uptime_seconds / (difficulty * HASHES_PER_SHARE)
+    valid_shares = rng.poisson(expected_shares)
+    hotkey_names = [f"hotkey{h}" for h in range(hotkeys)]
+    return _regroup(
+        hotkey_names,
+        groups,
+        [f"worker{i}_{hotkey_names[h]}" for i, h in enumerate(groups.tolist())],
+        {
+            "uptime": (uptime_seconds > 0).astype(np.float64),
+            "valid_shares": valid_shares.astype(np.int64),
+            "invalid_shares": np.zeros(n, dtype=np.int64),
+            "total_difficulty": valid_shares * difficulty,
+            "difficulty": difficulty,
+            "hashrate": hashrate,
+            "uptime_seconds": uptime_seconds,
+        },
+    )
+
+
+def _rows(batch: HotkeyMetricsBatch):
+    groups = batch.group_ids()
+    columns = {
+        name: np.asarray(getattr(batch.metrics, name)).copy()
+        for name in METRICS_COLUMNS
+    }
+    return groups, list(batch.metrics.workers), columns
+
+
+def apply_strategy(
+    batch: HotkeyMetricsBatch,
+    targets: np.ndarray,
+    strategy: str,
+    max_workers: int = 30,
+) -> HotkeyMetricsBatch:
+    """
+    The population with the `targets` hotkeys gaming the rating, without
+    any extra hashrate:
+
+    - uptime_padding: register idle always-on workers (up to max_workers)
+      to raise the per-worker average uptime
+    - difficulty_inflation: report 4x difficulty on a quarter of the shares
+    - share_splitting: submit 4x the shares at a quarter of the difficulty
+    """
+    groups, workers, columns = _rows(batch)
+    rows = np.isin(groups, targets)
+    if strategy == "difficulty_inflation":
+        columns["difficulty"][rows] *= 4
+        columns["valid_shares"][rows] //= 4
+    elif strategy == "share_splitting":
+        columns["difficulty"][rows] /= 4
+        columns["valid_shares"][rows] *= 4
+    elif strategy == "uptime_padding":
+        counts = np.diff(batch.offsets)
+        extra = np.minimum(counts[targets], max_workers - counts[targets])
+        pad_groups = np.repeat(targets, np.maximum(extra, 0))
+        # Up for the whole window, whichever window is being evaluated
+        # (RatingCalculator clamps uptime_seconds to it)
+        pad = {"uptime": 1.0, "uptime_seconds": np.inf}
+        groups = np.concatenate([groups, pad_groups])
+        workers = workers + [f"idle{i}" for i in range(len(pad_groups))]
+        columns = {
+            name: np.concatenate(
+                [column, np.full(len(pad_groups), pad.get(name, 0), column.dtype)]
+            )
+            for name, column in columns.items()
+        }
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    columns["total_difficulty"] = columns["valid_shares"] * columns["difficulty"]
+    return _regroup(batch.hotkeys, groups, workers, columns)
+
+
+STRATEGIES = ("uptime_padding", "difficulty_inflation", "share_splitting")
+
+
+def weight_shares(
+    calculator: RatingCalculator, batch: HotkeyMetricsBatch
+) -> np.ndarray:
+    """Normalized weights per hotkey, as set_weights submits them."""
+    ratings = calculator.rate_batch(batch)
+    weights = np.fromiter(
+        (ratings[hotkey] for hotkey in batch.hotkeys),
+        dtype=np.float64,
+        count=len(batch.hotkeys),
+    )
+    total = weights.sum()
+    return weights / total if total > 0 else weights
+
+
+def gini(weights: np.ndarray) -> float:
+    """0 when every hotkey has the same weight, towards 1 when one has all."""
+    if len(weights) == 0 or weights.sum() == 0:
+        return 0.0
+    w = np.sort(weights)
+    n = len(w)
+    cumulative = np.cumsum(w)
+    return float((n + 1 - 2 * (cumulative / cumulative[-1]).sum()) / n)
+
+
+def concentration(weights: np.ndarray) -> Dict[str, float]:
+    """Gini, Herfindahl-Hirschman index, top-10% share and Nakamoto coefficient."""
+    ordered = np.sort(weights)[::-1]
+    top = max(1, len(ordered) // 10)
+    cumulative = np.cumsum(ordered)
+    return {
+        "gini": gini(weights),
+        "hhi": float((weights**2).sum()),
+        "top10_share": float(ordered[:top].sum()),
+        # Fewest hotkeys holding more than half of the weight
+        "nakamoto": int(np.searchsorted(cumulative, 0.5, side="right") + 1)
+        if len(ordered)
+        else 0,
+    }
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[np.argsort(values, kind="stable")] = np.arange(len(values))
+    return ranks
+
+
+def rank_correlation(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman correlation of two weight vectors (ties broken by order)."""
+    if len(a) < 2:
+        return 1.0
+    ra, rb = _ranks(a), _ranks(b)
+    if ra.std() == 0 or rb.std() == 0:
+        return 1.0
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def gaming_targets(batch: HotkeyMetricsBatch, count: int = 16) -> np.ndarray:
+    """
+    The `count` hotkeys whose work (valid shares) sits closest to the median
+    of the hotkeys with any work: the miners most likely to game.
+    """
+    work = np.bincount(
+        batch.group_ids(),
+        weights=batch.metrics.valid_shares.astype(np.float64),
+        minlength=len(batch.hotkeys),
+    )
+    active = np.flatnonzero(work > 0)
+    count = min(count, len(active))
+    if count == 0:
+        return active[:0]
+    ranked = active[np.argsort(work[active], kind="stable")]
+    start = (len(ranked) - count) // 2
+    return np.sort(ranked[start : start + count])
+
+
+# Per-process state for sweep workers, set once by _init_worker
+_state: dict = {}
+
+
+def _init_worker(batch, gamed, targets, baseline) -> None:
+    _state.update(batch=batch, gamed=gamed, targets=targets, baseline=baseline)
+
+
+def evaluate(params: RatingParams) -> dict:
+    """Weight distribution and gaming gains for one parameter set."""
+    calculator = params.calculator()
+    batch, targets = _state["batch"], _state["targets"]
+    weights = weight_shares(calculator, batch)
+    baseline = _state["baseline"]
+    result = {
+        **asdict(params),
+        "window": params.window.total_seconds() / 60,
+        **concentration(weights),
+        # Total variation distance to the configured parameters' weights
+        "shift": float(0.5 * np.abs(weights - baseline).sum())
+        if baseline is not None
+        else 0.0,
+        "rank_corr": rank_correlation(weights, baseline)
+        if baseline is not None
+        else 1.0,
+    }
+    honest = weights[targets].sum()
+    for strategy, gamed in _state["gamed"].items():
+        # Weight the gaming hotkeys end up with relative to playing fair;
+        # above 1 means the strategy pays under these parameters
+        gamed_weight = weight_shares(calculator, gamed)[targets].sum()
+        result[f"gain_{strategy}"] = (
+            float(gamed_weight / honest) if honest > 0 else 0.0
+        )
+    return result
+
+
+def sweep(
+    batch: HotkeyMetricsBatch,
+    grid: Iterable[RatingParams],
+    baseline: RatingParams,
+    strategies: Sequence[str] = STRATEGIES,
+    max_workers: int = 30,
+    jobs: int | None = None,
+    targets: np.ndarray | None = None,
+) -> List[dict]:
+    """
+    Evaluate every parameter set of `grid` over `batch` in a process pool.
+    The population and its gamed variants are sent to each worker once.
+    """
+    grid = list(grid)
+    if targets is None:
+        targets = gaming_targets(batch)
+    gamed = {
+        strategy: apply_strategy(batch, targets, strategy, max_workers)
+        for strategy in strategies
+    }
+    baseline_weights = weight_shares(baseline.calculator(), batch)
+    initargs = (batch, gamed, targets, baseline_weights)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(grid) == 1:
+        _init_worker(*initargs)
+        return [evaluate(params) for params in grid]
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(grid)),
+        initializer=_init_worker,
+        initargs=initargs,
+    ) as pool:
+        chunksize = max(1, len(grid) // (4 * jobs))
+        return list(pool.map(evaluate, grid, chunksize=chunksize))
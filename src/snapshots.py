@@ -0,0 +1,220 @@
+# snapshots.py
+# Columnar on-disk snapshots of fetched miner metrics
+
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from fiber.utils import get_logger
+
+from .metrics import (
+    METRICS_COLUMNS,
+    MinerKey,
+    MinerMetrics,
+    MinerMetricsBatch,
+)
+
+
+logger = get_logger(__name__)
+
+SNAPSHOT_PREFIX = "metrics-"
+
+# Numeric MinerMetrics fields are stored as one .npy file each
+SNAPSHOT_COLUMNS = METRICS_COLUMNS
+
+# Temporary snapshot directories older than this were left by a crashed writer
+STALE_TMP_AGE = timedelta(minutes=10).total_seconds()
+
+
+@dataclass
+class MetricsSnapshot:
+    """
+    A metrics snapshot loaded from disk.
+
+    Wallets are interned: `wallets` holds each distinct wallet once and
+    `wallet_idx` points into it per row. Columns are memory-mapped when the
+    snapshot is loaded with mmap=True, so rows are only paged in when read.
+    """
+
+    timestamp: float
+    wallets: np.ndarray
+    wallet_idx: np.ndarray
+    workers: np.ndarray
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.workers)
+
+    def to_batch(self) -> MinerMetricsBatch:
+        wallets = [w.decode() for w in self.wallets.tolist()]
+        return MinerMetricsBatch(
+            [wallets[i] for i in self.wallet_idx.tolist()],
+            [w.decode() for w in self.workers.tolist()],
+            **self.columns,
+        )
+
+    def to_metrics(self) -> Dict[MinerKey, MinerMetrics]:
+        return self.to_batch().to_metrics()
+
+
+class MetricsSnapshotStore:
+    """
+    Directory of metrics snapshots, one sub-directory per snapshot.
+
+    Each snapshot is written to a temporary directory and renamed into place,
+    so readers (including other processes) never see a partial snapshot.
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/snapshots",
+        retention: timedelta = timedelta(hours=24),
+        interval: timedelta = timedelta(minutes=15),
+    ):
+        self.directory = Path(directory)
+        self.retention = retention.total_seconds()
+        self.interval = interval.total_seconds()
+
+    def list(self) -> List[Tuple[float, Path]]:
+        """Return (timestamp, path) of stored snapshots, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        snapshots = []
+        for path in self.directory.iterdir():
+            if not path.name.startswith(SNAPSHOT_PREFIX):
+                continue
+            try:
+                ts_ms = int(path.name[len(SNAPSHOT_PREFIX) :])
+            except ValueError:
+                continue
+            snapshots.append((ts_ms / 1000, path))
+        return sorted(snapshots)
+
+    def save(
+        self,
+        metrics: MinerMetricsBatch,
+        timestamp: float | None = None,
+        force: bool = False,
+    ) -> Path | None:
+        """
+        Persist metrics as a snapshot and prune expired ones. Empty metrics
+        are not stored, and unless `force` is set nothing is written if the
+        latest snapshot is younger than the store interval. A forced
+        snapshot replaces the previous latest one when that was itself
+        taken within the interval, so publishing often keeps the history
+        at one snapshot per interval plus the newest.
+        """
+        if not metrics:
+            return None
+        timestamp = time.time() if timestamp is None else timestamp
+        existing = self.list()
+        if (
+            not force
+            and existing
+            and timestamp - existing[-1][0] < self.interval
+        ):
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{SNAPSHOT_PREFIX}{int(timestamp * 1000)}"
+        tmp_path = self.directory / f".{name}.tmp"
+        path = self.directory / name
+
+        wallet_ids: Dict[str, int] = {}
+        wallet_idx = np.fromiter(
+            (
+                wallet_ids.setdefault(wallet, len(wallet_ids))
+                for wallet in metrics.wallets
+            ),
+            dtype=np.int32,
+            count=len(metrics),
+        )
+        workers = [worker.encode() for worker in metrics.workers]
+
+        try:
+            tmp_path.mkdir(exist_ok=True)
+            np.save(
+                tmp_path / "wallets.npy",
+                np.array([w.encode() for w in wallet_ids], dtype=np.bytes_),
+            )
+            np.save(tmp_path / "wallet_idx.npy", wallet_idx)
+            np.save(
+                tmp_path / "workers.npy", np.array(workers, dtype=np.bytes_)
+            )
+            for column in SNAPSHOT_COLUMNS:
+                np.save(tmp_path / f"{column}.npy", getattr(metrics, column))
+            os.replace(tmp_path, path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        if (
+            force
+            and len(existing) >= 2
+            and existing[-1][0] - existing[-2][0] < self.interval
+        ):
+            shutil.rmtree(existing[-1][1], ignore_errors=True)
+        self.prune(timestamp)
+        return path
+
+    def prune(self, now: float | None = None) -> int:
+        """
+        Delete snapshots older than the retention period, and temporary
+        directories a crashed writer left behind.
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        for path in self.directory.glob(f".{SNAPSHOT_PREFIX}*.tmp"):
+            try:
+                ts_ms = int(path.name[len(SNAPSHOT_PREFIX) + 1 : -len(".tmp")])
+            except ValueError:
+                continue
+            # Younger ones may still be written by another process
+            if now - ts_ms / 1000 > STALE_TMP_AGE:
+                shutil.rmtree(path, ignore_errors=True)
+        for timestamp, path in self.list():
+            if now - timestamp <= self.retention:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        return removed
+
+    def load(self, path: Path, mmap: bool = True) -> MetricsSnapshot:
+        mmap_mode = "r" if mmap else None
+        ts_ms = int(path.name[len(SNAPSHOT_PREFIX) :])
+        return MetricsSnapshot(
+            timestamp=ts_ms / 1000,
+            wallets=np.load(path / "wallets.npy"),
+            wallet_idx=np.load(path / "wallet_idx.npy", mmap_mode=mmap_mode),
+            workers=np.load(path / "workers.npy", mmap_mode=mmap_mode),
+            columns={
+                column: np.load(path / f"{column}.npy", mmap_mode=mmap_mode)
+                for column in SNAPSHOT_COLUMNS
+            },
+        )
+
+    def load_latest(self, mmap: bool = True) -> MetricsSnapshot | None:
+        snapshots = self.list()
+        if not snapshots:
+            return None
+        return self.load(snapshots[-1][1], mmap=mmap)
+
+    def iter_snapshots(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        mmap: bool = True,
+    ) -> Iterator[MetricsSnapshot]:
+        """Yield stored snapshots in time order, optionally within [since, until]."""
+        for timestamp, path in self.list():
+            if since is not None and timestamp < since:
+                continue
+            if until is not None and timestamp > until:
+                break
+            try:
+                yield self.load(path, mmap=mmap)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable snapshot {path}: {e}")
@@ -2,29 +2,46 @@ import asyncio
 import time
 import aiohttp
 import json
+from typing import Callable
 
 from fiber import Keypair, SubstrateInterface
 
 from src.constants import MIN_WEIGHTED_STAKE
 
-from .set_weights import set_weights
+from .instrumentation import (
+    OPERATION_SECONDS,
+    SET_WEIGHTS,
+    SYNC_CHANGES,
+    WEIGHTS_AGE,
+    WEIGHTS_CHANGE,
+    WEIGHTS_DECISIONS,
+    observe,
+    timed,
+)
+from .set_weights import build_weight_vector, set_weights, weights_decision
 
 from .config import ValidatorSettings
 from .validator import Validator
 from fiber.utils import get_logger
 
 from .interfaces.database import (
+    CHANGE_UNBIND,
     DynamicConfigService,
     DatabaseService,
-    HotkeyWorker,
 )
 from .utils import (
+    get_nodes_for_netuid_cached,
     get_stake_weights,
     verify_signature,
     fix_node_ip,
     is_hashtensor_validator,
-    fetch_hotkey_workers_from_validator,
+    iter_changes_from_validator,
+    iter_hotkey_workers_from_validator,
+    EndpointNotServed,
+    fetch_merkle_nodes,
+    iter_merkle_bucket_rows,
 )
+from .merkle import MERKLE_MAX_PREFIXES, MerkleTree, diverging_buckets
 
 logger = get_logger(__name__)
 
@@ -35,31 +52,320 @@ async def set_weights_task(
     validator: Validator,
     substrate: SubstrateInterface,
     keypair: Keypair,
+    is_leader: Callable[[], bool] | None = None,
 ):
     interval = config.set_weights_interval.total_seconds()
     last_set = dynamic_config_service.get_last_set_weights_time()
+    # Weights are evaluated once per interval, submitted or not
+    last_check = max(
+        last_set, dynamic_config_service.get_last_weights_check_time()
+    )
     now = time.time()
-    if now - last_set < interval:
+    if now - last_check < interval:
         logger.debug(
-            f"Not setting weights because it was set less than {interval} seconds ago"
+            f"Not setting weights because they were checked less than {interval} seconds ago"
         )
         return
 
-    logger.info(f"Setting weights for {config.netuid}")
     # Compute ratings and set weights
-    ratings = await validator.compute_ratings()
-    success = set_weights(
-        substrate=substrate,
-        keypair=keypair,
-        netuid=config.netuid,
-        hotkey_to_rating=ratings,
-    )
+    with observe("set_weights"):
+        ratings = await validator.compute_ratings()
+        nodes = get_nodes_for_netuid_cached(substrate, config.netuid)
+        vector = build_weight_vector(ratings, nodes)
+        reason, change = weights_decision(
+            vector,
+            dynamic_config_service.get_last_weights(),
+            now - last_set,
+            config.set_weights_min_change,
+            config.set_weights_max_age.total_seconds(),
+        )
+        WEIGHTS_DECISIONS.labels(reason).inc()
+        WEIGHTS_CHANGE.set(change)
+        WEIGHTS_AGE.set(now - last_set)
+        if reason == "unchanged":
+            SET_WEIGHTS.labels("skipped").inc()
+            dynamic_config_service.set_last_weights_check_time(now)
+            logger.info(
+                f"Not setting weights: changed by {change:.4f} "
+                f"(< {config.set_weights_min_change}) since the last submission"
+            )
+            return
+        # Leadership may have moved while ratings were computed; the task
+        # runs in its own thread, so cancelling the loop does not stop it
+        if is_leader is not None and not is_leader():
+            logger.warning("Not setting weights: this process is no longer the leader")
+            return
+        logger.info(
+            f"Setting weights for {config.netuid} ({reason}, change {change:.4f})"
+        )
+        success = set_weights(
+            substrate=substrate,
+            keypair=keypair,
+            netuid=config.netuid,
+            hotkey_to_rating=ratings,
+            vector=vector,
+        )
     if success:
+        SET_WEIGHTS.labels("success").inc()
         dynamic_config_service.set_last_set_weights_time(now)
+        dynamic_config_service.set_last_weights(
+            vector.quantized(), vector.metagraph_version
+        )
     else:
+        SET_WEIGHTS.labels("failure").inc()
         logger.error("Failed to set weights")
 
 
+# Binds/unbinds applied per transaction while ingesting a peer's changes
+INGEST_BATCH_SIZE = 500
+
+
+def registration_json(worker_obj: dict) -> str:
+    """The payload a miner signs on /register (sorted-key JSON)."""
+    reg_dict = {
+        "hotkey": worker_obj["hotkey"],
+        "worker": worker_obj["worker"],
+        "registration_time": worker_obj["registration_time"],
+    }
+    return json.dumps(reg_dict, sort_keys=True, separators=(",", ":"))
+
+
+class RemoteChanges:
+    """
+    Registrations and unbinds received from another validator, verified and
+    applied in batches. Pending binds are always stored before pending
+    unbinds, so a worker bound and unbound within one batch ends up unbound.
+    """
+
+    def __init__(
+        self, db_service: DatabaseService, batch_size: int = INGEST_BATCH_SIZE
+    ):
+        self.db_service = db_service
+        self.batch_size = batch_size
+        self._binds: list[dict] = []
+        self._unbinds: list[tuple[str, str, str]] = []
+        self.added = 0
+        self.unbound = 0
+        self.skipped = 0
+        self.failed = 0
+
+    async def bind(self, worker_obj: dict) -> None:
+        worker = worker_obj["worker"]
+        worker_hotkey = worker_obj["hotkey"]
+        # Security check: worker name must contain the hotkey
+        if worker_hotkey not in worker:
+            logger.warning(
+                f"Worker name {worker} does not contain hotkey {worker_hotkey} - skipping for security"
+            )
+            self.failed += 1
+            return
+        self._binds.append(worker_obj)
+        if len(self._binds) >= self.batch_size:
+            await self.flush()
+
+    async def unbind(self, hotkey: str, worker: str, unbind_signature: str) -> None:
+        if not verify_unbind(hotkey, worker, unbind_signature):
+            logger.warning(f"Unbind signature verification failed for worker {worker}")
+            self.failed += 1
+            return
+        self._unbinds.append((hotkey, worker, unbind_signature))
+        if len(self._unbinds) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        binds, self._binds = self._binds, []
+        if binds:
+            await self._store_binds(binds)
+        unbinds, self._unbinds = self._unbinds, []
+        if unbinds:
+            self.unbound += await self.db_service.mark_workers_unbound(unbinds)
+
+    async def _store_binds(self, binds: list[dict]) -> None:
+        # Known workers are skipped before paying for signature checks
+        existing = self.db_service.existing_workers(
+            [worker_obj["worker"] for worker_obj in binds]
+        )
+        registrations = []
+        for worker_obj in binds:
+            if worker_obj["worker"] in existing:
+                self.skipped += 1
+                continue
+            if not verify_signature(
+                worker_obj["hotkey"],
+                registration_json(worker_obj),
+                worker_obj["signature"],
+            ):
+                logger.warning(
+                    f"Signature verification failed for worker {worker_obj['worker']}"
+                )
+                self.failed += 1
+                continue
+            registrations.append(
+                (
+                    worker_obj["hotkey"],
+                    worker_obj["worker"],
+                    worker_obj["signature"],
+                    worker_obj["registration_time"],
+                )
+            )
+        if not registrations:
+            return
+        try:
+            errors = await self.db_service.add_mappings(registrations)
+        except Exception as e:
+            self.db_service.session.rollback()
+            logger.error(f"Failed to add {len(registrations)} workers: {e}")
+            self.failed += len(registrations)
+            return
+        for (_, worker, _, _), error in zip(registrations, errors):
+            if error is None:
+                logger.info(f"Added worker {worker} from remote validator API")
+                self.added += 1
+            elif error == "Worker already registered":
+                self.skipped += 1
+            else:
+                logger.error(f"Failed to add worker {worker}: {error}")
+                self.failed += 1
+
+
+def verify_unbind(hotkey: str, worker: str, unbind_signature: str) -> bool:
+    """Check an unbind signature the way /unbind does (sorted-key JSON)."""
+    req_json = json.dumps(
+        {"hotkey": hotkey, "worker": worker}, sort_keys=True, separators=(",", ":")
+    )
+    return verify_signature(hotkey, req_json, unbind_signature)
+
+
+async def reconcile_with_validator(
+    session: aiohttp.ClientSession,
+    db_service: DatabaseService,
+    ip: str,
+    port: int,
+    local_tree: MerkleTree,
+) -> tuple[int, int, int, int]:
+    """
+    Compare Merkle trees with a validator and fetch the buckets that differ.
+
+    Starting from the root, only children whose hashes differ are described
+    further, so an in-sync peer costs a single request and the transfer grows
+    with the divergence rather than the table size. Returns (added, unbound,
+    skipped, failed) counts.
+    """
+    level, buckets = [""], []
+    while level:
+        next_level = []
+        for i in range(0, len(level), MERKLE_MAX_PREFIXES):
+            nodes = await fetch_merkle_nodes(
+                session, ip, port, level[i : i + MERKLE_MAX_PREFIXES]
+            )
+            if nodes is None:
+                # Peer runs a version without Merkle endpoints or is down
+                logger.warning(
+                    f"[sync_hotkey_workers_task] {ip}:{port} did not describe its Merkle tree; "
+                    "skipping reconciliation"
+                )
+                return 0, 0, 0, 0
+            descend, download = diverging_buckets(local_tree, nodes)
+            next_level.extend(descend)
+            buckets.extend(download)
+        level = next_level
+
+    changes = RemoteChanges(db_service)
+    for i in range(0, len(buckets), MERKLE_MAX_PREFIXES):
+        async for worker_obj in iter_merkle_bucket_rows(
+            session, ip, port, buckets[i : i + MERKLE_MAX_PREFIXES]
+        ):
+            await changes.bind(worker_obj)
+            if worker_obj.get("unbind_signature"):
+                await changes.unbind(
+                    worker_obj["hotkey"],
+                    worker_obj["worker"],
+                    worker_obj["unbind_signature"],
+                )
+    await changes.flush()
+    if buckets:
+        logger.info(
+            f"[sync_hotkey_workers_task] Reconciled {len(buckets)} buckets with {ip}:{port}: "
+            f"Added: {changes.added}, Unbound: {changes.unbound}, Skipped: {changes.skipped}, Failed: {changes.failed}"
+        )
+    return changes.added, changes.unbound, changes.skipped, changes.failed
+
+
+async def sync_changes_from_validator(
+    session: aiohttp.ClientSession,
+    db_service: DatabaseService,
+    ip: str,
+    port: int,
+    hotkey: str,
+    changes: RemoteChanges,
+) -> int:
+    """
+    Apply a validator's change feed since the last entry synced from it and
+    return the number of entries fetched. Peers running a version without
+    /changes are followed by registration time on /hotkey_workers instead,
+    which carries binds only.
+    """
+    last_seq = await db_service.get_validator_change_seq(hotkey)
+    max_seq = last_seq
+    logger.debug(f"[sync_hotkey_workers_task] Streaming changes from {hotkey} since seq {last_seq}")
+
+    # Process changes as they arrive, applying them in batches
+    fetched = 0
+    try:
+        async for change in iter_changes_from_validator(
+            session, ip, port, last_seq
+        ):
+            fetched += 1
+            max_seq = max(max_seq, change["seq"])
+            if change["kind"] == CHANGE_UNBIND:
+                await changes.unbind(
+                    change["hotkey"], change["worker"], change["signature"]
+                )
+            else:
+                await changes.bind(change)
+    except EndpointNotServed:
+        logger.warning(
+            f"[sync_hotkey_workers_task] {hotkey} at {ip}:{port} does not serve /changes; "
+            "syncing registrations by time (unbinds are not propagated)"
+        )
+        return await sync_registrations_from_validator(
+            session, db_service, ip, port, hotkey, changes
+        )
+    await changes.flush()
+    if fetched:
+        # The feed is strictly ordered, so the offset always moves to the
+        # last entry seen; rejected rows are left to reconciliation
+        await db_service.update_validator_change_seq(hotkey, max_seq)
+    return fetched
+
+
+async def sync_registrations_from_validator(
+    session: aiohttp.ClientSession,
+    db_service: DatabaseService,
+    ip: str,
+    port: int,
+    hotkey: str,
+    changes: RemoteChanges,
+) -> int:
+    """Apply registrations newer than the last one synced from a validator."""
+    last_registration_time = await db_service.get_validator_sync_offset(hotkey)
+    max_registration_time = last_registration_time
+    fetched = 0
+    async for worker_obj in iter_hotkey_workers_from_validator(
+        session, ip, port, last_registration_time
+    ):
+        fetched += 1
+        max_registration_time = max(
+            max_registration_time, worker_obj["registration_time"]
+        )
+        await changes.bind(worker_obj)
+    await changes.flush()
+    if max_registration_time > last_registration_time:
+        await db_service.update_validator_sync_offset(hotkey, max_registration_time)
+    return fetched
+
+
+@timed("sync_hotkey_workers")
 async def sync_hotkey_workers_task(
     db_service: DatabaseService,
     config: ValidatorSettings,
@@ -105,105 +411,59 @@ async def sync_hotkey_workers_task(
     total_added = 0
     total_skipped = 0
     total_failed = 0
-    
+    total_unbound = 0
+
+    local_tree: MerkleTree | None = None
     async with aiohttp.ClientSession() as session:
         for ip, port, hotkey in filtered_endpoints:
             logger.info(f"[sync_hotkey_workers_task] Syncing validator {hotkey} at {ip}:{port}")
-            
-            # Get the last registration time synced for this validator
-            last_registration_time = await db_service.get_validator_sync_offset(hotkey)
-            latest_registration_time = last_registration_time
-            
-            logger.debug(f"[sync_hotkey_workers_task] Fetching workers from {hotkey} since {last_registration_time}")
-            
-            workers = await fetch_hotkey_workers_from_validator(
-                session, ip, port, last_registration_time
+            peer_start = time.perf_counter()
+
+            changes = RemoteChanges(db_service)
+            fetched = await sync_changes_from_validator(
+                session, db_service, ip, port, hotkey, changes
             )
-            
-            if not workers:
-                logger.debug(f"[sync_hotkey_workers_task] No new workers from {hotkey}")
-                continue
-            
-            logger.info(f"[sync_hotkey_workers_task] Fetched {len(workers)} workers from {hotkey}")
-            
-            # Process workers
-            page_added = 0
-            page_skipped = 0
-            page_failed = 0
-            max_registration_time = latest_registration_time
-            
-            for worker_obj in workers:
-                worker = worker_obj["worker"]
-                worker_hotkey = worker_obj["hotkey"]
-                registration_time = worker_obj["registration_time"]
-                signature = worker_obj["signature"]
-                
-                # Track the max registration_time seen in this batch
-                if registration_time > max_registration_time:
-                    max_registration_time = registration_time
-                
-                # Security check: worker name must contain the hotkey
-                if worker_hotkey not in worker:
-                    logger.warning(
-                        f"Worker name {worker} does not contain hotkey {worker_hotkey} - skipping for security"
-                    )
-                    page_failed += 1
-                    continue
-                
-                # Update the latest registration time seen
-                if registration_time > latest_registration_time:
-                    latest_registration_time = registration_time
-
-                exists = db_service.session.query(
-                    db_service.session.query(HotkeyWorker)
-                    .filter_by(worker=worker)
-                    .exists()
-                ).scalar()
-                if exists:
-                    page_skipped += 1
-                    continue
-                    
-                reg_dict = {
-                    "hotkey": worker_hotkey,
-                    "worker": worker,
-                    "registration_time": registration_time,
-                }
-                reg_json = json.dumps(reg_dict, sort_keys=True, separators=(",", ":"))
-                if not verify_signature(worker_hotkey, reg_json, signature):
-                    logger.warning(
-                        f"Signature verification failed for worker {worker}"
-                    )
-                    page_failed += 1
-                    continue
-                    
-                try:
-                    await db_service.add_mapping(
-                        worker_hotkey, worker, signature, registration_time
-                    )
-                    logger.info(f"Added worker {worker} from remote validator API")
-                    page_added += 1
-                except Exception as e:
-                    logger.error(f"Failed to add worker {worker}: {e}")
-                    page_failed += 1
-            
+
+            page_added = changes.added
+            page_unbound = changes.unbound
+            page_skipped = changes.skipped
+            page_failed = changes.failed
             total_added += page_added
             total_skipped += page_skipped
             total_failed += page_failed
-            
-            # Update the last registration time for this validator
-            # If no workers were added but there were workers, update offset to max_registration_time
-            if page_added == 0 and workers:
-                if max_registration_time > last_registration_time:
-                    await db_service.update_validator_sync_offset(hotkey, max_registration_time)
-                    logger.info(f"[sync_hotkey_workers_task] Updated sync offset for {hotkey} to {max_registration_time} (all workers errored)")
-            elif latest_registration_time > last_registration_time:
-                await db_service.update_validator_sync_offset(hotkey, latest_registration_time)
-                logger.info(f"[sync_hotkey_workers_task] Updated sync offset for {hotkey} to {latest_registration_time}")
-            
-            logger.info(f"[sync_hotkey_workers_task] {hotkey}: Added: {page_added}, Skipped: {page_skipped}, Failed: {page_failed}")
-    
+            total_unbound += page_unbound
+
+            if not fetched:
+                logger.debug(f"[sync_hotkey_workers_task] No new changes from {hotkey}")
+            else:
+                logger.info(f"[sync_hotkey_workers_task] {hotkey}: Fetched: {fetched}, Added: {page_added}, Unbound: {page_unbound}, Skipped: {page_skipped}, Failed: {page_failed}")
+
+            # Anti-entropy: pick up rows the change feed missed (e.g. rejected
+            # while a hotkey was at its worker limit)
+            if local_tree is None or page_added or page_unbound:
+                local_tree = db_service.build_merkle_tree()
+            added, unbound, skipped, failed = await reconcile_with_validator(
+                session, db_service, ip, port, local_tree
+            )
+            if added or unbound:
+                local_tree = None
+            total_added += added
+            total_unbound += unbound
+            total_skipped += skipped
+            total_failed += failed
+            OPERATION_SECONDS.labels("sync_peer").observe(
+                time.perf_counter() - peer_start
+            )
+
+    for result, count in (
+        ("added", total_added),
+        ("unbound", total_unbound),
+        ("skipped", total_skipped),
+        ("failed", total_failed),
+    ):
+        SYNC_CHANGES.labels(result).inc(count)
     logger.info(
-        f"[sync_hotkey_workers_task] Done. Total Added: {total_added}, Total Skipped: {total_skipped}, Total Failed: {total_failed}"
+        f"[sync_hotkey_workers_task] Done. Total Added: {total_added}, Total Unbound: {total_unbound}, Total Skipped: {total_skipped}, Total Failed: {total_failed}"
     )
 
 # TODO: Add task to clean up workers that are unbound (optional cleanup task)
\ No newline at end of file
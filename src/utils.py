@@ -1,9 +1,11 @@
+import asyncio
+import os
 from fiber import SubstrateInterface
 from fiber.chain.fetch_nodes import get_nodes_for_netuid
 from fiber.chain import models
 import time
-from typing import Tuple, Optional
-from .constants import NETWORK_TO_NETUID, SECONDS_IN_BLOCK
+from typing import AsyncIterator, Tuple, Optional
+from .constants import NDJSON_MEDIA_TYPE, NETWORK_TO_NETUID, SECONDS_IN_BLOCK
 import struct
 import socket
 import aiohttp
@@ -44,6 +46,16 @@ def is_hotkey_registered(
     return False
 
 
+def registered_hotkeys(
+    substrate: SubstrateInterface, netuid: int, block: int | None = None
+) -> set[str]:
+    """Hotkeys of all nodes on the subnet (one metagraph lookup)."""
+    return {
+        node.hotkey
+        for node in get_nodes_for_netuid_cached(substrate, netuid, block)
+    }
+
+
 def verify_signature(hotkey: str, worker: str, signature: str) -> bool:
     from fiber import Keypair
 
@@ -54,6 +66,31 @@ def verify_signature(hotkey: str, worker: str, signature: str) -> bool:
         return False
 
 
+async def verify_signatures(
+    checks: list[tuple[str, str, str]], parallelism: int | None = None
+) -> list[bool]:
+    """
+    verify_signature over (hotkey, message, signature) triples, split into
+    `parallelism` chunks verified concurrently in worker threads so the
+    event loop is not blocked meanwhile.
+    """
+    if not checks:
+        return []
+    parallelism = parallelism or os.cpu_count() or 1
+    size = -(-len(checks) // parallelism)
+    chunks = [checks[i : i + size] for i in range(0, len(checks), size)]
+    verified = await asyncio.gather(
+        *[
+            asyncio.to_thread(
+                lambda chunk: [verify_signature(*check) for check in chunk],
+                chunk,
+            )
+            for chunk in chunks
+        ]
+    )
+    return [ok for chunk in verified for ok in chunk]
+
+
 def get_netuid(network: str) -> int:
     try:
         return NETWORK_TO_NETUID[network]
@@ -88,18 +125,115 @@ async def is_hashtensor_validator(ip, port):
         return False
 
 
-async def fetch_hotkey_workers_from_validator(session, ip, port, since_timestamp=0.0):
+async def iter_ndjson(resp) -> AsyncIterator[dict]:
+    """Parse a response body incrementally, one JSON object per line."""
+    if resp.content_type != NDJSON_MEDIA_TYPE:
+        # Peer without streaming support: plain JSON list
+        for row in await resp.json():
+            yield row
+        return
+    async for line in resp.content:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+async def iter_hotkey_workers_from_validator(
+    session, ip, port, since_timestamp=0.0
+) -> AsyncIterator[dict]:
+    """
+    Stream registrations newer than since_timestamp from a validator.
+    Stops quietly on errors; rows already yielded stay valid.
+    """
     url = f"http://{ip}:{port}/hotkey_workers"
     params = {
         "since_timestamp": since_timestamp
     }
+    headers = {"Accept": NDJSON_MEDIA_TYPE}
+    # No total timeout: a large stream may legitimately take a while
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
     try:
-        async with session.get(url, params=params, timeout=10) as resp:
+        async with session.get(
+            url, params=params, headers=headers, timeout=timeout
+        ) as resp:
             if resp.status != 200:
-                return []
-            return await resp.json()
+                return
+            async for row in iter_ndjson(resp):
+                yield row
     except Exception:
-        return []
+        return
+
+
+class EndpointNotServed(Exception):
+    """A validator answered 404/405: its version lacks the endpoint."""
+
+
+async def iter_changes_from_validator(
+    session, ip, port, since_seq=0
+) -> AsyncIterator[dict]:
+    """
+    Stream change feed entries (binds and unbinds) after since_seq from a
+    validator. Stops quietly on errors; entries already yielded stay valid.
+    Raises EndpointNotServed if the validator has no change feed.
+    """
+    url = f"http://{ip}:{port}/changes"
+    params = {"since_seq": since_seq}
+    headers = {"Accept": NDJSON_MEDIA_TYPE}
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+    try:
+        async with session.get(
+            url, params=params, headers=headers, timeout=timeout
+        ) as resp:
+            if resp.status in (404, 405):
+                raise EndpointNotServed(url)
+            if resp.status != 200:
+                return
+            async for row in iter_ndjson(resp):
+                yield row
+    except EndpointNotServed:
+        raise
+    except Exception:
+        return
+
+
+async def fetch_hotkey_workers_from_validator(session, ip, port, since_timestamp=0.0):
+    return [
+        row
+        async for row in iter_hotkey_workers_from_validator(
+            session, ip, port, since_timestamp
+        )
+    ]
+
+
+async def fetch_merkle_nodes(session, ip, port, prefixes) -> dict | None:
+    """Describe Merkle nodes of a validator; None if it does not serve them."""
+    url = f"http://{ip}:{port}/hotkey_workers/merkle"
+    params = [("prefix", prefix) for prefix in prefixes]
+    try:
+        async with session.get(url, params=params, timeout=30) as resp:
+            if resp.status != 200:
+                return None
+            return (await resp.json())["nodes"]
+    except Exception:
+        return None
+
+
+async def iter_merkle_bucket_rows(session, ip, port, prefixes) -> AsyncIterator[dict]:
+    """Stream the registrations in the given Merkle buckets of a validator."""
+    url = f"http://{ip}:{port}/hotkey_workers/buckets"
+    params = [("prefix", prefix) for prefix in prefixes]
+    headers = {"Accept": NDJSON_MEDIA_TYPE}
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+    try:
+        async with session.get(
+            url, params=params, headers=headers, timeout=timeout
+        ) as resp:
+            if resp.status != 200:
+                return
+            async for row in iter_ndjson(resp):
+                yield row
+    except Exception:
+        return
 
 
 def get_stake_weights(node: models.Node) -> float:
@@ -1,10 +1,18 @@
 # validator.py
 # Main validation logic for Bittensor subnet
 
-from .metrics import MetricsClient, MinerKey
+import numpy as np
+
+from .metrics import (
+    HotkeyMetricsBatch,
+    MetricsClient,
+    MinerMetricsBatch,
+)
 from .mapping import MappingManager
+from .metrics_index import HotkeyMetricsIndex
 from .rating import RatingCalculator
 from .config import ValidatorSettings
+from .instrumentation import observe
 from typing import Dict, List
 from src.metrics import MinerMetrics
 from collections import defaultdict
@@ -23,23 +31,113 @@ class Validator:
         self.rating_calculator = RatingCalculator(
             config.rating_weight, config.window, max_difficulty=config.max_difficulty
         )
+        # Index over the last (metrics, mapping) pair it was built from
+        self._metrics_index: HotkeyMetricsIndex | None = None
+        self._metrics_index_source: tuple | None = None
+        # explain_batch with the configured parameters over that index
+        self._explanation: tuple | None = None
 
     async def compute_ratings(self):
         """Fetch metrics, update mapping, compute ratings, and send to Bittensor."""
-        hotkey_metrics = await self.get_hotkey_metrics_map()
-        ratings = self.rating_calculator.rate_all(hotkey_metrics)
+        hotkey_metrics = await self.get_hotkey_metrics_batch()
+        with observe("rate"):
+            ratings = self.rating_calculator.rate_batch(hotkey_metrics)
         return ratings
 
-    async def get_hotkey_metrics_map(self) -> Dict[str, List[MinerMetrics]]:
-        """Load mapping and map metrics to hotkeys. Returns dict[hotkey, List[MinerMetrics]]."""
-        metrics = await self.metrics_client.fetch_metrics()
+    async def get_hotkey_metrics_batch(
+        self, max_age: float | None = None
+    ) -> HotkeyMetricsBatch:
+        """
+        Load mapping and group worker metrics by hotkey, column-wise.
+
+        With `max_age`, metrics fetched (or warm-started) within that many
+        seconds are reused instead of querying Prometheus again.
+        """
+        metrics, mapping = await self._load(max_age)
+        return self.map_batch_to_hotkeys(metrics, mapping)
+
+    async def get_metrics_index(self, max_age: float) -> HotkeyMetricsIndex:
+        """
+        Index over the cached metrics grouped by hotkey. It is rebuilt only
+        when the metrics snapshot or the mapping has been replaced.
+        """
+        metrics, mapping = await self._load(max_age)
+        source = self._metrics_index_source
+        if source is None or source[0] is not metrics or source[1] is not mapping:
+            with observe("build_metrics_index"):
+                self._metrics_index = HotkeyMetricsIndex(
+                    self.map_batch_to_hotkeys(metrics, mapping)
+                )
+            self._metrics_index_source = (metrics, mapping)
+        return self._metrics_index
+
+    async def explain_ratings(
+        self,
+        max_age: float,
+        uptime_alpha: float | None = None,
+        max_difficulty: float | None = None,
+        shares_per_minute: int | None = None,
+    ) -> tuple[RatingCalculator, Dict[str, Dict[str, float | int]]]:
+        """
+        Rating breakdown per hotkey over the cached metrics, and the
+        calculator that produced it. Overrides evaluate what the ratings
+        would be with other parameters; without them the result is cached
+        until the metrics index is rebuilt.
+        """
+        index = await self.get_metrics_index(max_age)
+        overrides = uptime_alpha, max_difficulty, shares_per_minute
+        if all(value is None for value in overrides):
+            if self._explanation is None or self._explanation[0] is not index:
+                with observe("explain_ratings"):
+                    explanation = self.rating_calculator.explain_batch(
+                        index.batch
+                    )
+                self._explanation = (index, explanation)
+            return self.rating_calculator, self._explanation[1]
+        calculator = self.rating_calculator.with_overrides(*overrides)
+        with observe("explain_ratings"):
+            return calculator, calculator.explain_batch(index.batch)
+
+    async def _load(
+        self, max_age: float | None
+    ) -> tuple[MinerMetricsBatch, Dict[str, str]]:
+        if max_age is None:
+            metrics = await self.metrics_client.fetch_metrics_batch()
+        else:
+            metrics = await self.metrics_client.get_cached_metrics(
+                max_age,
+                self.config.metrics_snapshot_max_age.total_seconds(),
+            )
         mapping = await self.mapping_manager.get_mapping()
-        hotkey_metrics: Dict[str, List[MinerMetrics]] = defaultdict(list)
+        return metrics, mapping
+
+    async def get_hotkey_metrics_map(
+        self, max_age: float | None = None
+    ) -> Dict[str, List[MinerMetrics]]:
+        """Load mapping and map metrics to hotkeys. Returns dict[hotkey, List[MinerMetrics]]."""
+        hotkey_metrics = await self.get_hotkey_metrics_batch(max_age)
+        return hotkey_metrics.to_hotkey_metrics()
+
+    def map_batch_to_hotkeys(
+        self, metrics: MinerMetricsBatch, mapping: Dict[str, str]
+    ) -> HotkeyMetricsBatch:
+        """Group worker rows by hotkey; mapped workers without data get zero rows."""
+        hotkey_workers: Dict[str, List[str]] = defaultdict(list)
         for worker, hotkey in mapping.items():
-            key = MinerKey(
-                wallet=self.config.kaspa_pool_owner_wallet, worker=worker
-            )
-            hotkey_metrics[hotkey].append(
-                metrics.get(key, MinerMetrics.default_instance(worker))
-            )
-        return dict(hotkey_metrics)
+            hotkey_workers[hotkey].append(worker)
+        wallet = self.config.kaspa_pool_owner_wallet
+        workers = [w for ws in hotkey_workers.values() for w in ws]
+        rows = np.fromiter(
+            (metrics.index(wallet, worker) for worker in workers),
+            dtype=np.int64,
+            count=len(workers),
+        )
+        offsets = np.zeros(len(hotkey_workers) + 1, dtype=np.int64)
+        np.cumsum(
+            [len(ws) for ws in hotkey_workers.values()], out=offsets[1:]
+        )
+        return HotkeyMetricsBatch(
+            list(hotkey_workers),
+            offsets,
+            metrics.take(rows, workers, wallet),
+        )
@@ -0,0 +1,73 @@
+# tests/test_accumulator.py
+
+from datetime import timedelta
+import pytest
+from src.accumulator import (
+    ACCUMULATED_COUNTERS,
+    BUCKET_SECONDS,
+    SCRAPE_DELAY,
+    MetricsAccumulator,
+)
+from src.metrics import MinerKey
+
+KEY1 = MinerKey(wallet="w1", worker="worker1")
+KEY2 = MinerKey(wallet="w1", worker="worker2")
+
+
+def counters_for(buckets: dict) -> list:
+    """Build per-counter range results from {ts: {key: (v, inv, diff, work)}}."""
+    result = [{} for _ in ACCUMULATED_COUNTERS]
+    for ts, per_key in buckets.items():
+        for key, values in per_key.items():
+            for i, value in enumerate(values):
+                result[i].setdefault(ts, {})[key] = value
+    return result
+
+
+def test_cold_start_requests_whole_horizon():
+    acc = MetricsAccumulator([timedelta(minutes=5), timedelta(hours=1)])
+    now = 10_000 * BUCKET_SECONDS + SCRAPE_DELAY
+    start, end = acc.pending_range(now)
+    assert end == 10_000 * BUCKET_SECONDS
+    assert end - start == 3600 - BUCKET_SECONDS
+
+
+def test_rolling_totals_per_window():
+    acc = MetricsAccumulator([timedelta(minutes=2), timedelta(minutes=5)])
+    base = 1_000 * BUCKET_SECONDS
+    buckets = {
+        base + i * BUCKET_SECONDS: {KEY1: (1, 0, 2.0, 60.0)} for i in range(5)
+    }
+    buckets[base + 4 * BUCKET_SECONDS][KEY2] = (3, 1, 6.0, 30.0)
+    end = base + 4 * BUCKET_SECONDS
+    acc.add_range(base, end, counters_for(buckets))
+
+    assert acc.totals(timedelta(minutes=5))[KEY1] == (5, 0, 10.0, 300.0)
+    assert acc.totals(timedelta(minutes=2))[KEY1] == (2, 0, 4.0, 120.0)
+    assert acc.totals(timedelta(minutes=2))[KEY2] == (3, 1, 6.0, 30.0)
+    assert acc.pending_range(end + SCRAPE_DELAY) is None
+
+    # Two quiet minutes later KEY2 leaves the short window entirely
+    later = end + 2 * BUCKET_SECONDS
+    assert acc.pending_range(later + SCRAPE_DELAY) == (
+        end + BUCKET_SECONDS,
+        later,
+    )
+    acc.add_range(end + BUCKET_SECONDS, later, counters_for({}))
+    assert KEY2 not in acc.totals(timedelta(minutes=2))
+    assert acc.totals(timedelta(minutes=5))[KEY1] == (3, 0, 6.0, 180.0)
+
+
+def test_duplicate_range_is_ignored():
+    acc = MetricsAccumulator([timedelta(minutes=5)])
+    base = 1_000 * BUCKET_SECONDS
+    counters = counters_for({base: {KEY1: (4, 0, 8.0, 60.0)}})
+    acc.add_range(base, base, counters)
+    acc.add_range(base, base, counters)
+    assert acc.totals(timedelta(minutes=5))[KEY1] == (4, 0, 8.0, 60.0)
+
+
+def test_unknown_window_rejected():
+    acc = MetricsAccumulator([timedelta(minutes=5)])
+    with pytest.raises(ValueError):
+        acc.totals(timedelta(minutes=10))
@@ -0,0 +1,167 @@
+# tests/test_changes.py
+
+import json
+import pytest
+from fastapi.testclient import TestClient
+from src import tasks
+from src.main import app
+from src.dependencies import get_database_service
+from src.interfaces.database import Base, DatabaseService
+from src.merkle import UNBOUND_MARKER, MerkleTree
+
+NDJSON = "application/x-ndjson"
+
+
+@pytest.fixture
+def client(db_service):
+    app.dependency_overrides[get_database_service] = lambda: db_service
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_change_feed_carries_binds_and_unbinds(client, db_service):
+    await db_service.add_mapping("hk1", "a_hk1", "sig_a", 2.0)
+    await db_service.add_mapping("hk1", "b_hk1", "sig_b", 1.0)
+    await db_service.mark_worker_unbound("hk1", "a_hk1", "unbind_a")
+
+    changes = client.get("/changes").json()
+    assert [(c["seq"], c["kind"], c["worker"]) for c in changes] == [
+        (1, "bind", "a_hk1"),
+        (2, "bind", "b_hk1"),
+        (3, "unbind", "a_hk1"),
+    ]
+    assert changes[2]["signature"] == "unbind_a"
+
+    resp = client.get(
+        "/changes", params={"since_seq": 1}, headers={"Accept": NDJSON}
+    )
+    assert resp.headers["content-type"].startswith(NDJSON)
+    assert [json.loads(line)["seq"] for line in resp.text.splitlines()] == [2, 3]
+    assert len(client.get("/changes", params={"limit": 1}).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_mark_workers_unbound_batch(db_service):
+    await db_service.add_mapping("hk1", "a_hk1", "sig", 1.0)
+    await db_service.add_mapping("hk1", "b_hk1", "sig", 2.0)
+    await db_service.add_mapping("hk2", "c_hk2", "sig", 3.0)
+    applied = await db_service.mark_workers_unbound(
+        [
+            ("hk1", "a_hk1", "u1"),
+            ("hk1", "a_hk1", "u1"),  # duplicate tombstone
+            ("hk1", "c_hk2", "u2"),  # foreign hotkey
+            ("hk1", "missing_hk1", "u3"),
+        ]
+    )
+    assert applied == 1
+    assert [row["worker"] for row in db_service.iter_active_mappings()] == [
+        "b_hk1",
+        "c_hk2",
+    ]
+    kinds = [c["kind"] for c in db_service.iter_changes()]
+    assert kinds == ["bind", "bind", "bind", "unbind"]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_applies_missed_unbinds(monkeypatch, db_service):
+    await db_service.add_mapping("hk1", "a_hk1", "sig", 1.0)
+    remote = MerkleTree([("a_hk1", "hk1", "sig", UNBOUND_MARKER)])
+    row = {
+        "worker": "a_hk1",
+        "hotkey": "hk1",
+        "registration_time": 1.0,
+        "signature": "sig",
+        "unbind_signature": "unbind",
+    }
+
+    async def fake_nodes(session, ip, port, prefixes):
+        return {p: remote.describe(p) for p in prefixes}
+
+    async def fake_rows(session, ip, port, prefixes):
+        yield row
+
+    monkeypatch.setattr(tasks, "fetch_merkle_nodes", fake_nodes)
+    monkeypatch.setattr(tasks, "iter_merkle_bucket_rows", fake_rows)
+    monkeypatch.setattr(tasks, "verify_signature", lambda *args: True)
+
+    result = await tasks.reconcile_with_validator(
+        None, db_service, "127.0.0.1", 8000, db_service.build_merkle_tree()
+    )
+    assert result == (0, 1, 1, 0)
+    assert db_service.build_merkle_tree().root == remote.root
+
+
+@pytest.mark.asyncio
+async def test_separate_unbinds_give_the_same_tree(db_url, tmp_path):
+    other = DatabaseService(f"sqlite:///{tmp_path}/other.db")
+    Base.metadata.create_all(other.engine)
+    for service, unbind_signature in ((DatabaseService(db_url), "u1"), (other, "u2")):
+        await service.add_mapping("hk1", "a_hk1", "sig", 1.0)
+        await service.mark_worker_unbound("hk1", "a_hk1", unbind_signature)
+    local = DatabaseService(db_url).build_merkle_tree()
+    assert local.root == other.build_merkle_tree().root
+
+
+@pytest.mark.asyncio
+async def test_sync_falls_back_to_registration_time(monkeypatch, db_service):
+    rows = [
+        {
+            "worker": f"w{i}_hk1",
+            "hotkey": "hk1",
+            "registration_time": float(i),
+            "signature": "sig",
+        }
+        for i in (1, 2)
+    ]
+    requested = []
+
+    async def no_feed(session, ip, port, since_seq):
+        raise tasks.EndpointNotServed(f"http://{ip}:{port}/changes")
+        yield
+
+    async def fake_workers(session, ip, port, since_timestamp):
+        requested.append(since_timestamp)
+        for row in rows:
+            yield row
+
+    monkeypatch.setattr(tasks, "iter_changes_from_validator", no_feed)
+    monkeypatch.setattr(tasks, "iter_hotkey_workers_from_validator", fake_workers)
+    monkeypatch.setattr(tasks, "verify_signature", lambda *args: True)
+
+    changes = tasks.RemoteChanges(db_service)
+    fetched = await tasks.sync_changes_from_validator(
+        None, db_service, "127.0.0.1", 8000, "peer", changes
+    )
+    assert (fetched, changes.added) == (2, 2)
+    assert await db_service.get_validator_sync_offset("peer") == 2.0
+    assert await db_service.get_validator_change_seq("peer") == 0
+    await tasks.sync_changes_from_validator(
+        None, db_service, "127.0.0.1", 8000, "peer", tasks.RemoteChanges(db_service)
+    )
+    assert requested == [0.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_add_mappings_reports_per_item(db_service):
+    db_service.max_workers = 2
+    await db_service.add_mapping("hk1", "a_hk1", "sig", 1.0)
+    results = await db_service.add_mappings(
+        [
+            ("hk1", "a_hk1", "sig", 2.0),  # already registered
+            ("hk1", "b_hk1", "sig", 2.0),
+            ("hk1", "c_hk1", "sig", 3.0),  # over the limit
+            ("hk2", "d_hk2", "sig", 4_000_000),  # int microseconds
+            ("hk2", "d_hk2", "sig", 4_000_000),  # duplicate in the batch
+        ]
+    )
+    assert results[0] == "Worker already registered"
+    assert results[1] is None
+    assert results[2].startswith("Maximum number of workers (2)")
+    assert results[3] is None
+    assert results[4] == "Worker already registered"
+    assert db_service.get_active_worker_count("hk1") == 2
+    assert db_service.get_active_worker_count("hk2") == 1
+    binds = [c for c in db_service.iter_changes() if c["kind"] == "bind"]
+    assert [c["worker"] for c in binds] == ["a_hk1", "b_hk1", "d_hk2"]
+    assert binds[-1]["registration_time"] == 4.0
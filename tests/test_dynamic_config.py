@@ -0,0 +1,48 @@
+# tests/test_dynamic_config.py
+
+from sqlalchemy import event
+from src.interfaces.database import Base, DynamicConfigService
+
+
+def count_statements(engine) -> list:
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_reads_are_served_from_memory(tmp_path):
+    service = DynamicConfigService(f"sqlite:///{tmp_path}/mapping.db")
+    Base.metadata.create_all(service.engine)
+    assert service.get_last_set_weights_time() == 0.0
+    service.set_last_set_weights_time(123.5)
+    assert service.get_last_set_weights_time() == 123.5
+
+    statements = count_statements(service.engine)
+    for _ in range(10):
+        assert service.get_last_set_weights_time() == 123.5
+    assert all(s == "PRAGMA data_version" for s in statements)
+
+
+def test_external_writes_are_picked_up(db_url):
+    service = DynamicConfigService(db_url)
+    service.set_last_set_weights_time(1.0)
+    assert service.get_last_set_weights_time() == 1.0
+
+    # e.g. a script editing dynamic_config through its own connection
+    DynamicConfigService(db_url).set_last_set_weights_time(2.0)
+    assert service.get_last_set_weights_time() == 2.0
+
+
+def test_last_weights_round_trip(db_url):
+    service = DynamicConfigService(db_url)
+    assert service.get_last_weights() is None
+    service.set_last_weights({3: 65535, 10: 1200}, "abc123")
+    assert service.get_last_weights() == ({3: 65535, 10: 1200}, "abc123")
+    assert DynamicConfigService(db_url).get_last_weights() == (
+        {3: 65535, 10: 1200},
+        "abc123",
+    )
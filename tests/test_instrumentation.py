@@ -0,0 +1,62 @@
+# tests/test_instrumentation.py
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from src.instrumentation import timed
+from src.main import app
+from src.mapping import MappingManager, MappingSource
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class StaticSource(MappingSource):
+    async def load_mapping(self):
+        return {"worker1": "hk1"}
+
+
+@pytest.mark.asyncio
+async def test_mapping_cache_is_instrumented():
+    hits = sample(
+        "hashtensor_validator_cache_requests_total",
+        cache="mapping",
+        result="hit",
+    )
+    loads = sample(
+        "hashtensor_validator_operation_duration_seconds_count",
+        operation="load_mapping",
+    )
+    manager = MappingManager(StaticSource(), cache_ttl=60)
+    await manager.get_mapping()
+    await manager.get_mapping()
+    assert sample(
+        "hashtensor_validator_cache_requests_total",
+        cache="mapping",
+        result="hit",
+    ) == hits + 1
+    assert sample(
+        "hashtensor_validator_operation_duration_seconds_count",
+        operation="load_mapping",
+    ) == loads + 1
+
+
+def test_timed_counts_errors():
+    @timed("test_failing")
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        failing()
+    assert sample(
+        "hashtensor_validator_operation_errors_total",
+        operation="test_failing",
+    ) == 1
+
+
+def test_internal_metrics_endpoint():
+    resp = TestClient(app).get("/internal/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "hashtensor_validator_operation_duration_seconds" in resp.text
@@ -0,0 +1,97 @@
+# tests/test_leader.py
+
+import time
+
+import pytest
+from src import leader
+from src.config import ValidatorSettings
+from src.leader import DatabaseLeaseLeaderElection, FileLockLeaderElection
+from src.metrics import MetricsClient, MinerKey, MinerMetrics, MinerMetricsBatch
+from src.snapshots import MetricsSnapshotStore
+
+
+def test_file_lock_has_a_single_holder(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    first = FileLockLeaderElection(path)
+    second = FileLockLeaderElection(path)
+    assert first.try_acquire()
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert first.is_leader() and not second.is_leader()
+    first.release()
+    assert not first.is_leader()
+    assert second.try_acquire()
+    second.release()
+
+
+def test_database_lease_expires(monkeypatch, db_url):
+    from src.interfaces.database import Base, create_db_engine
+
+    Base.metadata.create_all(create_db_engine(db_url))
+    now = [1_000.0]
+    monkeypatch.setattr(leader.time, "time", lambda: now[0])
+    first = DatabaseLeaseLeaderElection(db_url, ttl=30)
+    second = DatabaseLeaseLeaderElection(db_url, ttl=30)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    now[0] += 20
+    # Renewal pushes the expiry forward
+    assert first.try_acquire()
+    now[0] += 20
+    assert not second.try_acquire()
+    assert first.is_leader() and not second.is_leader()
+    # The leader stops renewing
+    now[0] += 31
+    assert not first.is_leader()
+    assert second.try_acquire()
+    assert not first.try_acquire()
+    second.release()
+    assert first.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_follower_serves_leader_snapshots(tmp_path):
+    store = MetricsSnapshotStore(tmp_path)
+    follower = MetricsClient(endpoint="http://prometheus", snapshot_store=store)
+    follower.follow_snapshots = True
+
+    async def fail_fetch(*args, **kwargs):
+        raise AssertionError("follower queried Prometheus")
+
+    follower.fetch_metrics_batch = fail_fetch
+    published = {
+        MinerKey(wallet="w1", worker="worker1"): MinerMetrics(
+            valid_shares=10, hashrate=1000.0, worker_name="worker1"
+        )
+    }
+    # Written by the leader after the follower started
+    store.save(MinerMetricsBatch.from_metrics(published), time.time() - 5)
+    metrics = await follower.get_cached_metrics(max_age=15, stale_age=60)
+    assert metrics.to_metrics() == published
+
+
+@pytest.mark.asyncio
+async def test_follower_skips_snapshots_the_leader_stopped_publishing(tmp_path):
+    store = MetricsSnapshotStore(tmp_path)
+    follower = MetricsClient(endpoint="http://prometheus", snapshot_store=store)
+    follower.follow_snapshots = True
+    fetches = []
+
+    async def fetch(*args, **kwargs):
+        fetches.append(time.time())
+        return MinerMetricsBatch(["w2"], ["worker2"], valid_shares=[1])
+
+    follower.fetch_metrics_batch = fetch
+    published = MinerMetricsBatch(["w1"], ["worker1"], valid_shares=[10])
+    store.save(published, time.time() - 45)
+    # Still served while stale, but refreshed from Prometheus
+    metrics = await follower.get_cached_metrics(max_age=15, stale_age=600)
+    assert list(metrics.workers) == ["worker1"]
+    await follower._refresh_task
+    assert len(fetches) == 1
+
+
+def test_leader_election_requires_snapshots():
+    with pytest.raises(ValueError, match="metrics_snapshots"):
+        ValidatorSettings(leader_election="file", metrics_snapshots=False)
@@ -0,0 +1,37 @@
+# tests/test_loop_monitor.py
+
+import asyncio
+import time
+
+import pytest
+from src.loop_monitor import LoopMonitor
+
+
+def blocking_handler():
+    time.sleep(0.4)
+
+
+@pytest.mark.asyncio
+async def test_stall_reports_blocking_stack():
+    monitor = LoopMonitor(interval=0.02, threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        assert monitor.stalls == 0
+        blocking_handler()
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+    assert monitor.stalls == 1
+    assert "blocking_handler" in monitor.last_stall_stack
+
+
+@pytest.mark.asyncio
+async def test_no_stall_when_loop_is_idle():
+    monitor = LoopMonitor(interval=0.02, threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.3)
+    finally:
+        monitor.stop()
+    assert monitor.stalls == 0
@@ -1,5 +1,126 @@
 # tests/test_mapping.py
 
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from src.config import ValidatorSettings, load_config
+from src.dependencies import get_database_service, get_mapping_manager
+from src.interfaces.database import (
+    DatabaseService,
+    SqliteMappingSource,
+    create_db_engine,
+)
+from src.main import app
+from src.mapping import MappingManager, MappingSource
+
 
 def test_mapping_manager_stub():
     assert True  # Placeholder
+
+
+@pytest.mark.asyncio
+async def test_sqlite_mapping_source_returns_active_rows(db_url):
+    db_service = DatabaseService(db_url)
+    await db_service.add_mapping("hk1", "a_hk1", "sig", 1.0)
+    await db_service.add_mapping("hk2", "b_hk2", "sig", 2.0)
+    await db_service.mark_worker_unbound("hk2", "b_hk2", "unbind")
+    assert await SqliteMappingSource(db_url).load_mapping() == {"a_hk1": "hk1"}
+
+
+MAPPING = {
+    "a1_hk1": "hk1",
+    "a2_hk2": "hk2",
+    "a3_hk1": "hk1",
+    "b1_hk1": "hk1",
+    "b2_hk2": "hk2",
+}
+
+
+class StaticSource(MappingSource):
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    async def load_mapping(self):
+        return dict(self.mapping)
+
+
+@pytest.fixture
+def manager():
+    return MappingManager(StaticSource(MAPPING), cache_ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_query_filters_by_hotkey_and_prefix(manager):
+    assert await manager.query() == (MAPPING, None)
+    assert await manager.query(hotkey="hk1") == (
+        {"a1_hk1": "hk1", "a3_hk1": "hk1", "b1_hk1": "hk1"},
+        None,
+    )
+    assert await manager.query(worker_prefix="a") == (
+        {"a1_hk1": "hk1", "a2_hk2": "hk2", "a3_hk1": "hk1"},
+        None,
+    )
+    assert await manager.query(hotkey="hk2", worker_prefix="b") == (
+        {"b2_hk2": "hk2"},
+        None,
+    )
+    assert await manager.query(hotkey="missing") == ({}, None)
+
+
+@pytest.mark.asyncio
+async def test_query_pages_with_cursor(manager):
+    pages, cursor = [], None
+    while True:
+        page, cursor = await manager.query(cursor=cursor, limit=2)
+        pages.append(list(page))
+        if cursor is None:
+            break
+    assert pages == [["a1_hk1", "a2_hk2"], ["a3_hk1", "b1_hk1"], ["b2_hk2"]]
+    # An exactly full last page has no next cursor
+    assert await manager.query(worker_prefix="a", cursor="a1_hk1", limit=2) == (
+        {"a2_hk2": "hk2", "a3_hk1": "hk1"},
+        None,
+    )
+
+
+def test_mappings_endpoint_pagination(manager):
+    app.dependency_overrides[get_mapping_manager] = lambda: manager
+    app.dependency_overrides[get_database_service] = lambda: None
+    try:
+        client = TestClient(app)
+        resp = client.get("/mappings", params={"hotkey": "hk1", "limit": 2})
+        assert resp.json() == {"a1_hk1": "hk1", "a3_hk1": "hk1"}
+        assert resp.headers["X-Next-Cursor"] == "a3_hk1"
+        resp = client.get(
+            "/mappings",
+            params={"hotkey": "hk1", "limit": 2, "cursor": "a3_hk1"},
+            headers={"Accept": "application/x-ndjson"},
+        )
+        assert resp.text == '{"worker":"b1_hk1","hotkey":"hk1"}\n'
+        assert "X-Next-Cursor" not in resp.headers
+        assert client.get("/mappings").json() == MAPPING
+        assert client.get("/mappings", params={"limit": 0}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_request_sessions_return_connections(db_url):
+    db_service = DatabaseService(db_url)
+    await db_service.add_mapping("hk1", "a_hk1", "sig", 1.0)
+    db_service.close()
+    app.dependency_overrides[load_config] = lambda: ValidatorSettings(
+        database_url=db_url
+    )
+    try:
+        client = TestClient(app)
+        # More concurrent requests than the pool holds (5 + 10 overflow)
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            responses = list(
+                pool.map(lambda _: client.get("/hotkey_workers"), range(64))
+            )
+        assert all(resp.status_code == 200 for resp in responses)
+        assert responses[0].json()[0]["worker"] == "a_hk1"
+        assert create_db_engine(db_url).pool.checkedout() == 0
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,125 @@
+# tests/test_merkle.py
+
+import pytest
+from fastapi.testclient import TestClient
+from src import tasks
+from src.main import app
+from src.dependencies import get_database_service, get_merkle_tree_cache
+from src.merkle import (
+    MERKLE_DEPTH,
+    MerkleTree,
+    MerkleTreeCache,
+    bucket_of,
+    diverging_buckets,
+)
+
+ROWS = [(f"worker{i}_hk{i % 10}", f"hk{i % 10}", f"sig{i}") for i in range(200)]
+
+
+def test_tree_is_order_independent():
+    assert MerkleTree(ROWS).root == MerkleTree(reversed(ROWS)).root
+    assert MerkleTree([]).root is None
+
+
+def test_diverging_buckets_point_at_changed_rows():
+    local = MerkleTree(ROWS[:-1])
+    remote = MerkleTree(ROWS)
+    level, buckets = [""], []
+    while level:
+        level, download = diverging_buckets(
+            local, {p: remote.describe(p) for p in level}
+        )
+        buckets.extend(download)
+    assert buckets == [bucket_of(ROWS[-1][0])]
+    assert ROWS[-1][0] in remote.bucket_workers(buckets[0])
+
+
+def test_local_only_rows_are_not_downloaded():
+    local = MerkleTree(ROWS)
+    remote = MerkleTree(ROWS[:-1])
+    # The remote misses a row; at most the bucket that held it is compared,
+    # and only if the remote still has other rows in it
+    level, buckets = [""], []
+    while level:
+        level, download = diverging_buckets(
+            local, {p: remote.describe(p) for p in level}
+        )
+        buckets.extend(download)
+    assert buckets in ([], [bucket_of(ROWS[-1][0])])
+
+
+@pytest.fixture
+def client(db_service):
+    app.dependency_overrides[get_database_service] = lambda: db_service
+    app.dependency_overrides[get_merkle_tree_cache] = lambda: MerkleTreeCache(0)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_merkle_endpoints(client, db_service):
+    for worker, hotkey, signature in ROWS[:20]:
+        await db_service.add_mapping(hotkey, worker, signature, 1.0)
+    tree = MerkleTree(ROWS[:20])
+
+    resp = client.get("/hotkey_workers/merkle")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["depth"] == MERKLE_DEPTH
+    assert body["nodes"][""] == tree.describe("")
+
+    bucket = bucket_of(ROWS[0][0])
+    rows = client.get(
+        "/hotkey_workers/buckets", params={"prefix": bucket}
+    ).json()
+    assert ROWS[0][0] in {row["worker"] for row in rows}
+
+    assert client.get(
+        "/hotkey_workers/merkle", params={"prefix": "xyz"}
+    ).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_reconcile_fetches_rows_behind_sync_offset(monkeypatch, db_service):
+    remote = MerkleTree(ROWS[:20])
+    remote_rows = {
+        worker: {
+            "worker": worker,
+            "hotkey": hotkey,
+            "registration_time": 1.0,
+            "signature": signature,
+        }
+        for worker, hotkey, signature in ROWS[:20]
+    }
+    for row in list(remote_rows.values())[:15]:
+        await db_service.add_mapping(
+            row["hotkey"], row["worker"], row["signature"], 1.0
+        )
+    described = []
+
+    async def fake_nodes(session, ip, port, prefixes):
+        described.extend(prefixes)
+        return {p: remote.describe(p) for p in prefixes}
+
+    async def fake_rows(session, ip, port, prefixes):
+        for prefix in prefixes:
+            for worker in remote.bucket_workers(prefix):
+                yield remote_rows[worker]
+
+    monkeypatch.setattr(tasks, "fetch_merkle_nodes", fake_nodes)
+    monkeypatch.setattr(tasks, "iter_merkle_bucket_rows", fake_rows)
+    monkeypatch.setattr(tasks, "verify_signature", lambda *args: True)
+
+    added, unbound, skipped, failed = await tasks.reconcile_with_validator(
+        None, db_service, "127.0.0.1", 8000, db_service.build_merkle_tree()
+    )
+    assert (added, unbound, failed) == (5, 0, 0)
+    assert db_service.build_merkle_tree().root == remote.root
+    # Only differing subtrees were described, not all 4096 buckets
+    assert len(described) < 16 * 6
+
+    described.clear()
+    assert await tasks.reconcile_with_validator(
+        None, db_service, "127.0.0.1", 8000, db_service.build_merkle_tree()
+    ) == (0, 0, 0, 0)
+    assert described == [""]
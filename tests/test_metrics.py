@@ -1,6 +1,10 @@
 # tests/test_metrics.py
+import asyncio
+import json
+import logging
+import time
 import pytest
-from src.metrics import MetricsClient
+from src.metrics import MetricsClient, MinerKey, MinerMetricsBatch
 
 
 def test_fetch_metrics_stub():
@@ -19,3 +23,74 @@ async def test_metrics_client_fetch():
     client = MetricsClient(endpoint=url)
     metrics = await client.fetch_metrics()
     assert metrics is not None
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self.body = json.dumps(payload).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self):
+        return self.body
+
+
+class FakeSession:
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.queries = []
+
+    def get(self, url, params=None):
+        self.queries.append(params["query"])
+        return FakeResponse(self.payload)
+
+
+@pytest.mark.asyncio
+async def test_get_uptime_uses_instant_vector():
+    payload = {
+        "status": "success",
+        "data": {
+            "resultType": "vector",
+            "result": [
+                {
+                    "metric": {"wallet": "w1", "worker": "worker1"},
+                    "value": [1_800_000_000, "120.5"],
+                },
+                {"metric": {"worker": "no_wallet"}, "value": [0, "1"]},
+            ],
+        },
+    }
+    session = FakeSession(payload)
+    client = MetricsClient(endpoint="http://prometheus")
+    uptimes = await client._get_uptime(session)
+    assert uptimes == {MinerKey(wallet="w1", worker="worker1"): 120.5}
+    assert "last_over_time" in session.queries[0]
+    stats = client.query_stats[session.queries[0]]
+    assert stats.series == 2
+    assert stats.samples == 2
+    assert stats.payload_bytes == len(json.dumps(payload))
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_is_logged(caplog):
+    client = MetricsClient(endpoint="http://prometheus")
+    stale = MinerMetricsBatch(["w"], ["a"], valid_shares=[1])
+    client.last_metrics = stale
+    client.last_metrics_time = time.time() - 120
+
+    async def unreachable():
+        raise ConnectionError("prometheus down")
+
+    client.fetch_metrics_batch = unreachable
+    with caplog.at_level(logging.WARNING, logger="src.metrics"):
+        assert await client.get_cached_metrics(60, stale_age=600) is stale
+        await asyncio.wait([client._refresh_task])
+        await asyncio.sleep(0)
+    assert "prometheus down" in caplog.text
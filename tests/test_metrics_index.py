@@ -0,0 +1,130 @@
+# tests/test_metrics_index.py
+
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from src.config import ValidatorSettings, load_config
+from src.dependencies import get_validator
+from src.main import app
+from src.metrics import HotkeyMetricsBatch, MinerMetrics, MinerMetricsBatch
+from src.metrics_index import HotkeyMetricsIndex
+from src.models import MetricsSummaryResponse, ProjectedMetricsResponse
+from src.validator import Validator
+
+
+@pytest.fixture
+def index():
+    return HotkeyMetricsIndex(
+        HotkeyMetricsBatch.from_hotkey_metrics(
+            {
+                "hk1": [
+                    MinerMetrics(worker_name="a", uptime=1, valid_shares=10, hashrate=100.0),
+                    MinerMetrics(worker_name="b", uptime=0, valid_shares=0),
+                ],
+                "hk2": [
+                    MinerMetrics(worker_name="c", uptime=1, valid_shares=5, hashrate=50.0),
+                    MinerMetrics(worker_name="d", uptime=1, valid_shares=30, hashrate=300.0),
+                ],
+                "hk3": [],
+            }
+        )
+    )
+
+
+def test_summary_totals(index):
+    rows = index.query(summary=True)
+    assert [r["hotkey"] for r in rows] == ["hk1", "hk2", "hk3"]
+    assert rows[1] == {
+        "hotkey": "hk2",
+        "active_workers": 2,
+        "total_workers": 2,
+        "is_active": True,
+        "valid_shares": 35,
+        "invalid_shares": 0,
+        "total_difficulty": 0.0,
+        "hashrate": 350.0,
+        "uptime_seconds": 0.0,
+    }
+    assert isinstance(rows[1]["valid_shares"], int)
+    assert rows[2]["active_workers"] == 0 and not rows[2]["is_active"]
+
+
+def test_filters_projection_and_sort(index):
+    rows = index.query(hotkeys=["hk1"], fields=["worker_name", "uptime"])
+    assert rows == [
+        {
+            "hotkey": "hk1",
+            "active_workers": 1,
+            "total_workers": 2,
+            "is_active": True,
+            "metrics": [
+                {"worker_name": "a", "uptime": 1.0},
+                {"worker_name": "b", "uptime": 0.0},
+            ],
+        }
+    ]
+    rows = index.query(workers=["d", "missing"], fields=["valid_shares"])
+    assert [(r["hotkey"], r["metrics"]) for r in rows] == [
+        ("hk2", [{"valid_shares": 30}])
+    ]
+    rows = index.query(sort="hashrate", limit=2, fields=["worker_name"])
+    assert [r["hotkey"] for r in rows] == ["hk2", "hk1"]
+    assert rows[0]["metrics"] == [{"worker_name": "d"}, {"worker_name": "c"}]
+    with pytest.raises(ValueError):
+        index.query(fields=["password"])
+    with pytest.raises(ValueError):
+        index.query(sort="worker_name")
+
+
+def test_metrics_endpoint_query(index):
+    class StubValidator:
+        async def get_metrics_index(self, max_age):
+            return index
+
+    app.dependency_overrides[get_validator] = lambda: StubValidator()
+    app.dependency_overrides[load_config] = lambda: ValidatorSettings()
+    try:
+        client = TestClient(app)
+        resp = client.get(
+            "/metrics",
+            params={"hotkey": "hk2", "fields": "worker_name,hashrate"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()[0]["metrics"] == [
+            {"worker_name": "c", "hashrate": 50.0},
+            {"worker_name": "d", "hashrate": 300.0},
+        ]
+        TypeAdapter(List[ProjectedMetricsResponse]).validate_python(resp.json())
+        resp = client.get(
+            "/metrics", params={"summary": True, "sort": "valid_shares", "limit": 1}
+        )
+        assert [r["hotkey"] for r in resp.json()] == ["hk2"]
+        TypeAdapter(List[MetricsSummaryResponse]).validate_python(resp.json())
+        assert client.get("/metrics", params={"sort": "nope"}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_validator_reuses_index_until_snapshot_changes():
+    config = ValidatorSettings(kaspa_pool_owner_wallet="w")
+    snapshot = MinerMetricsBatch(["w"], ["a"], valid_shares=[3])
+    mapping = {"a": "hk1"}
+
+    class Client:
+        async def get_cached_metrics(self, max_age, stale_age):
+            return snapshot
+
+    class Mapping:
+        async def get_mapping(self):
+            return mapping
+
+    validator = Validator(config, Client(), Mapping())
+    first = await validator.get_metrics_index(60)
+    assert await validator.get_metrics_index(60) is first
+    snapshot = MinerMetricsBatch(["w"], ["a"], valid_shares=[4])
+    second = await validator.get_metrics_index(60)
+    assert second is not first
+    assert second.query(summary=True)[0]["valid_shares"] == 4
@@ -0,0 +1,93 @@
+# tests/test_profiling.py
+
+import marshal
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from src import profiling
+from src.config import ValidatorSettings, load_config
+from src.main import app
+
+TOKEN = {"X-Admin-Token": "secret"}
+
+
+def busy_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_sees_worker_threads():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_work, args=(stop,), name="busy")
+    thread.start()
+    try:
+        stacks = profiling.sample_stacks(0.2, 0.001)
+    finally:
+        stop.set()
+        thread.join()
+    assert any(
+        stack.startswith("busy;") and "busy_work" in stack for stack in stacks
+    )
+    line = profiling.format_collapsed(stacks).splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_concurrent_captures_are_rejected():
+    with profiling._exclusive():
+        with pytest.raises(profiling.ProfilerBusy):
+            profiling.sample_stacks(0.01)
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[load_config] = lambda: ValidatorSettings(
+        profiling_enabled=True, admin_token="secret"
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_profile_requires_admin_token(client):
+    assert client.get("/internal/profile").status_code == 403
+    assert client.get(
+        "/internal/profile", headers={"X-Admin-Token": "wrong"}
+    ).status_code == 403
+    assert client.get(
+        "/internal/profile", params={"duration": 3600}, headers=TOKEN
+    ).status_code == 400
+
+
+def test_profile_is_opt_in():
+    app.dependency_overrides[load_config] = lambda: ValidatorSettings(
+        admin_token="secret"
+    )
+    try:
+        resp = TestClient(app).get("/internal/profile", headers=TOKEN)
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 404
+
+
+def test_profile_modes(client):
+    resp = client.get(
+        "/internal/profile", params={"duration": 0.1}, headers=TOKEN
+    )
+    assert resp.status_code == 200
+    assert resp.text
+
+    resp = client.get(
+        "/internal/profile",
+        params={"duration": 0.1, "mode": "cprofile"},
+        headers=TOKEN,
+    )
+    assert resp.status_code == 200
+    assert isinstance(marshal.loads(resp.content), dict)
+
+    resp = client.get(
+        "/internal/profile/memory",
+        params={"duration": 0.1, "limit": 5},
+        headers=TOKEN,
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()["top"]) <= 5
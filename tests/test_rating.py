@@ -370,3 +370,113 @@ def test_max_difficulty_clamping():
         }
         result = calc.rate_all(metrics_dict)
         assert result["hotkey1"] == 1.0
+
+
+def test_rate_batch_matches_rate_all():
+    import random
+    from src.metrics import HotkeyMetricsBatch
+
+    rng = random.Random(42)
+    metrics_dict = {
+        f"hotkey{h}": [
+            MinerMetrics(
+                uptime_seconds=rng.uniform(0, 4000),
+                valid_shares=rng.randint(0, 3000),
+                invalid_shares=rng.randint(0, 10),
+                difficulty=rng.uniform(0, 40000),
+                worker_name=f"worker{h}_{w}",
+            )
+            for w in range(rng.randint(0, 5))
+        ]
+        for h in range(50)
+    }
+    calc = RatingCalculator(max_difficulty=16384.0)
+    batch = HotkeyMetricsBatch.from_hotkey_metrics(metrics_dict)
+    assert calc.rate_batch(batch) == calc.rate_all(metrics_dict)
+    assert batch.to_hotkey_metrics() == metrics_dict
+
+
+def test_explain_batch_breaks_down_scores():
+    from src.metrics import HotkeyMetricsBatch
+
+    metrics_dict = {
+        "steady": [
+            MinerMetrics(uptime_seconds=3600, valid_shares=100, difficulty=2.0)
+        ],
+        "spammy": [
+            # 1200 shares allowed per hour at 20/min: 2400 is penalized
+            MinerMetrics(uptime_seconds=3600, valid_shares=2400, difficulty=1.0)
+        ],
+        "part_time": [
+            MinerMetrics(uptime_seconds=1800, valid_shares=100, difficulty=2.0)
+        ],
+        "idle": [],
+    }
+    calc = RatingCalculator()
+    batch = HotkeyMetricsBatch.from_hotkey_metrics(metrics_dict)
+    explained = calc.explain_batch(batch)
+    assert {hk: e["score"] for hk, e in explained.items()} == calc.rate_batch(batch)
+    assert explained["spammy"]["share_rate_penalty"] == pytest.approx(2.718281828**-1)
+    assert explained["spammy"]["difficulty_penalty"] == 1.0
+    assert explained["part_time"]["avg_uptime"] == 0.5
+    assert explained["part_time"]["uptime_factor"] == 0.25
+    # Penalized, the spammer's 2400 shares still outweigh 100 at difficulty 2
+    assert [explained[hk]["rank"] for hk in metrics_dict] == [2, 1, 3, 4]
+    assert explained["idle"]["share_rate_penalty"] == 1.0
+
+    # What-if: no uptime penalty puts part_time level with steady
+    what_if = calc.with_overrides(uptime_alpha=0.0).explain_batch(batch)
+    assert what_if["part_time"]["score"] == what_if["steady"]["score"]
+    assert what_if["part_time"]["rank"] == what_if["steady"]["rank"] == 2
+    assert calc.uptime_alpha == 2.0
+
+
+def test_ratings_explain_endpoint():
+    from fastapi.testclient import TestClient
+    from src.config import ValidatorSettings, load_config
+    from src.dependencies import get_validator
+    from src.main import app
+    from src.metrics import MinerMetricsBatch
+    from src.validator import Validator
+
+    config = ValidatorSettings(kaspa_pool_owner_wallet="w")
+
+    class Client:
+        async def get_cached_metrics(self, max_age, stale_age):
+            return MinerMetricsBatch(
+                ["w", "w"],
+                ["a", "b"],
+                uptime_seconds=[3600, 1800],
+                valid_shares=[100, 100],
+                difficulty=[2.0, 2.0],
+            )
+
+    class Mapping:
+        mapping = {"a": "hk1", "b": "hk2"}
+
+        async def get_mapping(self):
+            return self.mapping
+
+    validator = Validator(config, Client(), Mapping())
+    app.dependency_overrides[get_validator] = lambda: validator
+    app.dependency_overrides[load_config] = lambda: config
+    try:
+        client = TestClient(app)
+        body = client.get("/ratings/explain").json()
+        assert body["parameters"]["uptime_alpha"] == config.rating_weight
+        assert [(r["hotkey"], r["rank"]) for r in body["ratings"]] == [
+            ("hk1", 1),
+            ("hk2", 2),
+        ]
+        body = client.get(
+            "/ratings/explain", params={"hotkey": "hk2", "uptime_alpha": 0}
+        ).json()
+        assert body["parameters"]["uptime_alpha"] == 0
+        assert [(r["hotkey"], r["score"]) for r in body["ratings"]] == [
+            ("hk2", 1.0)
+        ]
+        assert client.get(
+            "/ratings/explain", params={"max_difficulty": 0}
+        ).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
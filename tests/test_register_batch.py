@@ -0,0 +1,96 @@
+# tests/test_register_batch.py
+
+import time
+
+import pytest
+from src import main
+from src.config import ValidatorSettings
+from src.dependencies import get_worker_provider
+from src.interfaces.worker_provider import WorkerProvider
+from src.main import app
+from src.metrics import MetricsClient, MinerKey
+
+HOTKEY = "5FHneW46xGXgs5mUiveU4sbTyGBzmstUspZC92UhjJM694ty"
+UNREGISTERED = "5DAAnrj7VHTznn2AWBemMuyBwZWs6FNFjdyVXUeYum3PTXFy"
+WALLET = "kaspa:test"
+VALID_SIGNATURE = b"ok".hex()
+
+
+@pytest.fixture
+def settings():
+    return ValidatorSettings(
+        kaspa_pool_owner_wallet=WALLET, register_batch_max_size=10
+    )
+
+
+@pytest.fixture
+def client(monkeypatch, db_service, signed_client):
+    db_service.max_workers = 3
+    provider = WorkerProvider(MetricsClient("http://unused"))
+    provider._cache = (
+        frozenset(
+            MinerKey(wallet=WALLET, worker=f"rig{i}_{hotkey}")
+            for i in range(5)
+            for hotkey in (HOTKEY, UNREGISTERED)
+        ),
+        time.time(),
+    )
+    monkeypatch.setattr(main, "registered_hotkeys", lambda *args: {HOTKEY})
+    app.dependency_overrides[get_worker_provider] = lambda: provider
+    return signed_client
+
+
+def registration(worker, hotkey=HOTKEY, signature=VALID_SIGNATURE, **extra):
+    return {
+        "hotkey": hotkey,
+        "worker": worker,
+        "registration_time": time.time(),
+        "signature": signature,
+        **extra,
+    }
+
+
+def test_batch_returns_per_item_results(client, db_service):
+    batch = [
+        registration(f"rig0_{HOTKEY}"),
+        registration(f"rig1_{HOTKEY}", signature="00"),
+        registration(f"rig0_{UNREGISTERED}", hotkey=UNREGISTERED),
+        registration(f"offline_{HOTKEY}"),
+        registration("no_hotkey_in_name"),
+        registration(f"rig2_{HOTKEY}", registration_time=0),
+        registration(f"rig0_{HOTKEY}"),
+        registration(f"rig3_{HOTKEY}"),
+        registration(f"rig4_{HOTKEY}"),
+        registration(f"rig2_{HOTKEY}"),
+    ]
+    resp = client.post("/register/batch", json={"registrations": batch})
+    assert resp.status_code == 200
+    body = resp.json()
+    results = body["results"]
+    assert [r["worker"] for r in results] == [r["worker"] for r in batch]
+    assert [r["registered"] for r in results] == [
+        True, False, False, False, False, False, False, True, True, False,
+    ]
+    assert results[1]["detail"] == "Invalid signature"
+    assert results[2]["detail"].startswith("Hotkey not registered")
+    assert results[3]["detail"].startswith("Worker not found")
+    assert results[4]["detail"].startswith("Worker name must contain")
+    assert results[5]["detail"].startswith("Registration time")
+    assert results[6]["detail"] == "Worker already registered"
+    # The hotkey limit (3) counts the rows stored earlier in the same batch
+    assert results[9]["detail"].startswith("Maximum number of workers")
+    assert (body["registered"], body["failed"]) == (3, 7)
+    assert db_service.get_active_worker_count(HOTKEY) == 3
+    # Only items that passed the cheap checks were verified, with the
+    # payload /register signs
+    assert len(client.verified) == 6
+    assert '"hotkey"' in client.verified[0] and "signature" not in client.verified[0]
+
+
+def test_batch_size_is_limited(client):
+    batch = [registration(f"rig{i}_{HOTKEY}") for i in range(11)]
+    resp = client.post("/register/batch", json={"registrations": batch})
+    assert resp.status_code == 413
+    assert client.post(
+        "/register/batch", json={"registrations": []}
+    ).status_code == 400
@@ -1,6 +1,18 @@
+import tempfile
+import time
 import unittest
-from unittest.mock import patch, MagicMock
-from src.set_weights import set_weights, __spec_version__
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch, MagicMock
+from src.config import ValidatorSettings
+from src.interfaces.database import Base, DynamicConfigService
+from src.set_weights import (
+    build_weight_vector,
+    set_weights,
+    weights_change,
+    weights_decision,
+    __spec_version__,
+)
+from src.tasks import set_weights_task
 
 
 class TestSetWeights(unittest.TestCase):
@@ -62,5 +74,122 @@ class TestSetWeights(unittest.TestCase):
             set_weights(hotkey_to_rating, substrate, keypair, netuid)
 
 
+class TestWeightsDecision(unittest.TestCase):
+    nodes = [
+        MagicMock(node_id=0, hotkey="hotkey0"),
+        MagicMock(node_id=1, hotkey="hotkey1"),
+        MagicMock(node_id=2, hotkey="hotkey2"),
+    ]
+
+    def test_quantized_like_the_chain(self):
+        vector = build_weight_vector({"hotkey0": 0.5, "hotkey1": 1.0}, self.nodes)
+        self.assertEqual(vector.node_weights, [0.5, 1.0, 0])
+        self.assertEqual(vector.quantized(), {0: 32768, 1: 65535})
+
+    def test_weights_change(self):
+        self.assertEqual(weights_change({0: 10, 1: 10}, {0: 1, 1: 1}), 0.0)
+        self.assertAlmostEqual(weights_change({0: 1}, {1: 1}), 2.0)
+        self.assertAlmostEqual(weights_change({0: 3, 1: 1}, {0: 1, 1: 1}), 0.5)
+
+    def test_reasons(self):
+        vector = build_weight_vector({"hotkey0": 1.0, "hotkey1": 1.0}, self.nodes)
+        last = (vector.quantized(), vector.metagraph_version)
+
+        def decide(last, age=0.0):
+            return weights_decision(vector, last, age, 0.01, 3600)
+
+        self.assertEqual(decide(None)[0], "first")
+        self.assertEqual(decide(last), ("unchanged", 0.0))
+        self.assertEqual(decide(last, age=3600)[0], "max_age")
+        self.assertEqual(decide((last[0], "other"))[0], "metagraph")
+        reason, change = decide(({0: 65535, 1: 60000}, vector.metagraph_version))
+        self.assertEqual(reason, "changed")
+        self.assertGreater(change, 0.01)
+
+
+class TestSetWeightsTask(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.service = DynamicConfigService(
+            f"sqlite:///{self.tmp.name}/mapping.db"
+        )
+        Base.metadata.create_all(self.service.engine)
+        self.config = ValidatorSettings(
+            set_weights_interval=timedelta(minutes=60),
+            set_weights_max_age=timedelta(hours=6),
+        )
+        self.validator = MagicMock()
+        self.validator.compute_ratings = AsyncMock(
+            return_value={"hotkey0": 1.0, "hotkey1": 0.5}
+        )
+        self.nodes = [
+            MagicMock(node_id=0, hotkey="hotkey0"),
+            MagicMock(node_id=1, hotkey="hotkey1"),
+        ]
+
+    async def asyncTearDown(self):
+        self.service.engine.dispose()
+        self.tmp.cleanup()
+
+    async def run_task(self, is_leader=None):
+        with patch(
+            "src.tasks.get_nodes_for_netuid_cached", return_value=self.nodes
+        ), patch("src.tasks.set_weights", return_value=True) as submit:
+            await set_weights_task(
+                self.service,
+                self.config,
+                self.validator,
+                MagicMock(),
+                MagicMock(),
+                is_leader,
+            )
+        return submit.call_count
+
+    def rewind(self, seconds):
+        # Pretend the last submission and check happened `seconds` earlier
+        service = self.service
+        service.set_last_set_weights_time(
+            service.get_last_set_weights_time() - seconds
+        )
+        service.set_last_weights_check_time(
+            service.get_last_weights_check_time() - seconds
+        )
+
+    async def test_skips_unchanged_weights_until_max_age(self):
+        self.assertEqual(await self.run_task(), 1)
+        self.assertEqual(self.service.get_last_weights()[0], {0: 65535, 1: 32768})
+        # Within the interval nothing is evaluated
+        self.assertEqual(await self.run_task(), 0)
+        self.assertEqual(self.validator.compute_ratings.await_count, 1)
+
+        self.rewind(3600)
+        self.assertEqual(await self.run_task(), 0)
+        self.assertEqual(self.validator.compute_ratings.await_count, 2)
+        # The skipped check counts as the evaluation for this interval
+        self.assertEqual(await self.run_task(), 0)
+        self.assertEqual(self.validator.compute_ratings.await_count, 2)
+
+        self.rewind(6 * 3600)
+        self.assertEqual(await self.run_task(), 1)
+
+    async def test_submits_changed_weights(self):
+        self.assertEqual(await self.run_task(), 1)
+        self.rewind(3600)
+        self.validator.compute_ratings.return_value = {
+            "hotkey0": 0.5,
+            "hotkey1": 1.0,
+        }
+        self.assertEqual(await self.run_task(), 1)
+        self.assertEqual(self.service.get_last_weights()[0], {0: 32768, 1: 65535})
+        self.assertGreater(self.service.get_last_set_weights_time(), time.time() - 60)
+
+    async def test_former_leader_does_not_submit(self):
+        self.assertEqual(await self.run_task(is_leader=lambda: False), 0)
+        self.assertEqual(self.validator.compute_ratings.await_count, 1)
+        self.assertIsNone(self.service.get_last_weights())
+        # Not recorded as checked, so the new leader's evaluation is not delayed
+        self.assertEqual(await self.run_task(is_leader=lambda: True), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+# tests/test_simulation.py
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from src.simulation import (
+    RatingParams,
+    apply_strategy,
+    concentration,
+    gaming_targets,
+    gini,
+    parameter_grid,
+    sweep,
+    synthetic_population,
+)
+
+HOUR = timedelta(hours=1)
+
+
+def test_concentration_measures():
+    assert gini(np.full(4, 0.25)) == pytest.approx(0.0)
+    assert gini(np.array([0.0, 0.0, 0.0, 1.0])) == pytest.approx(0.75)
+    measures = concentration(np.array([0.4, 0.3, 0.2, 0.1]))
+    assert measures["hhi"] == pytest.approx(0.3)
+    assert measures["top10_share"] == pytest.approx(0.4)
+    assert measures["nakamoto"] == 2
+
+
+def test_gaming_targets_sit_around_the_median():
+    batch = synthetic_population(hotkeys=50, seed=1)
+    work = np.bincount(
+        batch.group_ids(),
+        weights=batch.metrics.valid_shares.astype(np.float64),
+        minlength=len(batch.hotkeys),
+    )
+    targets = gaming_targets(batch, count=5)
+    assert len(targets) == 5
+    active = work[work > 0]
+    # Every target ranks within the middle five of the hotkeys with work
+    ranks = [(active < work[h]).sum() for h in targets]
+    middle = (len(active) - 5) // 2
+    assert all(middle <= rank < middle + 5 for rank in ranks)
+
+
+def test_uptime_padding_adds_idle_workers_up_to_the_cap():
+    batch = synthetic_population(hotkeys=20, max_workers=5, seed=3)
+    counts = np.diff(batch.offsets)
+    targets = np.array([0, 1])
+    padded = apply_strategy(batch, targets, "uptime_padding", max_workers=5)
+    new_counts = np.diff(padded.offsets)
+    assert new_counts[:2].tolist() == np.minimum(counts[:2] * 2, 5).tolist()
+    assert new_counts[2:].tolist() == counts[2:].tolist()
+    assert padded.metrics.valid_shares.sum() == batch.metrics.valid_shares.sum()
+
+
+def test_sweep_is_the_same_in_parallel():
+    batch = synthetic_population(hotkeys=64, seed=1)
+    baseline = RatingParams(2.0, 16384.0, 20, HOUR)
+    grid = parameter_grid([0.0, 2.0], [16384.0], [20], [HOUR])
+    serial = sweep(batch, grid, baseline, jobs=1)
+    assert sweep(batch, grid, baseline, jobs=2) == serial
+    no_alpha, configured = serial
+    assert configured["shift"] == 0.0
+    # Idle workers only pay when uptime is penalized
+    assert no_alpha["gain_uptime_padding"] == pytest.approx(1.0)
+    assert configured["gain_uptime_padding"] > 1.0
@@ -0,0 +1,92 @@
+# tests/test_snapshots.py
+
+from datetime import timedelta
+
+import pytest
+from src.metrics import MinerKey, MinerMetrics, MinerMetricsBatch
+from src.snapshots import MetricsSnapshotStore
+
+
+def sample_metrics():
+    return MinerMetricsBatch.from_metrics(sample_dict())
+
+
+def sample_dict():
+    return {
+        MinerKey(wallet="w1", worker="worker1"): MinerMetrics(
+            uptime=120.0,
+            valid_shares=10,
+            invalid_shares=1,
+            total_difficulty=20.0,
+            difficulty=2.0,
+            hashrate=1000.0,
+            worker_name="worker1",
+            uptime_seconds=3600.0,
+        ),
+        MinerKey(wallet="w1", worker="worker2"): MinerMetrics(
+            valid_shares=5, worker_name="worker2"
+        ),
+    }
+
+
+def test_snapshot_roundtrip(tmp_path):
+    store = MetricsSnapshotStore(str(tmp_path))
+    store.save(sample_metrics(), timestamp=1_800_000_000.0)
+    snapshot = store.load_latest()
+    assert snapshot.timestamp == 1_800_000_000.0
+    assert len(snapshot) == 2
+    assert list(snapshot.wallets) == [b"w1"]
+    assert snapshot.to_metrics() == sample_dict()
+
+
+def test_snapshot_interval_and_retention(tmp_path):
+    store = MetricsSnapshotStore(
+        str(tmp_path),
+        retention=timedelta(hours=1),
+        interval=timedelta(minutes=15),
+    )
+    metrics = sample_metrics()
+    assert store.save(metrics, timestamp=1_000.0) is not None
+    # Too soon after the previous snapshot
+    assert store.save(metrics, timestamp=1_060.0) is None
+    assert store.save(metrics, timestamp=1_000.0 + 900) is not None
+    # The first snapshot falls out of the retention window
+    store.save(metrics, timestamp=1_000.0 + 3700)
+    assert [ts for ts, _ in store.list()] == [1_900.0, 4_700.0]
+    assert [s.timestamp for s in store.iter_snapshots(since=2_000.0)] == [
+        4_700.0
+    ]
+
+
+def test_published_snapshots_keep_one_per_interval(tmp_path):
+    store = MetricsSnapshotStore(
+        str(tmp_path),
+        retention=timedelta(hours=1),
+        interval=timedelta(minutes=15),
+    )
+    metrics = sample_metrics()
+    for offset in range(0, 960, 15):
+        assert store.save(metrics, 1_000.0 + offset, force=True) is not None
+    # History at the interval plus the latest publication
+    assert [ts for ts, _ in store.list()] == [1_000.0, 1_900.0, 1_945.0]
+
+
+def test_leftover_temporary_snapshots_are_removed(tmp_path, monkeypatch):
+    store = MetricsSnapshotStore(str(tmp_path))
+    crashed = tmp_path / ".metrics-900000.tmp"
+    crashed.mkdir()
+    (crashed / "wallets.npy").write_bytes(b"partial")
+    in_progress = tmp_path / ".metrics-1590000.tmp"
+    in_progress.mkdir()
+
+    def disk_full(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr("src.snapshots.np.save", disk_full)
+    with pytest.raises(OSError):
+        store.save(sample_metrics(), timestamp=1_500.0)
+    assert not (tmp_path / ".metrics-1500000.tmp").exists()
+    monkeypatch.undo()
+    store.save(sample_metrics(), timestamp=1_600.0)
+    assert not crashed.exists() and in_progress.exists()
+    assert [ts for ts, _ in store.list()] == [1_600.0]
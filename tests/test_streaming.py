@@ -0,0 +1,54 @@
+# tests/test_streaming.py
+
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock
+from src.main import app
+from src.dependencies import get_database_service, get_mapping_manager
+
+NDJSON = "application/x-ndjson"
+
+
+@pytest.fixture
+def client(db_service):
+    mapping_manager = AsyncMock()
+    mapping_manager.get_mapping.return_value = {"w": "h"}
+    app.dependency_overrides[get_database_service] = lambda: db_service
+    app.dependency_overrides[get_mapping_manager] = lambda: mapping_manager
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_hotkey_workers_ndjson_stream(client, db_service):
+    for i in range(150):
+        hotkey = f"hk{i % 10}"
+        await db_service.add_mapping(
+            hotkey, f"worker{i}_{hotkey}", "sig", 1000.0 + i
+        )
+    resp = client.get(
+        "/hotkey_workers",
+        params={"since_timestamp": 1009.0},
+        headers={"Accept": NDJSON},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(NDJSON)
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    # All rows after the offset, not just the first page of 100
+    assert len(rows) == 140
+    assert rows[0]["worker"] == "worker10_hk0"
+    assert rows[0]["registration_time"] == 1010.0
+    # Plain JSON clients keep the paginated list
+    assert len(client.get("/hotkey_workers").json()) == 100
+
+
+@pytest.mark.asyncio
+async def test_mappings_ndjson_stream(client, db_service):
+    await db_service.add_mapping("hk1", "a_hk1", "sig", 1.0)
+    await db_service.add_mapping("hk2", "b_hk2", "sig", 2.0)
+    await db_service.mark_worker_unbound("hk2", "b_hk2", "unbind")
+    resp = client.get("/mappings", headers={"Accept": NDJSON})
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert rows == [{"worker": "a_hk1", "hotkey": "hk1"}]
+    assert client.get("/mappings").json() == {"w": "h"}
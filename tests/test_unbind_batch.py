@@ -0,0 +1,124 @@
+# tests/test_unbind_batch.py
+
+import pytest
+from src import main
+from src.dependencies import get_mapping_manager
+from src.interfaces.database import SqliteMappingSource
+from src.main import app
+from src.mapping import MappingManager
+
+HOTKEY = "5FHneW46xGXgs5mUiveU4sbTyGBzmstUspZC92UhjJM694ty"
+OTHER = "5DAAnrj7VHTznn2AWBemMuyBwZWs6FNFjdyVXUeYum3PTXFy"
+VALID_SIGNATURE = b"ok".hex()
+
+
+@pytest.fixture
+def client(monkeypatch, db_url, db_service, signed_client):
+    db_service.max_workers = 10
+    monkeypatch.setattr(
+        main, "is_hotkey_registered", lambda hotkey, *args: hotkey == HOTKEY
+    )
+    app.dependency_overrides[get_mapping_manager] = lambda: MappingManager(
+        SqliteMappingSource(db_url), cache_ttl=0
+    )
+    return signed_client
+
+
+def unbind(worker, signature=VALID_SIGNATURE):
+    return {"worker": worker, "signature": signature}
+
+
+@pytest.mark.asyncio
+async def test_unbind_batch_returns_per_item_results(client, db_service):
+    for i in range(4):
+        await db_service.add_mapping(HOTKEY, f"rig{i}_{HOTKEY}", "sig", float(i))
+    await db_service.add_mapping(OTHER, f"rig0_{OTHER}", "sig", 5.0)
+    await db_service.mark_worker_unbound(HOTKEY, f"rig3_{HOTKEY}", "u")
+    batch = [
+        unbind(f"rig0_{HOTKEY}"),
+        unbind(f"rig1_{HOTKEY}", signature="00"),
+        unbind(f"rig0_{OTHER}"),
+        unbind(f"missing_{HOTKEY}"),
+        unbind(f"rig3_{HOTKEY}"),
+        unbind(f"rig2_{HOTKEY}"),
+        unbind(f"rig2_{HOTKEY}"),
+    ]
+    resp = client.post(
+        "/unbind/batch", json={"hotkey": HOTKEY, "unbinds": batch}
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    results = body["results"]
+    assert [r["unbound"] for r in results] == [
+        True, False, False, False, False, True, False,
+    ]
+    assert results[1]["detail"] == "Invalid signature"
+    assert results[2]["detail"] == "Worker not found for this hotkey"
+    assert results[3]["detail"] == "Worker not found for this hotkey"
+    assert results[4]["detail"] == "Worker already unbound"
+    assert results[6]["detail"] == "Worker already unbound"
+    assert (body["unbound"], body["failed"]) == (2, 5)
+    assert db_service.get_active_worker_count(HOTKEY) == 1
+    # Each worker's signature covers what /unbind signs, so peers can verify it
+    assert client.verified[0] == (
+        f'{{"hotkey":"{HOTKEY}","worker":"rig0_{HOTKEY}"}}'
+    )
+    # Every tombstone went to the change feed with its own signature
+    unbinds = [c for c in db_service.iter_changes() if c["kind"] == "unbind"]
+    assert [c["worker"] for c in unbinds] == [
+        f"rig3_{HOTKEY}",
+        f"rig0_{HOTKEY}",
+        f"rig2_{HOTKEY}",
+    ]
+
+
+def test_unbind_batch_rejects_unregistered_hotkey_and_bad_sizes(client):
+    assert client.post(
+        "/unbind/batch", json={"hotkey": OTHER, "unbinds": [unbind("w")]}
+    ).status_code == 400
+    assert client.post(
+        "/unbind/batch", json={"hotkey": HOTKEY, "unbinds": []}
+    ).status_code == 400
+    assert client.post(
+        "/unbind/batch",
+        json={"hotkey": HOTKEY, "unbinds": [unbind(f"w{i}") for i in range(11)]},
+    ).status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_concurrent_unbind_is_not_reported_twice(
+    monkeypatch, client, db_service
+):
+    for i in range(2):
+        await db_service.add_mapping(HOTKEY, f"rig{i}_{HOTKEY}", "sig", float(i))
+    mark_workers_unbound = db_service.mark_workers_unbound
+
+    async def racing(unbinds):
+        # Another request unbinds rig0 between the read and the write
+        await db_service.mark_worker_unbound(HOTKEY, f"rig0_{HOTKEY}", "other")
+        return await mark_workers_unbound(unbinds)
+
+    monkeypatch.setattr(db_service, "mark_workers_unbound", racing)
+    body = client.post(
+        "/unbind/batch",
+        json={
+            "hotkey": HOTKEY,
+            "unbinds": [unbind(f"rig0_{HOTKEY}"), unbind(f"rig1_{HOTKEY}")],
+        },
+    ).json()
+    assert (body["unbound"], body["failed"]) == (1, 1)
+    assert body["results"][0]["detail"] == "Worker already unbound"
+
+
+@pytest.mark.asyncio
+async def test_mappings_hotkey_filter(client, db_service):
+    await db_service.add_mapping(HOTKEY, f"rig0_{HOTKEY}", "sig", 1.0)
+    await db_service.add_mapping(OTHER, f"rig0_{OTHER}", "sig", 2.0)
+    resp = client.get("/mappings", params={"hotkey": HOTKEY})
+    assert resp.json() == {f"rig0_{HOTKEY}": HOTKEY}
+    resp = client.get(
+        "/mappings",
+        params={"hotkey": OTHER},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert resp.text.strip() == f'{{"worker":"rig0_{OTHER}","hotkey":"{OTHER}"}}'
@@ -0,0 +1,31 @@
+# tests/test_worker_counts.py
+
+import pytest
+from src.interfaces.database import HotkeyWorkerCount
+
+
+@pytest.mark.asyncio
+async def test_worker_counts_follow_binds_and_unbinds(db_service):
+    db_service.max_workers = 3
+    for name in ("a", "b", "c"):
+        await db_service.add_mapping("hk1", f"{name}_hk1", "sig", 1.0)
+    assert db_service.get_active_worker_count("hk1") == 3
+    with pytest.raises(ValueError, match="Maximum number of workers"):
+        await db_service.add_mapping("hk1", "d_hk1", "sig", 1.0)
+
+    await db_service.mark_worker_unbound("hk1", "a_hk1", "u")
+    assert await db_service.mark_workers_unbound(
+        [("hk1", "b_hk1", "u"), ("hk1", "c_hk1", "u")]
+    ) == 2
+    assert db_service.get_active_worker_count("hk1") == 0
+    await db_service.add_mapping("hk1", "d_hk1", "sig", 1.0)
+
+    # Drift from edits behind the service's back is repaired by a rebuild
+    db_service.session.execute(
+        HotkeyWorkerCount.__table__.update().values(active=99)
+    )
+    db_service.session.commit()
+    db_service.rebuild_worker_counts()
+    db_service.session.expire_all()
+    assert db_service.get_active_worker_count("hk1") == 1
+    assert db_service.get_active_worker_count("unknown") == 0
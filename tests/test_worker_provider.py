@@ -0,0 +1,37 @@
+# tests/test_worker_provider.py
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.interfaces.worker_provider import WorkerProvider
+from src.metrics import MinerKey
+
+
+def make_provider(uptimes, max_staleness=120):
+    metrics_client = MagicMock()
+    metrics_client._get_uptime = AsyncMock(return_value=uptimes)
+    return WorkerProvider(metrics_client, 15, max_staleness), metrics_client
+
+
+@pytest.mark.asyncio
+async def test_fresh_index_does_not_query_prometheus():
+    key = MinerKey(wallet="w1", worker="worker1")
+    provider, metrics_client = make_provider({key: 10.0})
+    provider._cache = (frozenset({key}), time.time())
+    assert await provider.is_worker_exists("w1", "worker1")
+    metrics_client._get_uptime.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_index_refreshes_once_for_concurrent_callers():
+    key = MinerKey(wallet="w1", worker="worker1")
+    idle = MinerKey(wallet="w1", worker="idle")
+    provider, metrics_client = make_provider({key: 10.0, idle: 0.0})
+    results = await asyncio.gather(
+        *[provider.is_worker_exists("w1", "worker1") for _ in range(5)]
+    )
+    assert all(results)
+    assert not await provider.is_worker_exists("w1", "idle")
+    assert metrics_client._get_uptime.call_count == 1
+    assert provider.staleness < 1